@@ -0,0 +1,87 @@
+"""
+Measures end-to-end latency and LLM calls per query type with classifier-driven branch pruning
+against running every source branch (the previous behaviour). Tools and the model are offline
+stand-ins with fixed latencies, so the difference comes from the work that is skipped.
+
+    cd backend && python -m benchmarks.bench_branch_pruning
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import src.workflow.nodes as nodes
+import src.workflow.setup_workflow as setup_workflow
+from src.config.llm_cache import LLMCache
+from src.config.model import LocalChatModel
+from src.config.telemetry import metrics
+from src.workflow.registry import GraphRegistry
+from src.workflow.stream import stream_research
+
+# Simulated seconds per LLM call and per search/finance tool call.
+LLM_LATENCY = 0.3
+TOOL_LATENCY = 0.2
+QUERY_TYPES = ["general", "finance", "finance and general"]
+
+
+class SlowLocalModel(LocalChatModel):
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(LLM_LATENCY)
+        return self._generate(messages, stop=stop, **kwargs)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(LLM_LATENCY)
+        for chunk in self._stream(messages, stop=stop, **kwargs):
+            yield chunk
+
+
+def delayed(value, latency=TOOL_LATENCY):
+    async def tool(*args, **kwargs):
+        await asyncio.sleep(latency)
+        return value
+    return tool
+
+
+class Classification:
+    def __init__(self, query_type):
+        self.query_type = query_type
+
+
+async def run_once(graph, registry, query_type):
+    search = {"organic_results": [{"title": "Apple beats", "link": "https://a.com", "snippet": "Revenue grew"}]}
+    classifier = AsyncMock()
+    classifier.ainvoke = delayed(Classification(query_type), LLM_LATENCY)
+    with patch.object(nodes, "llm_cache", LLMCache(alias=None)), \
+            patch.object(nodes, "FAST_CLASSIFIER", False), \
+            patch.object(registry, "structured_llm", return_value=classifier), \
+            patch.object(nodes, "google_search", delayed([None, search, None])), \
+            patch.object(nodes, "bing", delayed([None, None])), \
+            patch.object(nodes, "reddit", delayed([{"id": "c1", "body": "AAPL looks strong"}])), \
+            patch.object(nodes, "main", delayed({"info": {"symbol": "AAPL"}})), \
+            patch.object(nodes, "google_finance", delayed({"summary": {"price": 1}})), \
+            patch.object(nodes.price_store, "histories", AsyncMock(return_value={})):
+        metrics.clear()
+        start = time.perf_counter()
+        events = [event async for event in stream_research("What is going on with Apple?", graph)]
+        elapsed = time.perf_counter() - start
+    assert events[-1] == {"type": "done"}, events[-1]
+    return elapsed, int(metrics.total('research_llm_calls_total'))
+
+
+async def main():
+    registry = GraphRegistry(default_model="local")
+    registry._models["local"] = SlowLocalModel()
+    with patch.object(nodes, "graph_registry", registry):
+        pruned = registry.graph()
+        with patch.object(setup_workflow, "router", lambda state: nodes.SOURCE_BRANCHES):
+            every_branch = setup_workflow.create_workflow().with_config(configurable={"model": "local"})
+
+        print(f"{'query type':<22}{'all branches s':>16}{'pruned s':>12}{'LLM calls':>14}")
+        for query_type in QUERY_TYPES:
+            full_time, full_calls = await run_once(every_branch, registry, query_type)
+            pruned_time, pruned_calls = await run_once(pruned, registry, query_type)
+            print(f"{query_type:<22}{full_time:>16.2f}{pruned_time:>12.2f}{f'{full_calls} -> {pruned_calls}':>14}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+"""
+Measures the per-request setup cost of building the research graph and LLM client for every
+request (the previous behaviour) against reusing the registry's compiled graph and warm client.
+
+    cd backend && python -m benchmarks.bench_graph_registry
+"""
+
+import os
+import timeit
+
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-placeholder')
+
+from src.config.model import Model
+from src.workflow.registry import GraphRegistry
+from src.workflow.setup_workflow import create_workflow
+
+
+def main(repeat=50):
+    registry = GraphRegistry()
+    registry.warm()
+
+    def per_request():
+        create_workflow()
+        Model().set_model()
+
+    def from_registry():
+        registry.graph()
+        registry.llm()
+
+    print(f"{'setup per request':<28}{'us':>12}")
+    for name, fn in [("compile + new client", per_request), ("registry", from_registry)]:
+        seconds = min(timeit.repeat(fn, number=repeat, repeat=3)) / repeat
+        print(f"{name:<28}{seconds * 1e6:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
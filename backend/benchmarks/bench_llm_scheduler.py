@@ -0,0 +1,75 @@
+"""
+Simulates concurrent research runs against a rate-limited LLM provider and compares unscheduled
+calls with the process-wide LLM scheduler, with and without a configured request budget. Reports
+the calls that succeed, the 429 responses received, and the sustained call rate. The provider
+admits PROVIDER_RPS requests per second (bursts up to PROVIDER_BURST) and rejects the rest.
+
+    cd backend && python -m benchmarks.bench_llm_scheduler
+"""
+
+import asyncio
+import time
+
+from src.config.llm_scheduler import LLMScheduler, TokenBucket
+from src.config.telemetry import metrics
+
+PROVIDER_RPS = 20
+PROVIDER_BURST = 10
+CALL_LATENCY = 0.1
+RUNS = 20
+# LLM calls per run: the source analyses, then the report nodes.
+RUN_NODES = ["google_search_analysis", "bing_search_analysis", "reddit_analysis", "yahoo_finance_analysis",
+             "aggregate_general_analysis_2", "synthesize_report", "analyze_synthesized_report", "extract_highlights"]
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class Provider:
+    def __init__(self):
+        self.bucket = TokenBucket(per_minute=PROVIDER_RPS * 60, capacity=PROVIDER_BURST)
+        self.rejected = 0
+
+    async def call(self):
+        if self.bucket.delay(1) > 0:
+            self.rejected += 1
+            raise RateLimited("429 Too Many Requests")
+        self.bucket.take(1)
+        await asyncio.sleep(CALL_LATENCY)
+
+
+async def research_run(provider, scheduler):
+    succeeded = 0
+    for node in RUN_NODES:
+        try:
+            if scheduler is None:
+                await provider.call()
+            else:
+                await scheduler.run(node, 0, provider.call)
+            succeeded += 1
+        except RateLimited:
+            pass
+    return succeeded
+
+
+async def measure(name, scheduler):
+    provider = Provider()
+    metrics.clear()
+    start = time.perf_counter()
+    succeeded = sum(await asyncio.gather(*(research_run(provider, scheduler) for _ in range(RUNS))))
+    elapsed = time.perf_counter() - start
+    total = RUNS * len(RUN_NODES)
+    print(f"{name:<28}{f'{succeeded}/{total}':>12}{provider.rejected:>8}{elapsed:>10.2f}{succeeded / elapsed:>12.1f}")
+
+
+async def main():
+    print(f"{'':<28}{'succeeded':>12}{'429s':>8}{'seconds':>10}{'calls/s':>12}")
+    await measure("unscheduled", None)
+    await measure("scheduler, AIMD only", LLMScheduler(requests_per_minute=0, backoff=0.2))
+    await measure("scheduler, 19 req/s budget",
+                  LLMScheduler(requests_per_minute=19 * 60, burst_seconds=PROVIDER_BURST / PROVIDER_RPS, backoff=0.2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""
+Compares the cached size and load time of Reddit post payloads stored as pickled
+per-comment dicts (the previous format) against the columnar format.
+
+    cd backend && python -m benchmarks.bench_reddit_codec
+"""
+
+import pickle
+import random
+import timeit
+
+from src.config.serializers import ColumnarSerializer
+
+
+def make_posts(post_count=50, comment_count=50, author_pool=300, seed=7):
+    rng = random.Random(seed)
+    words = "market rate stock earnings fed bond yield inflation apple tesla growth cash risk".split()
+    authors = [f"user_{i}" for i in range(author_pool)]
+    posts = []
+    for p in range(post_count):
+        comments = [
+            {
+                "id": f"c{p}_{c}",
+                "body": " ".join(rng.choice(words) for _ in range(rng.randint(5, 60))),
+                "author": rng.choice(authors),
+                "score": rng.randint(-20, 2000),
+                "depth": rng.randint(0, 8),
+                "controversiality": rng.randint(0, 1),
+                "gilded": rng.randint(0, 2),
+                "total_awards_received": rng.randint(0, 5),
+            }
+            for c in range(comment_count)
+        ]
+        posts.append({"title": f"post {p}", "score": rng.randint(0, 5000), "comments": comments})
+    return posts
+
+
+def main(repeat=20):
+    posts = make_posts()
+    columnar = ColumnarSerializer()
+    pickled = [pickle.dumps(post) for post in posts]
+    encoded = [columnar.dumps(post) for post in posts]
+
+    def load_pickled():
+        for blob in pickled:
+            pickle.loads(blob)
+
+    def load_columnar():
+        for blob in encoded:
+            columnar.loads(blob)
+
+    def load_columnar_bodies():
+        for blob in encoded:
+            columnar.loads(blob)["comments"].column("body")
+
+    print(f"{'format':<28}{'bytes':>12}{'load ms':>12}")
+    for name, size, fn in [
+        ("pickled dicts", sum(map(len, pickled)), load_pickled),
+        ("columnar (decode)", sum(map(len, encoded)), load_columnar),
+        ("columnar (body column)", sum(map(len, encoded)), load_columnar_bodies),
+    ]:
+        seconds = min(timeit.repeat(fn, number=1, repeat=repeat))
+        print(f"{name:<28}{size:>12}{seconds * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measures end-to-end latency, time to the first report token and LLM calls of the fused report
+mode (one structured-output call from the source analyses) against the chained report
+(aggregation, synthesis, then critique and highlights). Tools and the model are the offline
+stand-ins of bench_branch_pruning; the fused call is given a longer latency since it writes the
+synthesis, highlights and critique in one response.
+
+    cd backend && python -m benchmarks.bench_report_mode
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import src.workflow.nodes as nodes
+from src.config.llm_cache import LLMCache
+from src.config.str_outputs import FusedReport
+from src.config.telemetry import metrics
+from src.workflow.registry import GraphRegistry
+from src.workflow.stream import stream_research
+from .bench_branch_pruning import LLM_LATENCY, QUERY_TYPES, Classification, SlowLocalModel, delayed
+
+# Simulated seconds for the fused structured-output call.
+FUSED_LATENCY = 0.5
+
+
+async def run_once(graph, registry, query_type, report_mode):
+    search = {"organic_results": [{"title": "Apple beats", "link": "https://a.com", "snippet": "Revenue grew"}]}
+    classifier, fused = AsyncMock(), AsyncMock()
+    classifier.ainvoke = delayed(Classification(query_type), LLM_LATENCY)
+    fused.ainvoke = delayed(FusedReport(report="Apple grew.", highlights=["Revenue up"], critique="Thin."),
+                            FUSED_LATENCY)
+    with patch.object(nodes, "llm_cache", LLMCache(alias=None)), \
+            patch.object(nodes, "FAST_CLASSIFIER", False), \
+            patch.object(registry, "structured_llm",
+                         side_effect=lambda schema, model=None: fused if schema is FusedReport else classifier), \
+            patch.object(nodes, "google_search", delayed([None, search, None])), \
+            patch.object(nodes, "bing", delayed([None, None])), \
+            patch.object(nodes, "reddit", delayed([{"id": "c1", "body": "AAPL looks strong"}])), \
+            patch.object(nodes, "main", delayed({"info": {"symbol": "AAPL"}})), \
+            patch.object(nodes, "google_finance", delayed({"summary": {"price": 1}})), \
+            patch.object(nodes.price_store, "histories", AsyncMock(return_value={})):
+        metrics.clear()
+        start = time.perf_counter()
+        first_token = None
+        events = []
+        async for event in stream_research("What is going on with Apple?", graph, report_mode=report_mode):
+            if event["type"] == "token" and first_token is None:
+                first_token = time.perf_counter() - start
+            events.append(event)
+        elapsed = time.perf_counter() - start
+    assert events[-1] == {"type": "done"}, events[-1]
+    return elapsed, first_token, int(metrics.total('research_llm_calls_total'))
+
+
+async def main():
+    registry = GraphRegistry(default_model="local")
+    registry._models["local"] = SlowLocalModel()
+    with patch.object(nodes, "graph_registry", registry):
+        graph = registry.graph()
+        print(f"{'query type':<22}{'chain s':>10}{'fused s':>10}{'first token s':>18}{'LLM calls':>12}")
+        for query_type in QUERY_TYPES:
+            chain_time, chain_first, chain_calls = await run_once(graph, registry, query_type, "chain")
+            fused_time, fused_first, fused_calls = await run_once(graph, registry, query_type, "fused")
+            print(f"{query_type:<22}{chain_time:>10.2f}{fused_time:>10.2f}"
+                  f"{f'{chain_first:.2f} -> {fused_first:.2f}':>18}{f'{chain_calls} -> {fused_calls}':>12}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
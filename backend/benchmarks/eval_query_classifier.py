@@ -0,0 +1,112 @@
+"""
+Offline evaluation of the local query classifier against the reference labels in
+`src/workflow/query_labels.jsonl`, by stratified k-fold cross-validation. Reports how often the
+local path answers (coverage), its accuracy when it does, the end-to-end accuracy when the
+uncertain questions fall back to the LLM, and the time per local classification.
+
+The bundled labels are hand-written, not LLM output, so the end-to-end figure assumes the LLM
+agrees with them on the questions it gets. Run --relabel first to measure agreement with the
+actual model.
+
+    cd backend && python -m benchmarks.eval_query_classifier [--folds 5] [--threshold 0.7]
+    cd backend && python -m benchmarks.eval_query_classifier --relabel   (needs GEMINI_API_KEY)
+
+--relabel asks the configured LLM to label every question again and rewrites the file, so the
+reference labels track the model that the local classifier stands in for.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import timeit
+from collections import defaultdict
+
+from src.workflow.fast_classifier import LABELS, LABELS_PATH, FastQueryClassifier, load_examples
+
+
+def folds(examples, count, seed=7):
+    by_label = defaultdict(list)
+    for example in examples:
+        by_label[example[1]].append(example)
+    assignment = [[] for _ in range(count)]
+    rng = random.Random(seed)
+    for label in sorted(by_label):
+        items = by_label[label]
+        rng.shuffle(items)
+        for i, example in enumerate(items):
+            assignment[i % count].append(example)
+    return assignment
+
+
+def evaluate(examples, count, threshold):
+    parts = folds(examples, count)
+    answered = correct_answered = correct_best = 0
+    confusion = defaultdict(int)
+    for i, test in enumerate(parts):
+        train = [example for j, part in enumerate(parts) if j != i for example in part]
+        classifier = FastQueryClassifier(train, threshold=threshold).fit()
+        for question, label in test:
+            best, _ = classifier.predict(question)
+            correct_best += best == label
+            confusion[(label, best)] += 1
+            local = classifier.classify(question)
+            if local is not None:
+                answered += 1
+                correct_answered += local == label
+    total = len(examples)
+    # Fallback questions are counted as correct: this assumes the LLM matches the reference labels,
+    # which holds exactly only after --relabel.
+    end_to_end = (correct_answered + total - answered) / total
+    print(f"questions                 {total}")
+    print(f"argmax accuracy           {correct_best / total:.1%}")
+    print(f"local coverage            {answered / total:.1%}  (threshold {threshold})")
+    print(f"accuracy when local       {correct_answered / max(answered, 1):.1%}")
+    print(f"end-to-end agreement      {end_to_end:.1%}")
+    print("confusion (rows: reference label, columns: local argmax)")
+    print(f"{'':<22}" + ''.join(f"{label:>22}" for label in LABELS))
+    for label in LABELS:
+        print(f"{label:<22}" + ''.join(f"{confusion[(label, other)]:>22}" for other in LABELS))
+
+
+def latency(examples):
+    classifier = FastQueryClassifier(examples).fit()
+    questions = [question for question, _ in examples]
+    number = 5
+    seconds = min(timeit.repeat(lambda: [classifier.classify(q) for q in questions], number=number, repeat=3))
+    print(f"local classification      {seconds / (number * len(questions)) * 1e6:.1f} us/question")
+
+
+async def relabel(examples):
+    from src.config.str_outputs import QueryClassifier
+    from src.workflow.registry import graph_registry
+    from src.workflow.nodes import classification_prompt
+
+    labelled = []
+    llm = graph_registry.structured_llm(QueryClassifier)
+    for question, _ in examples:
+        result = await llm.ainvoke(classification_prompt(question))
+        labelled.append({"question": question, "label": result.query_type})
+    with open(LABELS_PATH, 'w', encoding='utf-8') as f:
+        for row in labelled:
+            f.write(json.dumps(row) + '\n')
+    print(f"Relabelled {len(labelled)} questions into {LABELS_PATH}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=None)
+    parser.add_argument('--relabel', action='store_true')
+    args = parser.parse_args()
+    examples = load_examples()
+    if args.relabel:
+        asyncio.run(relabel(examples))
+        examples = load_examples()
+    threshold = args.threshold if args.threshold is not None else FastQueryClassifier().threshold
+    evaluate(examples, args.folds, threshold)
+    latency(examples)
+
+
+if __name__ == '__main__':
+    main()
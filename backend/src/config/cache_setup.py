@@ -0,0 +1,15 @@
+import os
+from aiocache import caches
+from .serializers import ColumnarSerializer
+
+# Shared aiocache configuration. The 'default' alias is the Redis tier used by the
+# Reddit tools and by the SerpAPI response cache. Reddit post payloads are stored
+# columnar, other values pickled.
+caches.set_config({
+    'default': {
+        'cache': 'aiocache.backends.redis.RedisCache',
+        'endpoint': os.getenv('REDIS_HOST', '127.0.0.1'),
+        'port': int(os.getenv('REDIS_PORT', 6379)),
+        'serializer': {'class': ColumnarSerializer},
+        'ttl': 4800
+    }})
@@ -0,0 +1,44 @@
+"""
+This module defers heavy third-party imports (pandas, yfinance, aiohttp, asyncpraw, ...) until
+their first use, so importing the workflow stays cheap for short-lived and autoscaled workers.
+"""
+
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Returns a lazy stand-in for module `name`, e.g. `pd = lazy_import('pandas')`.
+
+    The real module is imported on first attribute access. Annotations that name its types
+    must be quoted, or they trigger the import when the function is defined.
+    """
+    return LazyModule(name)
@@ -0,0 +1,224 @@
+"""
+This module provides a cache for LLM node outputs. Entries are keyed on the model name, the
+graph node and a hash of the whitespace-normalized prompt, kept in a bounded in-memory LRU and
+backed by the shared Redis alias. An optional semantic tier matches near-duplicate user
+questions by embedding similarity, so rephrased repeat questions reuse earlier answers.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from aiocache import caches
+from . import cache_setup  # noqa: F401 -- registers the 'default' Redis alias
+from .lazy_imports import lazy_import
+from .telemetry import record_cache_lookup
+
+np = lazy_import('numpy')
+
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', 3600))
+LLM_CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', 512))
+# The semantic tier is off unless enabled; cosine similarity needed for a question match.
+SEMANTIC_CACHE = os.getenv('LLM_SEMANTIC_CACHE', '').lower() in ('1', 'true', 'yes')
+SEMANTIC_THRESHOLD = float(os.getenv('LLM_SEMANTIC_THRESHOLD', 0.9))
+
+
+def normalize_prompt(prompt: str) -> str:
+    return ' '.join(prompt.split())
+
+
+def llm_cache_key(model: str, node: str, prompt: str) -> str:
+    """
+    Builds the exact-match key 'llm:<model>:<node>:<sha256 of the normalized prompt>'.
+    """
+    digest = hashlib.sha256(normalize_prompt(prompt).encode('utf-8')).hexdigest()
+    return f"llm:{model}:{node}:{digest}"
+
+
+def semantic_scope(prompt: str, question: str, entities: Optional[Iterable[str]] = None) -> Tuple[tuple, str]:
+    """
+    Returns what must match exactly for a semantic hit: the entities (e.g. resolved symbols) the
+    question is about, and a digest of the prompt without the question, i.e. of the data the
+    output was built from. Similar questions about another company, or over other tool data,
+    never share an output.
+    """
+    data = normalize_prompt(prompt).replace(normalize_prompt(question), '')
+    digest = hashlib.sha256(data.encode('utf-8')).hexdigest()
+    return tuple(sorted({entity.upper() for entity in entities or ()})), digest
+
+
+class HashingEmbedder:
+    """
+    Local question embedder: word unigrams and bigrams hashed into a fixed-size, L2-normalized
+    vector. Needs no model or network call; any callable returning a vector can replace it.
+    """
+
+    def __init__(self, dimensions: int = 512) -> None:
+        self.dimensions = dimensions
+
+    def __call__(self, text: str) -> 'np.ndarray':
+        words = normalize_prompt(text.lower()).split()
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+            vector[int.from_bytes(digest, 'big') % self.dimensions] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class LLMCache:
+    """
+    Exact in-memory LRU and Redis tiers, plus an optional in-memory semantic tier per
+    (model, node, semantic scope), with hit/miss counters. Each in-memory tier holds at most
+    `max_entries` entries in total.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[int] = None, alias: Optional[str] = 'default',
+                 embedder: Optional[Callable[[str], 'np.ndarray']] = None, threshold: Optional[float] = None) -> None:
+        self.max_entries = max_entries if max_entries is not None else LLM_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else LLM_CACHE_TTL
+        self.alias = alias
+        self.embedder = embedder if embedder is not None else (HashingEmbedder() if SEMANTIC_CACHE else None)
+        self.threshold = threshold if threshold is not None else SEMANTIC_THRESHOLD
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._semantic: Dict[tuple, Dict[str, tuple]] = {}
+        # Recency of semantic entries across every bucket, as (bucket, question key).
+        self._semantic_lru: "OrderedDict[tuple, None]" = OrderedDict()
+        self.stats = {'memory_hits': 0, 'redis_hits': 0, 'semantic_hits': 0, 'misses': 0}
+
+    def _memory_get(self, key: str):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: Any) -> None:
+        self._memory[key] = (time.monotonic() + self.ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _semantic_drop(self, bucket: tuple, key: str) -> None:
+        entries = self._semantic.get(bucket)
+        if entries is not None:
+            entries.pop(key, None)
+            if not entries:
+                del self._semantic[bucket]
+        self._semantic_lru.pop((bucket, key), None)
+
+    def _semantic_get(self, model: str, node: str, question: str, scope: tuple):
+        bucket = (model, node) + scope
+        entries = self._semantic.get(bucket)
+        if not entries:
+            return None
+        vector = self.embedder(question)
+        now = time.monotonic()
+        best, best_score = None, self.threshold
+        for key, (expires_at, other, value) in list(entries.items()):
+            if expires_at <= now:
+                self._semantic_drop(bucket, key)
+                continue
+            score = float(np.dot(vector, other))
+            if score >= best_score:
+                best, best_score = key, score
+        if best is None:
+            return None
+        self._semantic_lru.move_to_end((bucket, best))
+        return entries[best][2]
+
+    def _semantic_set(self, model: str, node: str, question: str, scope: tuple, value: Any) -> None:
+        bucket = (model, node) + scope
+        key = normalize_prompt(question.lower())
+        self._semantic.setdefault(bucket, {})[key] = (time.monotonic() + self.ttl, self.embedder(question), value)
+        self._semantic_lru[(bucket, key)] = None
+        self._semantic_lru.move_to_end((bucket, key))
+        while len(self._semantic_lru) > self.max_entries:
+            self._semantic_drop(*next(iter(self._semantic_lru)))
+
+    async def get(self, model: str, node: str, prompt: str, question: Optional[str] = None,
+                  entities: Optional[Iterable[str]] = None):
+        """
+        Looks a prompt up in memory, then Redis, then (with a question) the semantic tier, which
+        only matches entries with the same `entities` and prompt data (see `semantic_scope`).
+
+        Returns:
+            The cached output, or None on a miss.
+        """
+        key = llm_cache_key(model, node, prompt)
+        value = self._memory_get(key)
+        if value is not None:
+            self.stats['memory_hits'] += 1
+            record_cache_lookup('llm', 'memory')
+            return value
+        if self.alias is not None:
+            try:
+                value = await caches.get(self.alias).get(key)
+            except Exception as e:
+                print(f"LLM cache read failed for {key}: {e}")
+                value = None
+            if value is not None:
+                self.stats['redis_hits'] += 1
+                record_cache_lookup('llm', 'redis')
+                self._memory_set(key, value)
+                return value
+        if question and self.embedder is not None:
+            value = self._semantic_get(model, node, question, semantic_scope(prompt, question, entities))
+            if value is not None:
+                self.stats['semantic_hits'] += 1
+                record_cache_lookup('llm', 'semantic')
+                return value
+        self.stats['misses'] += 1
+        record_cache_lookup('llm', 'miss')
+        return None
+
+    async def set(self, model: str, node: str, prompt: str, value: Any, question: Optional[str] = None,
+                  entities: Optional[Iterable[str]] = None) -> None:
+        key = llm_cache_key(model, node, prompt)
+        self._memory_set(key, value)
+        if question and self.embedder is not None:
+            self._semantic_set(model, node, question, semantic_scope(prompt, question, entities), value)
+        if self.alias is not None:
+            try:
+                await caches.get(self.alias).set(key, value, ttl=self.ttl)
+            except Exception as e:
+                print(f"LLM cache write failed for {key}: {e}")
+
+    async def fetch(self, model: str, node: str, prompt: str, loader: Callable[[], Awaitable[Any]],
+                    question: Optional[str] = None, entities: Optional[Iterable[str]] = None):
+        """
+        Returns the cached output for a node prompt, calling `loader` and caching its result on
+        a miss. Empty outputs are not cached.
+
+        Args:
+            model (str): Model name; outputs of different models never mix.
+            node (str): Graph node producing the output.
+            prompt (str): The full prompt.
+            loader: Coroutine function producing the output on a miss.
+            question (str, optional): The user question, used by the semantic tier.
+            entities (optional): What the question is about (e.g. its resolved symbols); semantic
+                hits require the same entities.
+        """
+        value = await self.get(model, node, prompt, question, entities)
+        if value is not None:
+            return value
+        value = await loader()
+        if value:
+            await self.set(model, node, prompt, value, question, entities)
+        return value
+
+    def clear(self) -> None:
+        self._memory.clear()
+        self._semantic.clear()
+        self._semantic_lru.clear()
+        self.stats = {'memory_hits': 0, 'redis_hits': 0, 'semantic_hits': 0, 'misses': 0}
+
+
+# Process-wide cache shared by every workflow node.
+llm_cache = LLMCache()
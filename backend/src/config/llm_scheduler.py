@@ -0,0 +1,267 @@
+"""
+This module schedules the workflow's LLM calls for the whole process, so concurrent research
+runs share the provider's quota instead of each firing its calls at once. Calls wait in one
+priority queue and are admitted under token-bucket budgets for requests and tokens per minute and
+an adaptive concurrency limit: the limit grows by about one call per round of successful calls and
+halves when the provider answers with a rate-limit error (AIMD), after which admissions pause for
+a backoff and the rejected call is retried. Report nodes on a run's critical path are admitted
+before the per-source analyses.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from .setup_logs import logger
+from .telemetry import metrics
+
+T = TypeVar('T')
+
+# Provider budgets; 0 disables a budget.
+LLM_REQUESTS_PER_MINUTE = float(os.getenv('LLM_REQUESTS_PER_MINUTE', 300))
+LLM_TOKENS_PER_MINUTE = float(os.getenv('LLM_TOKENS_PER_MINUTE', 1_000_000))
+# Seconds of budget that may be spent in one burst; 60 matches per-minute provider quotas.
+LLM_BURST_SECONDS = float(os.getenv('LLM_BURST_SECONDS', 60))
+# The concurrency limit starts at LLM_INITIAL_CONCURRENCY and adapts between 1 and LLM_MAX_CONCURRENCY.
+LLM_INITIAL_CONCURRENCY = int(os.getenv('LLM_INITIAL_CONCURRENCY', 8))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 32))
+# Retries of a rate-limited call; the pause before retry n is LLM_BACKOFF_SECONDS * 2**n, capped.
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 4))
+LLM_BACKOFF_SECONDS = float(os.getenv('LLM_BACKOFF_SECONDS', 1.0))
+LLM_MAX_BACKOFF_SECONDS = float(os.getenv('LLM_MAX_BACKOFF_SECONDS', 60))
+
+# Admission order by node, lowest first: nodes that finish a run go before nodes that start one.
+NODE_PRIORITY = {
+    "synthesize_report": 0,
+    "fused_report": 0,
+    "fused_report_text": 0,
+    "analyze_synthesized_report": 1,
+    "extract_highlights": 1,
+    "aggregate_finance_analysis_1": 2,
+    "aggregate_general_analysis_2": 2,
+    "classify_question": 2,
+}
+# Priority of every other node (the per-source analyses).
+DEFAULT_PRIORITY = 3
+
+# Exception classes provider clients raise for HTTP 429 (google-api-core, openai, anthropic SDKs).
+RATE_LIMIT_ERRORS = ('ResourceExhausted', 'RateLimitError', 'TooManyRequests')
+# Status phrases of errors that carry no status code or type, e.g. a gRPC status re-raised as text.
+RATE_LIMIT_MARKERS = ('resource_exhausted', 'resource exhausted', 'rate limit', 'too many requests')
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """
+    Tells whether an LLM client error is the provider's rate-limit or quota response (HTTP 429),
+    from its status code, its exception type or an explicit status phrase in its message.
+    """
+    for status in (getattr(error, 'status_code', None), getattr(error, 'code', None),
+                   getattr(getattr(error, 'response', None), 'status_code', None)):
+        if isinstance(status, int) and status == 429:
+            return True
+    if any(cls.__name__ in RATE_LIMIT_ERRORS for cls in type(error).__mro__):
+        return True
+    text = str(error).lower()
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+
+class TokenBucket:
+    """
+    Refills at `per_minute / 60` units per second up to `capacity` (default: one minute's budget).
+
+    Units can be taken beyond the current level; the debt delays later admissions, which is how
+    output tokens, only known after a call, are charged.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float) -> float:
+        """
+        Returns the seconds until `amount` units are available, 0 if they are now.
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        # A request larger than the bucket waits for a full bucket rather than forever.
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        if self.rate > 0:
+            self._refill()
+            self.level -= amount
+
+
+class LLMScheduler:
+    """
+    Priority queue in front of the LLM with request and token budgets and an AIMD concurrency limit.
+
+    Args:
+        requests_per_minute (float, optional): Request budget. Defaults to LLM_REQUESTS_PER_MINUTE.
+        tokens_per_minute (float, optional): Token budget. Defaults to LLM_TOKENS_PER_MINUTE.
+        initial_concurrency (int, optional): Starting limit. Defaults to LLM_INITIAL_CONCURRENCY.
+        max_concurrency (int, optional): Upper bound of the limit. Defaults to LLM_MAX_CONCURRENCY.
+        max_retries (int, optional): Retries of a rate-limited call. Defaults to LLM_MAX_RETRIES.
+        backoff (float, optional): First pause after a rate limit. Defaults to LLM_BACKOFF_SECONDS.
+        burst_seconds (float, optional): Budget available in one burst. Defaults to LLM_BURST_SECONDS.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 initial_concurrency: Optional[int] = None, max_concurrency: Optional[int] = None,
+                 max_retries: Optional[int] = None, backoff: Optional[float] = None,
+                 burst_seconds: Optional[float] = None) -> None:
+        burst = (LLM_BURST_SECONDS if burst_seconds is None else burst_seconds) / 60
+        requests_per_minute = LLM_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+        tokens_per_minute = LLM_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        self.requests = TokenBucket(requests_per_minute, capacity=requests_per_minute * burst)
+        self.tokens = TokenBucket(tokens_per_minute, capacity=tokens_per_minute * burst)
+        self.max_concurrency = max_concurrency or LLM_MAX_CONCURRENCY
+        self.limit = float(min(initial_concurrency or LLM_INITIAL_CONCURRENCY, self.max_concurrency))
+        self.max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = LLM_BACKOFF_SECONDS if backoff is None else backoff
+        self.in_flight = 0
+        self._queue: List[tuple] = []
+        self._order = itertools.count()
+        self._paused_until = 0.0
+        self._decreased_at = float('-inf')
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = 0.0
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def priority(self, node: str) -> int:
+        return NODE_PRIORITY.get(node, DEFAULT_PRIORITY)
+
+    async def acquire(self, node: str, tokens: float = 0) -> None:
+        """
+        Waits until a call of `node` estimated at `tokens` input tokens may start. Each
+        acquire must be paired with a `release`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (self.priority(node), next(self._order), future, tokens))
+        start = time.monotonic()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Admitted just before being cancelled: give the slot back.
+            if future.done() and not future.cancelled():
+                self.release()
+            self._dispatch()
+            raise
+        metrics.observe('research_llm_queue_wait_seconds', time.monotonic() - start, node=node)
+
+    def release(self, rate_limited: bool = False, succeeded: bool = False, pause: Optional[float] = None) -> None:
+        """
+        Frees an admitted call's slot and adapts the concurrency limit to its outcome: additive
+        increase on success, halving (at most once per backoff period) on a rate limit.
+        """
+        self.in_flight -= 1
+        now = time.monotonic()
+        if rate_limited:
+            pause = self.backoff if pause is None else pause
+            if now - self._decreased_at >= self.backoff:
+                self.limit = max(1.0, self.limit / 2)
+                self._decreased_at = now
+            self._paused_until = max(self._paused_until, now + pause)
+        elif succeeded:
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+        self._dispatch()
+
+    def charge(self, tokens: float) -> None:
+        """
+        Charges tokens spent beyond the admission estimate (e.g. output tokens) to the token budget.
+        """
+        self.tokens.take(tokens)
+
+    def _dispatch(self) -> None:
+        while self._queue:
+            _, _, future, tokens = self._queue[0]
+            if future.done():  # cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+            if self.in_flight >= int(self.limit):
+                break
+            wait = max(self._paused_until - time.monotonic(), self.requests.delay(1), self.tokens.delay(tokens))
+            if wait > 0:
+                self._wake_in(wait, future.get_loop())
+                break
+            heapq.heappop(self._queue)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.in_flight += 1
+            future.set_result(None)
+        metrics.set('research_llm_queue_depth', len(self._queue))
+        metrics.set('research_llm_in_flight', self.in_flight)
+        metrics.set('research_llm_concurrency_limit', self.limit)
+
+    def _wake_in(self, delay: float, loop: asyncio.AbstractEventLoop) -> None:
+        # One timer re-runs the dispatch once the head of the queue can be admitted; a pending
+        # timer of this loop that fires early enough is kept.
+        now = time.monotonic()
+        timer = self._timer
+        if timer is not None and self._timer_loop is loop and now < self._timer_at <= now + delay:
+            return
+        if timer is not None:
+            timer.cancel()
+        self._timer_at, self._timer_loop = now + delay, loop
+        self._timer = loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    async def run(self, node: str, tokens: float, call: Callable[[], Awaitable[T]],
+                  retryable: Optional[Callable[[], bool]] = None) -> T:
+        """
+        Runs `call` once admitted, retrying it after a backoff when the provider rate-limits it.
+
+        Args:
+            node (str): Graph node making the call; sets its priority.
+            tokens (float): Estimated input tokens, taken from the token budget on admission.
+            call: Zero-argument coroutine function performing the LLM call.
+            retryable (optional): Tells after a rate-limited attempt whether `call` may be run
+                again, e.g. False once a streamed call has emitted part of its response.
+
+        Returns:
+            The result of `call`. Errors other than rate limits, and a rate limit after the last
+            retry or one that is not retryable, are raised.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(node, tokens)
+            try:
+                result = await call()
+            except Exception as e:
+                limited = is_rate_limited(e)
+                if not limited:
+                    self.release()
+                    raise
+                metrics.inc('research_llm_rate_limited_total', node=node)
+                self.release(rate_limited=True,
+                             pause=min(self.backoff * 2 ** attempt, LLM_MAX_BACKOFF_SECONDS))
+                if attempt == self.max_retries or (retryable is not None and not retryable()):
+                    raise
+                logger.warning(f"LLM call of {node} rate limited, retry {attempt + 1}/{self.max_retries}: {e}")
+                continue
+            except BaseException:
+                self.release()
+                raise
+            self.release(succeeded=True)
+            return result
+
+
+# Process-wide scheduler shared by every research run.
+llm_scheduler = LLMScheduler()
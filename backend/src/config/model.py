@@ -1,9 +1,41 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+import hashlib
 import os
 import asyncio
 
+# Model used by the workflow. 'local' selects the offline stand-in below.
+DEFAULT_MODEL = os.getenv('LLM_MODEL', 'gemini-2.5-flash')
+LOCAL_MODEL = 'local'
+
+
+class LocalChatModel(BaseChatModel):
+    """
+    Offline stand-in for the chat model, used by tests and local runs. Replies are
+    deterministic: the same prompt always yields the same text, and no API key is needed.
+    """
+
+    def _reply(self, messages) -> str:
+        prompt = '\n'.join(str(message.content) for message in messages)
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+        words = prompt.split()
+        return f"[local {digest}] {' '.join(words[:40])}"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for index, word in enumerate(self._reply(messages).split(' ')):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if index == 0 else f" {word}"))
+
+    @property
+    def _llm_type(self) -> str:
+        return 'local'
+
+
 class Model:
-    def __init__(self, model_name: str='gemini-2.5-flash') -> None:
+    def __init__(self, model_name: str = DEFAULT_MODEL) -> None:
         self.model_name = model_name
         self._api_key = os.getenv('GEMINI_API_KEY')
 
@@ -17,7 +49,11 @@ class Model:
         Returns:
             ChatGoogleGenerativeAI: An instance of the model, or None if instantiation fails.
         """
+        if self.model_name == LOCAL_MODEL:
+            return LocalChatModel()
         try:
+            # Imported on first use: the Gemini client is the slowest import in the backend
+            from langchain_google_genai import ChatGoogleGenerativeAI
             llm = ChatGoogleGenerativeAI(
                 model=self.model_name,
                 api_key=self._api_key,
@@ -65,4 +101,4 @@ if __name__=='__main__':
         except Exception as e:
             print(f"Error during model invocation: {e}")
 
-asyncio.run(main('hi how are u'))
\ No newline at end of file
+    asyncio.run(main('hi how are u'))
\ No newline at end of file
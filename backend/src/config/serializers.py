@@ -0,0 +1,161 @@
+"""
+Cache serialization for Reddit post payloads.
+
+Posts are stored as msgpack struct-of-arrays instead of pickled lists of per-comment dicts:
+string columns are plain lists, author names are interned into a lookup table, and numeric
+columns are packed little-endian arrays that decode as memoryviews without copying.
+Any other cached value falls back to pickle.
+"""
+
+import pickle
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+import msgpack
+from aiocache.serializers import BaseSerializer
+
+MAGIC = b"RC1"
+
+# Numeric comment columns and their array typecodes.
+NUMERIC_COLUMNS = {
+    "score": "i",
+    "depth": "h",
+    "controversiality": "b",
+    "gilded": "i",
+    "total_awards_received": "i",
+}
+STRING_COLUMNS = ("id", "body")
+POST_KEYS = {"title", "score", "comments"}
+
+
+def is_post_payload(value) -> bool:
+    """
+    True for the payloads built by `reddit_comments.load_post`.
+    """
+    return (
+        isinstance(value, Mapping)
+        and set(value.keys()) <= POST_KEYS
+        and isinstance(value.get("comments"), (list, CommentColumns))
+    )
+
+
+def _pack(typecode: str, values) -> bytes:
+    packed = array(typecode, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(typecode: str, data: bytes):
+    if sys.byteorder != "little":
+        packed = array(typecode)
+        packed.frombytes(data)
+        packed.byteswap()
+        return packed
+    return memoryview(data).cast(typecode)
+
+
+def encode_post(post: Mapping) -> bytes:
+    """
+    Encodes a post payload into the columnar format.
+    """
+    comments = post.get("comments") or []
+    authors, author_index = [], {}
+    author_refs = []
+    for comment in comments:
+        author = str(comment.get("author", "N/A"))
+        if author not in author_index:
+            author_index[author] = len(authors)
+            authors.append(author)
+        author_refs.append(author_index[author])
+
+    columns = {name: [comment.get(name) for comment in comments] for name in STRING_COLUMNS}
+    columns["author"] = _pack("I", author_refs)
+    for name, typecode in NUMERIC_COLUMNS.items():
+        columns[name] = _pack(typecode, [int(comment.get(name) or 0) for comment in comments])
+
+    return MAGIC + msgpack.packb({
+        "title": post.get("title"),
+        "score": post.get("score"),
+        "authors": authors,
+        "columns": columns,
+    }, use_bin_type=True)
+
+
+class CommentColumns(Sequence):
+    """
+    Read-only sequence view over the comment columns of one post. Comments are materialized
+    as dicts only when accessed; `column(name)` returns a whole column without building them.
+    """
+
+    def __init__(self, authors, columns) -> None:
+        self._authors = authors
+        self._columns = {name: columns[name] for name in STRING_COLUMNS}
+        self._columns["author"] = _unpack("I", columns["author"])
+        for name, typecode in NUMERIC_COLUMNS.items():
+            self._columns[name] = _unpack(typecode, columns[name])
+
+    def __len__(self) -> int:
+        return len(self._columns["id"])
+
+    def column(self, name: str):
+        if name == "author":
+            return [self._authors[ref] for ref in self._columns["author"]]
+        return self._columns[name]
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        comment = {name: self._columns[name][position] for name in STRING_COLUMNS}
+        comment["author"] = self._authors[self._columns["author"][position]]
+        for name in NUMERIC_COLUMNS:
+            comment[name] = self._columns[name][position]
+        return comment
+
+
+class PostColumns(Mapping):
+    """
+    Decoded post payload. Behaves like the original dict (`title`, `score`, `comments`).
+    """
+
+    def __init__(self, title, score, comments: CommentColumns) -> None:
+        self._data = {"title": title, "score": score, "comments": comments}
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def decode_post(data: bytes) -> PostColumns:
+    """
+    Decodes a payload produced by `encode_post`.
+    """
+    raw = msgpack.unpackb(memoryview(data)[len(MAGIC):], raw=False)
+    return PostColumns(raw["title"], raw["score"], CommentColumns(raw["authors"], raw["columns"]))
+
+
+class ColumnarSerializer(BaseSerializer):
+    """
+    aiocache serializer that stores Reddit post payloads columnar and everything else pickled.
+    Values written by the previous PickleSerializer still load.
+    """
+
+    DEFAULT_ENCODING = None
+
+    def dumps(self, value):
+        if is_post_payload(value):
+            return encode_post(value)
+        return pickle.dumps(value, protocol=pickle.DEFAULT_PROTOCOL)
+
+    def loads(self, value):
+        if value is None:
+            return None
+        if value[:len(MAGIC)] == MAGIC:
+            return decode_post(value)
+        return pickle.loads(value)  # noqa: S301
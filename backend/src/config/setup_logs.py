@@ -71,6 +71,12 @@ class LogSetup:
         return self.logger
 
 
+# Shared application logger used by the workflow nodes.
+_log_setup = LogSetup('research_agent')
+_log_setup.setup_console_handler()
+logger = _log_setup.get_logger()
+
+
 if __name__=='__main__':
     logger_setup = LogSetup('my_logger')
     logger_setup.setup_console_handler()
@@ -1,13 +1,19 @@
 import datetime
 from typing import Optional
 from pydantic import BaseModel,Field
-from typing import List
+from typing import List, Literal
 
 def now_iso():
     """Return current datetime in ISO format including time and timezone if available."""
     return datetime.datetime.now(datetime.timezone.utc).isoformat()
 
 
+class QueryClassifier(BaseModel):
+    query_type: Literal['finance', 'general', 'finance and general'] = Field(
+        ..., description="Category of the user query: 'finance', 'general' or 'finance and general'"
+    )
+
+
 class AnalysisSource(BaseModel):
     source_name: Optional[str] = Field(
         None, description="Name of the data source, e.g., Google, Bing, Reddit, Google Finance", examples=["Google", "Reddit"]
@@ -101,3 +107,18 @@ class Report(BaseModel):
             }
         }
 
+
+
+class FusedReport(Report):
+    """
+    Synthesis, highlights and critique of a research run, produced by one structured-output call.
+    `report` holds the synthesized answer.
+    """
+    highlights: List[str] = Field(
+        default_factory=list,
+        description="Major highlights and key takeaways of the report, one per item",
+        examples=[["Revenue grew 8% year over year.", "Guidance was raised for the full year."]]
+    )
+    critique: str = Field(
+        "", description="Critical analysis of the report: strengths, weaknesses and open questions"
+    )
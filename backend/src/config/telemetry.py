@@ -0,0 +1,293 @@
+"""
+This module records per-node and per-call telemetry for research runs: wall time of every graph
+node and tool call, LLM calls and token usage, and cache hits. Measurements are kept in a small
+in-process metrics registry exported in the Prometheus text format (served at /metrics), and,
+when `opentelemetry` is installed, also emitted as spans. Every run gets a trace id that is
+attached to its spans and log lines, so one slow or expensive run can be followed end to end.
+"""
+
+import functools
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .setup_logs import logger
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # spans are optional; metrics and trace ids work without them
+    otel_trace = None
+
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = tuple(float(bound) for bound in os.getenv(
+    'TELEMETRY_LATENCY_BUCKETS', '0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60').split(','))
+
+# Trace id of the research run executing in the current context.
+current_trace_id: ContextVar[Optional[str]] = ContextVar('research_trace_id', default=None)
+
+
+def new_trace_id() -> str:
+    """
+    Returns a random 128-bit trace id as 32 hex characters (the OpenTelemetry format).
+    """
+    return uuid.uuid4().hex
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters, gauges and latency histograms keyed by metric name and label set.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._gauges: Dict[str, Dict[tuple, float]] = {}
+        self._histograms: Dict[str, Dict[tuple, list]] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, kind: str, text: str) -> None:
+        self._help[name] = (kind, text)
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = float(value)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts (made cumulative on export), then sum and count.
+            state = series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def value(self, name: str, **labels) -> float:
+        """
+        Returns a counter's or gauge's value, or a histogram's observation count, for an exact
+        label set.
+        """
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            if name in self._histograms:
+                state = self._histograms[name].get(key)
+                return state[-1] if state else 0
+            if name in self._gauges:
+                return self._gauges[name].get(key, 0.0)
+            return self._counters.get(name, {}).get(key, 0.0)
+
+    def total(self, name: str, **labels) -> float:
+        """
+        Sums a counter (or histogram counts) over every series matching the given labels.
+        """
+        wanted = {(k, str(v)) for k, v in labels.items()}
+        with self._lock:
+            if name in self._histograms:
+                return sum(state[-1] for key, state in self._histograms[name].items() if wanted <= set(key))
+            return sum(value for key, value in self._counters.get(name, {}).items() if wanted <= set(key))
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format (version 0.0.4).
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._counters) | set(self._gauges) | set(self._histograms)):
+                default = 'histogram' if name in self._histograms else 'gauge' if name in self._gauges else 'counter'
+                kind, text = self._help.get(name, (default, ''))
+                if text:
+                    lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+                series = {**self._counters.get(name, {}), **self._gauges.get(name, {})}
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                for key, state in sorted(self._histograms.get(name, {}).items()):
+                    cumulative = 0
+                    for i, bound in enumerate(self.buckets):
+                        cumulative += state[i]
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', _format_value(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(state[-2])}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-1]}")
+        return '\n'.join(lines) + '\n'
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+# Process-wide metrics registry, exported by the API at /metrics.
+metrics = MetricsRegistry()
+metrics.describe('research_runs_total', 'counter', 'Research runs by final status.')
+metrics.describe('research_node_duration_seconds', 'histogram', 'Wall time of workflow nodes.')
+metrics.describe('research_tool_duration_seconds', 'histogram', 'Wall time of tool and external API calls.')
+metrics.describe('research_llm_calls_total', 'counter', 'LLM calls by node, model and cache outcome.')
+metrics.describe('research_llm_tokens_total', 'counter', 'LLM input and output tokens by node and model.')
+metrics.describe('research_cache_lookups_total', 'counter', 'Cache lookups by cache and result.')
+metrics.describe('research_query_classifications_total', 'counter', 'Question classifications by path (local, llm or error).')
+metrics.describe('research_llm_queue_depth', 'gauge', 'LLM calls waiting in the scheduler queue.')
+metrics.describe('research_llm_in_flight', 'gauge', 'LLM calls admitted by the scheduler and not yet finished.')
+metrics.describe('research_llm_concurrency_limit', 'gauge', 'Adaptive (AIMD) limit on concurrent LLM calls.')
+metrics.describe('research_llm_queue_wait_seconds', 'histogram', 'Time LLM calls wait in the scheduler queue.')
+metrics.describe('research_llm_rate_limited_total', 'counter', 'LLM calls rejected by the provider with a rate-limit error.')
+
+
+def _otel_parent(trace_id: Optional[str]):
+    """
+    Builds an OpenTelemetry context whose trace id is the run's trace id.
+    """
+    if otel_trace is None or not trace_id:
+        return None
+    span_context = otel_trace.SpanContext(
+        trace_id=int(trace_id, 16),
+        span_id=int(uuid.uuid4().hex[:16], 16),
+        is_remote=True,
+        trace_flags=otel_trace.TraceFlags(otel_trace.TraceFlags.SAMPLED),
+    )
+    return otel_trace.set_span_in_context(otel_trace.NonRecordingSpan(span_context))
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[None]:
+    """
+    Opens an OpenTelemetry span tagged with the current trace id, or does nothing if
+    OpenTelemetry is not installed. Exceptions are recorded on the span and re-raised.
+    """
+    if otel_trace is None:
+        yield
+        return
+    trace_id = current_trace_id.get()
+    attributes['research.trace_id'] = trace_id or ''
+    tracer = otel_trace.get_tracer('research_agent')
+    # Spans started outside another span are parented on the run's trace id.
+    parent = None if otel_trace.get_current_span().get_span_context().is_valid else _otel_parent(trace_id)
+    with tracer.start_as_current_span(name, context=parent, attributes=attributes):
+        yield
+
+
+@contextmanager
+def run_trace(trace_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Binds a trace id to the current context for the duration of a run and yields it.
+    """
+    trace_id = trace_id or current_trace_id.get() or new_trace_id()
+    token = current_trace_id.set(trace_id)
+    try:
+        yield trace_id
+    finally:
+        current_trace_id.reset(token)
+
+
+@contextmanager
+def track_call(tool: str, **attributes) -> Iterator[None]:
+    """
+    Times a tool or external API call into `research_tool_duration_seconds` and a span.
+    """
+    start = time.perf_counter()
+    status = 'ok'
+    try:
+        with span(f"tool.{tool}", **attributes):
+            yield
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe('research_tool_duration_seconds', elapsed, tool=tool, status=status)
+        logger.debug(f"[{current_trace_id.get()}] tool {tool} {status} in {elapsed:.3f}s")
+
+
+def traced_tool(tool: str) -> Callable:
+    """
+    Decorator timing every call of an async tool function with `track_call`.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with track_call(tool):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _configured_trace_id() -> Optional[str]:
+    try:
+        from langgraph.config import get_config
+        return get_config().get('configurable', {}).get('trace_id')
+    except RuntimeError:
+        return None
+
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    """
+    Wraps an async graph node so its wall time and failures are recorded under `name`.
+
+    The run's trace id is read from the graph config (`configurable.trace_id`) and bound to
+    the node's context, so tool calls and LLM calls made by the node carry it too.
+    """
+    @functools.wraps(fn)
+    async def wrapper(state):
+        with run_trace(_configured_trace_id()) as trace_id:
+            start = time.perf_counter()
+            status = 'ok'
+            try:
+                with span(f"node.{name}", node=name):
+                    return await fn(state)
+            except BaseException:
+                status = 'error'
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                metrics.observe('research_node_duration_seconds', elapsed, node=name, status=status)
+                logger.debug(f"[{trace_id}] node {name} {status} in {elapsed:.3f}s")
+    return wrapper
+
+
+def record_llm_call(node: str, model: str, cached: bool, input_tokens: int = 0, output_tokens: int = 0) -> None:
+    """
+    Counts one LLM call of a node and, when the model was actually called, its tokens.
+    """
+    metrics.inc('research_llm_calls_total', node=node, model=model, cache='hit' if cached else 'miss')
+    if input_tokens:
+        metrics.inc('research_llm_tokens_total', input_tokens, node=node, model=model, direction='input')
+    if output_tokens:
+        metrics.inc('research_llm_tokens_total', output_tokens, node=node, model=model, direction='output')
+
+
+def record_cache_lookup(cache: str, result: str) -> None:
+    """
+    Counts a cache lookup; `result` is the tier that answered ('memory', 'redis', ...) or 'miss'.
+    """
+    metrics.inc('research_cache_lookups_total', cache=cache, result=result)
@@ -0,0 +1,405 @@
+"""
+ASGI entry point for running the research agent as a shared service. The workflow graph is
+compiled once at startup; questions are submitted as jobs, run under a per-tenant concurrency
+limit, and their progress is available as JSON status or as a server-sent event stream.
+
+    uvicorn src.main:app              (from the backend directory)
+
+Endpoints:
+    POST /research                     {"question": "...", "report_mode": "chain" | "fused"}
+                                       -> 202 {"id": ..., "status": "queued"}
+    GET  /research/{id}                job status, and the report once finished
+    GET  /research/{id}/events         server-sent events: node, token, report, error, done
+    GET  /health
+    GET  /metrics                      Prometheus metrics: node, tool and LLM latency, tokens, cache hits
+
+The tenant is taken from the X-Tenant-Id header ("default" when absent). Each job carries a trace
+id (returned on submit and in its status) that tags the run's spans and log lines.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .config.setup_logs import logger
+from .config.telemetry import metrics, new_trace_id
+from .tools.executor import run_blocking, shutdown_executor
+from .tools.http_client import close_session
+from .workflow.stream import REPORT_MODES, stream_research
+
+# Research runs executing at once per tenant, and runs a tenant may have queued or running.
+TENANT_CONCURRENCY = int(os.getenv('TENANT_CONCURRENCY', 2))
+TENANT_MAX_PENDING = int(os.getenv('TENANT_MAX_PENDING', 10))
+# Seconds a finished job stays available for status and event replay.
+JOB_RETENTION = float(os.getenv('JOB_RETENTION_SECONDS', 3600))
+# Seconds allowed to import the workflow, compile the graph and warm the model stack.
+STARTUP_TIMEOUT = float(os.getenv('STARTUP_TIMEOUT_SECONDS', 300))
+MAX_BODY_BYTES = 64 * 1024
+TENANT_HEADER = b'x-tenant-id'
+
+
+class Job:
+    """
+    One research run. Events are kept so late subscribers replay the run from the start.
+    """
+
+    def __init__(self, question: str, tenant: str, report_mode: Optional[str] = None) -> None:
+        self.id = uuid.uuid4().hex
+        self.trace_id = new_trace_id()
+        self.question = question
+        self.tenant = tenant
+        self.report_mode = report_mode
+        self.status = 'queued'
+        self.report: Optional[str] = None
+        self.error: Optional[str] = None
+        self.events: list = []
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._updated = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'error', 'cancelled')
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+        self._notify()
+
+    def finish(self, status: str) -> None:
+        self.status = status
+        self.finished_at = time.time()
+        self._notify()
+
+    def _notify(self) -> None:
+        updated, self._updated = self._updated, asyncio.Event()
+        updated.set()
+
+    async def follow(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields every event of the run, waiting for new ones until the job finishes.
+        """
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.finished:
+                return
+            await self._updated.wait()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'tenant': self.tenant,
+            'trace_id': self.trace_id,
+            'question': self.question,
+            'report_mode': self.report_mode,
+            'status': self.status,
+            'report': self.report,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class TenantLimiter:
+    """
+    Per-tenant semaphores for running jobs plus a cap on each tenant's outstanding jobs.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, max_pending: Optional[int] = None) -> None:
+        self.concurrency = concurrency or TENANT_CONCURRENCY
+        self.max_pending = max_pending or TENANT_MAX_PENDING
+        self._semaphores: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.concurrency))
+        self.pending: Counter = Counter()
+
+    def admit(self, tenant: str) -> bool:
+        if self.pending[tenant] >= self.max_pending:
+            return False
+        self.pending[tenant] += 1
+        return True
+
+    def release(self, tenant: str) -> None:
+        self.pending[tenant] -= 1
+        if self.pending[tenant] <= 0:
+            del self.pending[tenant]
+
+    def slot(self, tenant: str) -> asyncio.Semaphore:
+        return self._semaphores[tenant]
+
+
+def warm_graph():
+    """
+    Imports the workflow, compiles the graph and warms the model stack. Blocking.
+    """
+    from .workflow.registry import graph_registry
+    return graph_registry.warm()
+
+
+class ResearchService:
+    """
+    Owns the compiled graph and the jobs running on it.
+    """
+
+    def __init__(self, graph_factory: Optional[Callable[[], Any]] = None, limiter: Optional[TenantLimiter] = None,
+                 retention: Optional[float] = None) -> None:
+        self.graph_factory = graph_factory
+        self.limiter = limiter or TenantLimiter()
+        self.retention = JOB_RETENTION if retention is None else retention
+        self.graph = None
+        self.jobs: Dict[str, Job] = {}
+        self._startup_lock = asyncio.Lock()
+
+    async def startup(self) -> None:
+        """
+        Builds the graph once. The build runs in the blocking executor so requests keep being
+        served while it runs, e.g. when the first request triggers it on a server without
+        lifespan support; concurrent callers wait for the same build.
+        """
+        if self.graph is not None:
+            return
+        async with self._startup_lock:
+            if self.graph is None:
+                self.graph = await run_blocking(self.graph_factory or warm_graph, timeout=STARTUP_TIMEOUT)
+                logger.info("Research graph ready")
+
+    async def shutdown(self) -> None:
+        tasks = [job.task for job in self.jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await close_session()
+        shutdown_executor()
+
+    def _purge(self) -> None:
+        cutoff = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    def submit(self, question: str, tenant: str, report_mode: Optional[str] = None) -> Optional[Job]:
+        """
+        Queues a research run. Returns None when the tenant already has too many outstanding jobs.
+        """
+        self._purge()
+        if not self.limiter.admit(tenant):
+            return None
+        job = Job(question, tenant, report_mode)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job))
+        # Released when the task ends, including a task cancelled before _run started
+        job.task.add_done_callback(lambda task: self._done(job, task))
+        return job
+
+    def _done(self, job: Job, task: asyncio.Task) -> None:
+        self.limiter.release(job.tenant)
+        if not job.finished:
+            job.finish('cancelled' if task.cancelled() else 'error')
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    async def _run(self, job: Job) -> None:
+        try:
+            async with self.limiter.slot(job.tenant):
+                job.status = 'running'
+                job.started_at = time.time()
+                status = 'done'
+                async for event in stream_research(job.question, self.graph, trace_id=job.trace_id,
+                                                 report_mode=job.report_mode):
+                    if event['type'] == 'report':
+                        job.report = event['text']
+                    elif event['type'] == 'error':
+                        job.error = event['message']
+                        status = 'error'
+                    job.publish(event)
+                job.finish(status)
+        except asyncio.CancelledError:
+            job.finish('cancelled')
+            raise
+
+
+class ResearchApp:
+    """
+    Minimal ASGI application routing HTTP requests to a ResearchService.
+    """
+
+    ROUTES = [
+        ('POST', re.compile(r'^/research/?$'), 'submit'),
+        ('GET', re.compile(r'^/research/(?P<job_id>[0-9a-f]{32})/?$'), 'status'),
+        ('GET', re.compile(r'^/research/(?P<job_id>[0-9a-f]{32})/events/?$'), 'events'),
+        ('GET', re.compile(r'^/health/?$'), 'health'),
+        ('GET', re.compile(r'^/metrics/?$'), 'prometheus'),
+    ]
+
+    def __init__(self, service: Optional[ResearchService] = None) -> None:
+        self.service = service or ResearchService()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.service.startup()
+                except Exception as e:
+                    logger.error(f"Startup failed: {e}")
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.service.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send) -> None:
+        path_matched = False
+        for method, pattern, handler in self.ROUTES:
+            match = pattern.match(scope['path'])
+            if match is None:
+                continue
+            path_matched = True
+            if scope['method'] == method:
+                await getattr(self, handler)(scope, receive, send, **match.groupdict())
+                return
+        if path_matched:
+            await send_json(send, 405, {'error': 'method not allowed'})
+        else:
+            await send_json(send, 404, {'error': 'not found'})
+
+    async def health(self, scope, receive, send) -> None:
+        await send_json(send, 200, {'status': 'ok', 'graph_ready': self.service.graph is not None})
+
+    async def prometheus(self, scope, receive, send) -> None:
+        body = metrics.render().encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'text/plain; version=0.0.4; charset=utf-8'),
+                        (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def submit(self, scope, receive, send) -> None:
+        body = await read_body(receive)
+        if body is None:
+            await send_json(send, 413, {'error': 'request body too large'})
+            return
+        try:
+            request = json.loads(body or b'{}')
+            question, report_mode = request.get('question'), request.get('report_mode')
+        except (ValueError, AttributeError):
+            question = report_mode = None
+        if not isinstance(question, str) or not question.strip():
+            await send_json(send, 400, {'error': "body must be JSON with a non-empty 'question'"})
+            return
+        if report_mode is not None and report_mode not in REPORT_MODES:
+            await send_json(send, 400, {'error': f"'report_mode' must be one of {', '.join(REPORT_MODES)}"})
+            return
+        await self.service.startup()
+        tenant = header(scope, TENANT_HEADER) or 'default'
+        job = self.service.submit(question.strip(), tenant, report_mode)
+        if job is None:
+            await send_json(send, 429, {'error': f"tenant '{tenant}' has too many outstanding research jobs"})
+            return
+        await send_json(send, 202, {'id': job.id, 'status': job.status, 'trace_id': job.trace_id,
+                                    'status_url': f"/research/{job.id}", 'events_url': f"/research/{job.id}/events"})
+
+    async def status(self, scope, receive, send, job_id: str) -> None:
+        job = self.service.get(job_id)
+        if job is None:
+            await send_json(send, 404, {'error': 'unknown job'})
+            return
+        await send_json(send, 200, job.as_dict())
+
+    async def events(self, scope, receive, send, job_id: str) -> None:
+        job = self.service.get(job_id)
+        if job is None:
+            await send_json(send, 404, {'error': 'unknown job'})
+            return
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache'),
+                        (b'x-accel-buffering', b'no')],
+        })
+
+        async def stream() -> None:
+            async for event in job.follow():
+                payload = f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                await send({'type': 'http.response.body', 'body': payload.encode('utf-8'), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        # Stop following the job as soon as the client goes away instead of at its next event.
+        streaming = asyncio.ensure_future(stream())
+        disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+        try:
+            await asyncio.wait({streaming, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            streaming.cancel()
+            disconnected.cancel()
+            await asyncio.gather(streaming, disconnected, return_exceptions=True)
+
+
+def header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get('headers', []):
+        if key.lower() == name:
+            return value.decode('latin-1').strip() or None
+    return None
+
+
+async def read_body(receive) -> Optional[bytes]:
+    """
+    Reads the request body, or returns None if it exceeds MAX_BODY_BYTES.
+    """
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            return None
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+async def wait_for_disconnect(receive) -> None:
+    """
+    Returns once the client has disconnected.
+    """
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def send_json(send, status: int, payload: Dict[str, Any]) -> None:
+    body = json.dumps(payload, default=str).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+app = ResearchApp()
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run('src.main:app', host=os.getenv('HOST', '0.0.0.0'), port=int(os.getenv('PORT', 8000)))
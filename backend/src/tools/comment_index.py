@@ -0,0 +1,168 @@
+"""
+This module provides an in-process BM25 inverted index over cached Reddit comments, so the
+Reddit branch can send only the comments relevant to the user's question to the LLM instead
+of the whole cache. The index is updated incrementally, one post at a time.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from aiocache import caches
+from ..config import cache_setup  # noqa: F401 -- registers the 'default' Redis alias
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i if in into is it its of on or so that the their
+there they this to was were what when which who will with would you your about how do does can
+""".split())
+
+# Number of comments handed to the analysis prompt.
+TOP_K = int(os.getenv('REDDIT_TOP_K', 40))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercases and splits text into index terms, dropping stopwords.
+    """
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+class CommentIndex:
+    """
+    BM25 index of comments grouped by post.
+
+    Ranking multiplies the BM25 text score by a community signal: comments with a higher
+    Reddit score are boosted logarithmically and controversial ones are damped.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, score_weight: float = 0.25,
+                 controversy_penalty: float = 0.3) -> None:
+        self.k1 = k1
+        self.b = b
+        self.score_weight = score_weight
+        self.controversy_penalty = controversy_penalty
+        self._postings: Dict[str, Dict[tuple, int]] = {}
+        self._docs: Dict[tuple, tuple] = {}
+        self._post_docs: Dict[str, List[tuple]] = {}
+        self._signatures: Dict[str, object] = {}
+        self._total_length = 0
+
+    def __contains__(self, post_id: str) -> bool:
+        return post_id in self._post_docs
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def post_ids(self) -> List[str]:
+        return list(self._post_docs)
+
+    def signature(self, post_id: str):
+        return self._signatures.get(post_id)
+
+    def add_post(self, post_id: str, comments: Iterable[dict], signature=None) -> None:
+        """
+        Indexes the comments of a post, replacing any previously indexed version of it.
+        """
+        self.remove_post(post_id)
+        doc_ids = []
+        for position, comment in enumerate(comments):
+            terms = Counter(tokenize(comment.get("body", "")))
+            if not terms:
+                continue
+            doc_id = (post_id, position)
+            length = sum(terms.values())
+            self._docs[doc_id] = (comment, length)
+            self._total_length += length
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = frequency
+            doc_ids.append(doc_id)
+        self._post_docs[post_id] = doc_ids
+        self._signatures[post_id] = signature
+
+    def remove_post(self, post_id: str) -> None:
+        for doc_id in self._post_docs.pop(post_id, []):
+            comment, length = self._docs.pop(doc_id)
+            self._total_length -= length
+            for term in set(tokenize(comment.get("body", ""))):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[term]
+        self._signatures.pop(post_id, None)
+
+    def _community_weight(self, comment: dict) -> float:
+        score = max(comment.get("score") or 0, 0)
+        controversial = 1 if comment.get("controversiality") else 0
+        return (1 + self.score_weight * math.log1p(score)) * (1 - self.controversy_penalty * controversial)
+
+    def search(self, query: str, k: int = TOP_K) -> List[dict]:
+        """
+        Returns the `k` comments most relevant to `query`.
+
+        Returns:
+            list: Copies of the matching comments with 'post_id' and 'relevance' added.
+        """
+        terms = set(tokenize(query))
+        doc_count = len(self._docs)
+        if not terms or not doc_count:
+            return []
+        average_length = self._total_length / doc_count
+        scores: Dict[tuple, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                length = self._docs[doc_id][1]
+                norm = frequency * (self.k1 + 1) / (frequency + self.k1 * (1 - self.b + self.b * length / average_length))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+
+        ranked = sorted(
+            ((score * self._community_weight(self._docs[doc_id][0]), doc_id) for doc_id, score in scores.items()),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        results = []
+        for relevance, doc_id in ranked[:k]:
+            comment = dict(self._docs[doc_id][0])
+            comment["post_id"] = doc_id[0]
+            comment["relevance"] = round(relevance, 4)
+            results.append(comment)
+        return results
+
+
+async def sync_index(index: CommentIndex, alias: str = 'default') -> CommentIndex:
+    """
+    Brings `index` in line with the cache: drops posts no longer listed in 'all_post_ids' and
+    (re)indexes posts that are new or whose 'post_meta' signature changed.
+    """
+    cache = caches.get(alias)
+    post_ids = list(dict.fromkeys(await cache.get('all_post_ids') or []))
+    listed = set(post_ids)
+    for post_id in index.post_ids:
+        if post_id not in listed:
+            index.remove_post(post_id)
+    if not post_ids:
+        return index
+
+    metas = await cache.multi_get([f"post_meta:{post_id}" for post_id in post_ids])
+    stale = [
+        (post_id, meta) for post_id, meta in zip(post_ids, metas)
+        if post_id not in index or index.signature(post_id) != meta
+    ]
+    if stale:
+        payloads = await cache.multi_get([f"post:{post_id}" for post_id, _ in stale])
+        for (post_id, meta), payload in zip(stale, payloads):
+            if payload and 'comments' in payload:
+                index.add_post(post_id, payload['comments'], signature=meta)
+    return index
+
+
+# Process-wide index used by the research graph.
+comment_index = CommentIndex()
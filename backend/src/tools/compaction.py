@@ -0,0 +1,226 @@
+"""
+This module compacts raw tool payloads before they are placed in LLM prompts. SerpAPI responses
+are reduced to organic results, news items, snippets and links (merged across engines by
+result_merge), and every rendered payload is cut to a per-node token budget.
+"""
+
+import json
+import math
+import os
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Rough characters per token for English text; close enough to budget prompts without
+# running the model's tokenizer.
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', 1500))
+# Default budget per analysis node, overridable with PROMPT_BUDGET_<NODE_NAME>.
+NODE_TOKEN_BUDGETS = {
+    'google_search_analysis': 1500,
+    'bing_search_analysis': 1200,
+    'yahoo_finance_analysis': 1500,
+    'google_finance_analysis': 800,
+}
+SNIPPET_CHARS = int(os.getenv('PROMPT_SNIPPET_CHARS', 300))
+MAX_LIST_ITEMS = 10
+
+# SerpAPI sections that carry search content, in the order they are rendered.
+RESULT_SECTIONS = ('answer_box', 'top_stories', 'news_results', 'organic_results', 'text_blocks')
+# Keys that never carry content worth prompting with.
+NOISE_KEYS = {
+    'search_metadata', 'search_parameters', 'search_information', 'pagination', 'serpapi_pagination',
+    'ads', 'shopping_results', 'related_searches', 'inline_images', 'inline_videos', 'discover_more',
+    'thumbnail', 'favicon', 'serpapi_link', 'redirect_link', 'displayed_link', 'position',
+}
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|gclid|fbclid|ocid|cmpid|ref|src)$', re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the token count of `text` from its length.
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def token_budget(node: str) -> int:
+    """
+    Returns the prompt token budget for an analysis node.
+    """
+    return int(os.getenv(f'PROMPT_BUDGET_{node.upper()}', NODE_TOKEN_BUDGETS.get(node, DEFAULT_TOKEN_BUDGET)))
+
+
+def truncate_to_budget(text: str, budget: int) -> str:
+    """
+    Cuts `text` to roughly `budget` tokens, marking the cut.
+    """
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + ' …[truncated]'
+
+
+def canonical_url(link: Optional[str]) -> Optional[str]:
+    """
+    Normalizes a link for duplicate detection: no scheme, 'www.', fragment, trailing slash or
+    tracking parameters.
+    """
+    if not link:
+        return None
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)))
+    path = parts.path.rstrip('/')
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def _text(value) -> Optional[str]:
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('title')
+    if isinstance(value, list):
+        value = ' '.join(str(part) for part in value if part)
+    if value is None:
+        return None
+    value = ' '.join(str(value).split())
+    return value or None
+
+
+def _item(entry: dict) -> Optional[dict]:
+    item = {
+        'title': _text(entry.get('title') or entry.get('question')),
+        'link': entry.get('link') or entry.get('url'),
+        'snippet': _text(entry.get('snippet') or entry.get('answer') or entry.get('description') or entry.get('text')),
+        'source': _text(entry.get('source')),
+        'date': _text(entry.get('date')),
+    }
+    if not (item['title'] or item['snippet']):
+        return None
+    if item['snippet'] and len(item['snippet']) > SNIPPET_CHARS:
+        item['snippet'] = item['snippet'][:SNIPPET_CHARS].rstrip() + '…'
+    return item
+
+
+def _entries(section) -> Iterator[dict]:
+    if isinstance(section, dict):
+        section = [section]
+    for entry in section or []:
+        if not isinstance(entry, dict):
+            continue
+        # Google News groups related stories under one headline
+        nested = entry.get('stories') or entry.get('items')
+        if isinstance(nested, list):
+            yield from _entries(nested)
+            if not entry.get('link'):
+                continue
+        yield entry
+
+
+def extract_items(payload) -> List[dict]:
+    """
+    Extracts result items from a SerpAPI response or a list of responses.
+
+    Args:
+        payload: A response dict, or a list of them as returned by `asyncio.gather`.
+            None values and exceptions are skipped.
+
+    Returns:
+        list[dict]: Items with 'title', 'link', 'snippet', 'source' and 'date'.
+    """
+    if isinstance(payload, (list, tuple)):
+        return [item for part in payload for item in extract_items(part)]
+    if not isinstance(payload, dict):
+        return []
+    items = []
+    for section in RESULT_SECTIONS:
+        for entry in _entries(payload.get(section)):
+            item = _item(entry)
+            if item is not None:
+                items.append(item)
+    return items
+
+
+def _render_item(number: int, item: dict) -> str:
+    meta = ', '.join(part for part in (item.get('source'), item.get('date')) if part)
+    if item.get('sources'):
+        meta = '; '.join(part for part in (meta, f"via {', '.join(item['sources'])}") if part)
+    block = f"{number}. {item.get('title') or ''}" + (f" ({meta})" if meta else '')
+    if item.get('snippet'):
+        block += f"\n   {item['snippet']}"
+    if item.get('link'):
+        block += f"\n   {item['link']}"
+    return block
+
+
+def render_items(items: Iterable[dict], budget: int) -> Tuple[str, List[dict]]:
+    """
+    Renders items as a numbered list, stopping before `budget` tokens are exceeded.
+
+    Returns:
+        tuple: (rendered text, list of the items that fit).
+    """
+    blocks, kept, used = [], [], 0
+    for item in items:
+        block = _render_item(len(blocks) + 1, item)
+        cost = estimate_tokens(block) + 1
+        if used + cost > budget:
+            break
+        blocks.append(block)
+        kept.append(item)
+        used += cost
+    return '\n'.join(blocks), kept
+
+
+def summarize_graph(points: list) -> dict:
+    """
+    Reduces a price graph (a list of {'date', 'price', ...} points) to its key figures.
+    """
+    prices = [(point.get('date'), point['price']) for point in points
+              if isinstance(point, dict) and isinstance(point.get('price'), (int, float))]
+    if not prices:
+        return {'points': len(points)}
+    low = min(prices, key=lambda pair: pair[1])
+    high = max(prices, key=lambda pair: pair[1])
+    first, last = prices[0], prices[-1]
+    return {
+        'points': len(prices),
+        'start': {'date': first[0], 'price': first[1]},
+        'end': {'date': last[0], 'price': last[1]},
+        'low': {'date': low[0], 'price': low[1]},
+        'high': {'date': high[0], 'price': high[1]},
+        'change_pct': round((last[1] / first[1] - 1) * 100, 2) if first[1] else None,
+    }
+
+
+def _is_empty(value) -> bool:
+    return value is None or (isinstance(value, (str, list, tuple, dict)) and not value)
+
+
+def prune_payload(payload):
+    """
+    Recursively drops noise keys, summarizes price graphs and caps long lists.
+    """
+    if isinstance(payload, BaseException):
+        return None
+    if isinstance(payload, dict):
+        pruned = {}
+        for key, value in payload.items():
+            if key in NOISE_KEYS or _is_empty(value):
+                continue
+            pruned[key] = summarize_graph(value) if key == 'graph' and isinstance(value, list) else prune_payload(value)
+        return pruned
+    if isinstance(payload, (list, tuple)):
+        return [prune_payload(value) for value in payload[:MAX_LIST_ITEMS] if not isinstance(value, BaseException)]
+    return payload
+
+
+def compact_payload(payload, budget: int) -> str:
+    """
+    Compacts a structured payload (Google Finance, Yahoo Finance) into JSON within `budget` tokens.
+    """
+    pruned = prune_payload(payload)
+    if _is_empty(pruned):
+        return ''
+    text = json.dumps(pruned, default=str, ensure_ascii=False, separators=(',', ':'))
+    return truncate_to_budget(text, budget)
@@ -0,0 +1,57 @@
+"""
+This module provides a bounded thread pool for blocking library calls (yfinance, disk I/O),
+so they never run on the event loop and a slow call cannot stall concurrent research sessions.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+# Worker threads for blocking calls and the default seconds allowed per call.
+MAX_WORKERS = int(os.getenv('BLOCKING_MAX_WORKERS', 8))
+CALL_TIMEOUT = float(os.getenv('BLOCKING_CALL_TIMEOUT', 20))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide executor, creating it on first use.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='blocking-io')
+    return _executor
+
+
+async def run_blocking(func: Callable, *args, timeout: Optional[float] = None, **kwargs):
+    """
+    Runs a blocking callable in the shared executor.
+
+    Args:
+        func (Callable): The blocking function.
+        *args, **kwargs: Arguments passed to `func`.
+        timeout (float, optional): Seconds to wait before giving up. Defaults to CALL_TIMEOUT.
+
+    Returns:
+        The return value of `func`.
+
+    Raises:
+        asyncio.TimeoutError: If the call does not finish in time. The worker thread keeps
+            running until the library returns, but the caller is released.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+    return await asyncio.wait_for(future, timeout=timeout if timeout is not None else CALL_TIMEOUT)
+
+
+def shutdown_executor(wait: bool = False) -> None:
+    """
+    Shuts the executor down. A new one is created on the next `run_blocking` call.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
@@ -4,15 +4,24 @@ via SerpAPI's Google Finance engine. It includes parameter building for flexible
 and index queries, and robust error handling for API and networking failures.
 """
 
-import aiohttp
 import os
 import asyncio
 from typing import Optional
-from aiohttp.web_exceptions import HTTPException
 from dotenv import load_dotenv
+from ...config.lazy_imports import lazy_import
+from ..http_client import get_session
+from ..response_cache import response_cache
+from ..single_flight import single_flight
+from ...config.telemetry import track_call, traced_tool
 
 load_dotenv()
 
+web_exceptions = lazy_import('aiohttp.web_exceptions')
+
+# Chart window requested by google_finance(). Long price history is served by the local
+# price store on the Yahoo path, so a short window is enough for quotes and recent moves.
+GOOGLE_FINANCE_WINDOW = os.getenv('GOOGLE_FINANCE_WINDOW', '1M')
+
 class GoogleFinanceData:
     """
     Asynchronous client to interact with the SerpAPI Google Finance endpoint for retrieving
@@ -22,13 +31,15 @@ class GoogleFinanceData:
 
     BASE_URL = "https://serpapi.com/search"
 
-    def __init__(self, symbol, trend: Optional[str] = None, index_market: Optional[str] = None):
+    def __init__(self, symbol, trend: Optional[str] = None, index_market: Optional[str] = None,
+                 window: Optional[str] = None):
         self._api_key = os.getenv('SERP_API')
         if not self._api_key:
             raise EnvironmentError("SERP_API key missing")
         self.symbol = symbol
         self.trend = trend
         self.index = index_market
+        self.window = window
 
     def build_serpapi_params(self) -> dict:
         """
@@ -42,7 +53,7 @@ class GoogleFinanceData:
                 "engine": "google_finance",
                 "q": self.symbol,
                 "api_key": self._api_key,
-                'window': 'MAX',
+                'window': self.window or 'MAX',
                 'async': 'true',
                 'no_cache': 'false',
             }
@@ -51,7 +62,7 @@ class GoogleFinanceData:
                 "engine": "google_finance",
                 "q": self.symbol,
                 "api_key": self._api_key,
-                'window': '5Y',
+                'window': self.window or '5Y',
                 'async': 'true',
                 'no_cache': 'false',
                 'trend': self.trend,
@@ -62,7 +73,7 @@ class GoogleFinanceData:
                 "engine": "google_finance",
                 "q": self.symbol,
                 "api_key": self._api_key,
-                'window': 'MAX',
+                'window': self.window or 'MAX',
                 'async': 'true',
                 'no_cache': 'false',
                 'trend': self.trend,
@@ -71,7 +82,7 @@ class GoogleFinanceData:
             return {
                 "engine": "google_finance",
                 "api_key": self._api_key,
-                'window': '5Y',
+                'window': self.window or '5Y',
                 'async': 'true',
                 'no_cache': 'false',
                 'index_market': self.index,
@@ -85,11 +96,16 @@ class GoogleFinanceData:
                     data=await respn.json()
                     return data
                 else:
-                    raise HTTPException(
+                    raise web_exceptions.HTTPException(
                         reason=f"Non-200 response: {respn.status}", status_code=respn.status
                     )
         except Exception as e:
-            raise HTTPException(reason=str(e), status_code=500)
+            raise web_exceptions.HTTPException(reason=str(e), status_code=500)
+
+    async def _fetch(self, params: dict):
+        session = await get_session()
+        with track_call(f"serpapi.{params.get('engine')}"):
+            return await GoogleFinanceData.get_url(session, self.BASE_URL, params)
 
     async def fetch_google_finance_data(self) -> dict:
         """
@@ -103,11 +119,10 @@ class GoogleFinanceData:
         """
         params = self.build_serpapi_params()
         try:
-            async with aiohttp.ClientSession() as session:
-                data = await GoogleFinanceData.get_url(session, self.BASE_URL, params)
-                if data is None:
-                    raise Exception("Failed to fetch financial data from SerpAPI.")
-                return data
+            data = await response_cache.fetch(params, lambda: self._fetch(params))
+            if data is None:
+                raise Exception("Failed to fetch financial data from SerpAPI.")
+            return data
         except Exception as exc:
             print(f"Unexpected error during SerpAPI fetch: {exc}")
             raise
@@ -125,18 +140,20 @@ class GoogleFinanceData:
         """
         params = self.build_serpapi_params()
         try:
-            async with aiohttp.ClientSession() as session:
-                data = await GoogleFinanceData.get_url(session, self.BASE_URL, params)
-                if data is None:
-                    raise Exception("Failed to fetch market data from SerpAPI.")
-                return data
+            data = await response_cache.fetch(params, lambda: self._fetch(params))
+            if data is None:
+                raise Exception("Failed to fetch market data from SerpAPI.")
+            return data
         except Exception as exc:
             print(f"Error occurred while retrieving financial market data: {exc}")
             raise
 
 
-async def google_finance(symbol: str,trend: Optional[str] = None, index_market: Optional[str] = None):
-    gf=GoogleFinanceData(symbol=symbol,trend=trend,index_market=index_market)
+@traced_tool('google_finance')
+@single_flight()
+async def google_finance(symbol: str,trend: Optional[str] = None, index_market: Optional[str] = None,
+                         window: Optional[str] = GOOGLE_FINANCE_WINDOW):
+    gf=GoogleFinanceData(symbol=symbol,trend=trend,index_market=index_market,window=window)
     finance_data=asyncio.create_task(gf.fetch_google_finance_data())
     if not finance_data:
         print("No data found for finance")
@@ -145,9 +162,10 @@ async def google_finance(symbol: str,trend: Optional[str] = None, index_market:
         print("No data found for finance markets")
     result=await asyncio.gather(finance_data,financia_markets,return_exceptions=True)
     if result:
-        print(result)
+        return result
     else:
         print("No data found")
 
 
-asyncio.run(google_finance("AAPL"))
\ No newline at end of file
+if __name__ == '__main__':
+    asyncio.run(google_finance("AAPL"))
\ No newline at end of file
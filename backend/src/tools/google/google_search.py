@@ -1,11 +1,19 @@
 import os 
-import aiohttp
-from aiohttp.web import HTTPException
 from dotenv import load_dotenv
 import asyncio
+from ...config.lazy_imports import lazy_import
+from ..http_client import get_session
+from ..response_cache import response_cache
+from ..single_flight import single_flight, normalize_query
+from ...config.telemetry import track_call, traced_tool
 
 load_dotenv()
 
+web_exceptions = lazy_import('aiohttp.web_exceptions')
+
+# Engines queried by google_search(), in the order of its results.
+ENGINES = ('google_news', 'google', 'google_light_fast')
+
 class GoogleSearch:
 
     BASE_URL = "https://serpapi.com/search"
@@ -34,18 +42,22 @@ class GoogleSearch:
                     data=await respn.json()
                     return data
                 else:
-                    raise HTTPException(
+                    raise web_exceptions.HTTPException(
                         reason=f"Non-200 response: {respn.status}", status_code=respn.status
                     )
         except Exception as e:
-            raise HTTPException(reason=str(e), status_code=500)
+            raise web_exceptions.HTTPException(reason=str(e), status_code=500)
+
+    async def _fetch(self, params):
+        session = await get_session()
+        with track_call(f"serpapi.{params.get('engine')}"):
+            return await GoogleSearch.get_url(session, self.BASE_URL, params)
 
     async def googld_ligh_fast_search(self):
         try:
             params = self.build_params(engine='google_light_fast')
-            async with aiohttp.ClientSession() as session:
-                response = await C.get_url(session, self.BASE_URL, params)
-                return response
+            response = await response_cache.fetch(params, lambda: self._fetch(params))
+            return response
         except Exception as e:
             print(e)
             return None
@@ -53,9 +65,8 @@ class GoogleSearch:
     async def google_news(self):
         try:
             params = self.build_params(engine='google_news')
-            async with aiohttp.ClientSession() as session:
-                response = await GoogleSearch.get_url(session, self.BASE_URL, params)
-                return response
+            response = await response_cache.fetch(params, lambda: self._fetch(params))
+            return response
         except Exception as e:
             print(e)
             return None
@@ -63,14 +74,15 @@ class GoogleSearch:
     async def google_search(self):
         try:
             params = self.build_params(engine='google')
-            async with aiohttp.ClientSession() as session:
-                response = await GoogleSearch.get_url(session, self.BASE_URL, params)
-                return response
+            response = await response_cache.fetch(params, lambda: self._fetch(params))
+            return response
         except Exception as e:
             print(e)
             return None
 
 
+@traced_tool('google_search')
+@single_flight(key_builder=normalize_query)
 async def google_search(query: str):
     try:
         search_engine = GoogleSearch(user_query=query)
@@ -87,11 +99,12 @@ async def google_search(query: str):
             google_news, google_search_task, google_light_fast, return_exceptions=True
         )
         if result:
-            print(f'google result is {result}')
+            return result
         else:
             print("No data found")
     except Exception as exc:
         print(f"An unexpected error occurred: {exc}")
 
 
-asyncio.run(google_search('what is the latest news about apple'))
\ No newline at end of file
+if __name__ == '__main__':
+    asyncio.run(google_search('what is the latest news about apple'))
\ No newline at end of file
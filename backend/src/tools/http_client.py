@@ -0,0 +1,130 @@
+"""
+This module provides the shared HTTP layer used by the SerpAPI clients (Google Search,
+Google Finance and Bing). A single keep-alive connection pool is created lazily per event
+loop and reused by every request, so repeated calls to serpapi.com do not pay a fresh
+TCP + TLS handshake each time.
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+from ..config.lazy_imports import lazy_import
+
+aiohttp = lazy_import('aiohttp')
+
+
+class HttpClient:
+    """
+    Lifecycle-managed owner of one `aiohttp.ClientSession` with a pooled connector.
+
+    Pool size, per-host limits, DNS cache TTL, keep-alive and timeouts are read from the
+    environment unless given explicitly:
+
+        HTTP_POOL_LIMIT           total open connections (default 100)
+        HTTP_POOL_LIMIT_PER_HOST  open connections per host (default 20)
+        HTTP_DNS_TTL              seconds to cache DNS lookups (default 300)
+        HTTP_KEEPALIVE_TIMEOUT    seconds an idle connection is kept (default 30)
+        HTTP_TOTAL_TIMEOUT        seconds for a whole request (default 30)
+        HTTP_CONNECT_TIMEOUT      seconds to acquire/establish a connection (default 10)
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        dns_ttl: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+    ) -> None:
+        self.limit = limit if limit is not None else int(os.getenv('HTTP_POOL_LIMIT', 100))
+        self.limit_per_host = limit_per_host if limit_per_host is not None else int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', 20))
+        self.dns_ttl = dns_ttl if dns_ttl is not None else int(os.getenv('HTTP_DNS_TTL', 300))
+        self.keepalive_timeout = keepalive_timeout if keepalive_timeout is not None else float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', 30))
+        self.total_timeout = total_timeout if total_timeout is not None else float(os.getenv('HTTP_TOTAL_TIMEOUT', 30))
+        self.connect_timeout = connect_timeout if connect_timeout is not None else float(os.getenv('HTTP_CONNECT_TIMEOUT', 10))
+        self._session: Optional['aiohttp.ClientSession'] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _build_session(self) -> 'aiohttp.ClientSession':
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.total_timeout, connect=self.connect_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def session(self) -> 'aiohttp.ClientSession':
+        """
+        Returns the pooled session, creating it on first use.
+
+        A session is bound to the event loop it was created on, so a new one is built
+        when called from a different loop (e.g. successive `asyncio.run` calls).
+
+        Returns:
+            aiohttp.ClientSession: The shared session for the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            await self._discard()
+            self._session = self._build_session()
+            self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Closes the pooled session and releases its connections.
+        """
+        if self._session is not None and not self._session.closed and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        else:
+            await self._discard()
+        self._session, self._loop = None, None
+
+    async def _discard(self) -> None:
+        """
+        Closes a session left on another event loop. A loop still running (in another thread)
+        closes it itself. Once its loop is closed the transports are gone, and closing only
+        marks the session and connector closed, which is safe from the running loop.
+        """
+        session, loop = self._session, self._loop
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        try:
+            await session.close()
+        except Exception as e:
+            # A stopped but unclosed loop cannot run the connector's shutdown; drop the session.
+            print(f"Could not close the HTTP session of a previous event loop: {e}")
+            session.detach()
+
+    async def __aenter__(self) -> "HttpClient":
+        await self.session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+# Process-wide client shared by every SerpAPI tool.
+http_client = HttpClient()
+
+
+async def get_session() -> 'aiohttp.ClientSession':
+    """
+    Returns the shared pooled session of the process-wide `http_client`.
+    """
+    return await http_client.session()
+
+
+async def close_session() -> None:
+    """
+    Closes the process-wide pooled session. Call on application shutdown.
+    """
+    await http_client.close()
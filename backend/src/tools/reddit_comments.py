@@ -1,24 +1,28 @@
 from typing import Any
-import asyncpraw
 import asyncio
 import os
-from aiocache.backends.redis import RedisCache
+import time
 from aiocache import caches,cached
+from ..config import cache_setup  # noqa: F401 -- registers the 'default' Redis alias
+from .single_flight import single_flight
+from .comment_index import comment_index, sync_index, TOP_K
+from ..config.lazy_imports import lazy_import
+from ..config.telemetry import track_call, traced_tool
+
+asyncpraw = lazy_import('asyncpraw')
 
 # Load Reddit API credentials from environment variables (with default fallback)
 client_id = os.getenv('REDDIT_CLIENT_ID')
 client_secret = os.getenv('REDDIT_CLIENT_SECRET')
 user_agent = 'dp by /u/Temporary_Version105'
 
-caches.set_config({
-    'default': {
-        'cache': 'aiocache.backends.redis.RedisCache', 
-        'endpoint': '127.0.0.1',                       
-        'port': 6379,                               
-        'serializer': {'class': 'aiocache.serializers.PickleSerializer'},
-        'ttl': 4800 
-    }})
+# Crawl tuning: parallel post loads, seconds per post, and the remaining-request floor at
+# which the crawl pauses until Reddit's rate-limit window resets.
+CRAWL_CONCURRENCY = int(os.getenv('REDDIT_CRAWL_CONCURRENCY', 8))
+POST_TIMEOUT = float(os.getenv('REDDIT_POST_TIMEOUT', 20))
+RATE_LIMIT_FLOOR = int(os.getenv('REDDIT_RATE_LIMIT_FLOOR', 5))
 
+@single_flight(key_builder=lambda post: post.id)
 @cached(alias='default', 
         key_builder=lambda f, post: f'post_data:{post.id}', 
         fail_safe=True)
@@ -29,11 +33,18 @@ async def fetch_posts(post):
     If there is a HIT, the decorator returns the cached result instantly.
     """
     print(f"--- Cache MISS: Loading post and comments for {post.id}")
-    
-    # --- Your existing complex comment fetching and data structuring logic goes here ---
+    return await load_post(post)
+
+
+async def load_post(post):
+    """
+    Loads a post and its comments from Reddit, bypassing the cache.
+    Returns the post payload, or None if loading fails.
+    """
     try:
-        await post.load()
-        await post.comments.replace_more()
+        with track_call('reddit.load_post'):
+            await post.load()
+            await post.comments.replace_more()
 
         comments=[]
 
@@ -61,52 +72,150 @@ async def fetch_posts(post):
         return None # Do not cache failures
 
 
-async def fetch_reddit_posts():
+class CrawlStats:
     """
-    Fetch 'hot' posts and top-level comments from r/finance and store in cache.
-    Skips posts if already cached. Stores post IDs for easy querying later.
+    Progress and throughput counters for one Reddit crawl.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.seen = 0
+        self.fetched = 0
+        self.cached = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rate_limit_waits = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def done(self) -> int:
+        return self.fetched + self.cached + self.failed
+
+    @property
+    def posts_per_sec(self) -> float:
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "seen": self.seen,
+            "fetched": self.fetched,
+            "cached": self.cached,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rate_limit_waits": self.rate_limit_waits,
+            "elapsed": round(self.elapsed, 3),
+            "posts_per_sec": round(self.posts_per_sec, 2),
+        }
+
+
+async def respect_rate_limit(reddit, stats: CrawlStats = None, floor: int = None):
+    """
+    Sleeps until the rate-limit window resets when Reddit reports too few remaining requests.
+
+    asyncpraw exposes the X-Ratelimit-Remaining / X-Ratelimit-Reset headers of the last
+    response as `reddit.auth.limits`.
+    """
+    floor = RATE_LIMIT_FLOOR if floor is None else floor
+    limits = getattr(getattr(reddit, 'auth', None), 'limits', None) or {}
+    remaining = limits.get('remaining')
+    reset_timestamp = limits.get('reset_timestamp')
+    if remaining is None or reset_timestamp is None or remaining > floor:
+        return
+    delay = max(0.0, reset_timestamp - time.time())
+    if delay:
+        if stats is not None:
+            stats.rate_limit_waits += 1
+        print(f"  > Rate limit low ({remaining} left), waiting {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+async def fetch_reddit_posts(subreddit_name: str = 'finance', limit: int = 50, concurrency: int = None,
+                             post_timeout: float = None, on_progress=None):
+    """
+    Fetch 'hot' posts and their comments from a subreddit and store them in cache.
+
+    Posts are loaded concurrently, at most `concurrency` at a time, each bounded by
+    `post_timeout` seconds. Posts already cached are skipped. The ids of all posts seen are
+    stored under 'all_post_ids' for later querying.
+
+    Args:
+        subreddit_name (str): Subreddit to crawl.
+        limit (int): Number of hot posts to consider.
+        concurrency (int, optional): Maximum parallel post loads (REDDIT_CRAWL_CONCURRENCY).
+        post_timeout (float, optional): Seconds allowed per post load (REDDIT_POST_TIMEOUT).
+        on_progress (Callable, optional): Called with the CrawlStats after each post.
+
+    Returns:
+        CrawlStats: Counters for the crawl (posts/sec, failures, timeouts).
     """
     cache = caches.get('default')
+    concurrency = concurrency or CRAWL_CONCURRENCY
+    post_timeout = post_timeout or POST_TIMEOUT
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = CrawlStats()
     print("Connecting to Reddit...")
-    
+
     reddit = asyncpraw.Reddit(
         client_id=client_id,
         client_secret=client_secret,
         user_agent=user_agent
     )
+
+    async def crawl_post(post):
+        post_cache_key = f'post:{post.id}'
+        async with semaphore:
+            try:
+                # Check if this post is already cached
+                cached_post = await cache.get(post_cache_key)
+                if cached_post:
+                    stats.cached += 1
+                    print(f"  > Using cached: {cached_post.get('title', 'No Title')[:100]}")
+                    return
+                await respect_rate_limit(reddit, stats)
+                # Fully load post and expand all comments (no 'more')
+                post_data = await asyncio.wait_for(fetch_posts(post), timeout=post_timeout)
+                if post_data:
+                    await cache.set(post_cache_key, post_data, ttl=4800)
+                    stats.fetched += 1
+                else:
+                    stats.failed += 1
+            except asyncio.TimeoutError:
+                stats.timed_out += 1
+                stats.failed += 1
+                print(f"  > Timeout fetching post: {getattr(post, 'title', post.id)[:100]}")
+            except Exception as e:
+                stats.failed += 1
+                print(f"  > Error fetching post {post.id}: {e}")
+            finally:
+                if on_progress is not None:
+                    on_progress(stats)
+
     try:
-        # Get the finance subreddit
-        subreddit = await reddit.subreddit('finance')
-        post_processed = 0
+        subreddit = await reddit.subreddit(subreddit_name)
 
-        #storing post ids in the list 
+        #storing post ids in the list
         post_ids = []
-        # Iterate over hot posts (limit 10 for demo)
-        async for post in subreddit.hot(limit=50):
-            post_processed += 1
-            post_id = post.id
-            post_ids.append(post_id)
-
-            #post cache key
-            post_cache_key = f'post:{post_id}'
-            
-            # Check if this post is already cached
-            cached_post = await cache.get(post_cache_key)
-            if cached_post:
-                print(f"  > Using cached: {cached_post.get('title', 'No Title')[:100]}")
-                continue
-
-            # Fetch data if not cached
-            else:
-                try:
-                    # Fully load post and expand all comments (no 'more')
-                  post_data=await fetch_posts(post)
-                  if post_data:
-                    post_ids.append(post.id)
-
-                except asyncio.TimeoutError:
-                    print(f"  > Timeout fetching post: {post.title[:100]}")
-        # After the loop, store the list of post IDs from this run.
+        tasks = []
+        try:
+            # Start loading each post as soon as the listing yields it
+            async for post in subreddit.hot(limit=limit):
+                stats.seen += 1
+                post_ids.append(post.id)
+                tasks.append(asyncio.create_task(crawl_post(post)))
+            await asyncio.gather(*tasks)
+        finally:
+            # A failed listing or a cancelled crawl must not leave post loads running
+            # against the client closed below; cancelling a crawl_post also cancels its
+            # fetch_posts call, as no other waiter shares it.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # After the crawl, store the list of post IDs from this run.
         await cache.set('all_post_ids', post_ids, ttl=4800)
         print(f'Session post ids set with length {len(post_ids)}')
 
@@ -116,8 +225,12 @@ async def fetch_reddit_posts():
         print(f"An error occurred: {e}")
     finally:
         # Always close Reddit API connection
-        await reddit.close()  
+        await reddit.close()
+
+    print(f"Crawl finished: {stats.as_dict()}")
+    return stats
 
+@single_flight()
 async def get_posts(post_id):
     cache = caches.get('default')
     cache_key = f"post:{post_id}"
@@ -151,15 +264,52 @@ async def get_posts(post_id):
         await reddit.close()
 
 
-async def get_all_comments():
+async def fetch_missing_posts(post_ids, concurrency: int = None) -> dict:
+    """
+    Loads several posts from Reddit concurrently through one shared client.
+
+    Args:
+        post_ids (list): Ids of the posts to load.
+        concurrency (int, optional): Maximum parallel loads (REDDIT_CRAWL_CONCURRENCY).
+
+    Returns:
+        dict: Mapping of post id to post payload for the posts that loaded.
+    """
+    semaphore = asyncio.Semaphore(concurrency or CRAWL_CONCURRENCY)
+    reddit = asyncpraw.Reddit(
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent=user_agent
+    )
+
+    async def load(post_id):
+        async with semaphore:
+            try:
+                submission = await reddit.submission(id=post_id)
+                return post_id, await asyncio.wait_for(fetch_posts(submission), timeout=POST_TIMEOUT)
+            except Exception as e:
+                print(f"Error getting posts for postid {post_id}: {e}")
+                return post_id, None
+
+    try:
+        results = await asyncio.gather(*(load(post_id) for post_id in post_ids))
+        return {post_id: data for post_id, data in results if data}
+    finally:
+        await reddit.close()
+
+
+async def get_all_comments(load_missing: bool = True):
     """
     Retrieve all cached comments from all posts currently stored in cache.
     Returns a flat list of comments (good for analysis or language models).
+
+    Post payloads are read with one multi-get; misses are loaded from Reddit concurrently
+    and written back with one multi-set unless `load_missing` is False.
     """
     cache = caches.get('default')
     
     # Find all cached post IDs
-    post_ids = await cache.get('all_post_ids') or []
+    post_ids = list(dict.fromkeys(await cache.get('all_post_ids') or []))
     
     if not post_ids:
         print("⚠️  No cached posts found. Run fetch_reddit_posts() first!")
@@ -167,20 +317,46 @@ async def get_all_comments():
     
     all_comments = []
     print(f"📥 Collecting comments from {len(post_ids)} posts...\n")
-    
+
+    cached_posts = await cache.multi_get([f"post:{post_id}" for post_id in post_ids])
+    posts = dict(zip(post_ids, cached_posts))
+
+    missing = [post_id for post_id, post_data in posts.items() if not post_data]
+    if missing and load_missing:
+        print(f"--- Cache MISS for {len(missing)} posts, loading from Reddit")
+        loaded = await fetch_missing_posts(missing)
+        posts.update(loaded)
+        if loaded:
+            await cache.multi_set([(f"post:{post_id}", post_data) for post_id, post_data in loaded.items()], ttl=4800)
+
     # Gather all comments for each post (add post_id for provenance)
     for post_id in post_ids:
-        post_data = await get_posts(post_id)
+        post_data = posts.get(post_id)
         if post_data and 'comments' in post_data:
             for comment in post_data['comments']:
-                comment['post_id'] = post_id  
-                all_comments.append(comment)
+                all_comments.append({**comment, 'post_id': post_id})
     
     print(f"✅ Total comments collected: {len(all_comments)}")
     return all_comments
 
+@traced_tool('reddit')
+async def reddit(query: str = None, k: int = None):
+    """
+    Returns cached comments for the research graph.
+
+    This is a pure cache read: posts are kept fresh by the ingestion worker in
+    `reddit_ingest`, so the request path never waits on Reddit. With a `query`, only the
+    top-k comments relevant to it are returned, ranked by the BM25 `comment_index`.
+    """
+    if query is None:
+        return await get_all_comments(load_missing=False)
+    index = await sync_index(comment_index)
+    return index.search(query, k or TOP_K)
+
+
 async def main():
-    result1,result2=await asyncio.gather(fetch_reddit_posts(), get_all_comments())
+    result1 = await fetch_reddit_posts()
+    result2 = await get_all_comments()
     print(result1)
     print(result2)
 
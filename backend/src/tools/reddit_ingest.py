@@ -0,0 +1,217 @@
+"""
+This module provides the background Reddit ingestion service. It periodically refreshes the
+configured subreddits into the shared cache, reloading only posts that are new or have changed
+(by edited timestamp and comment count), so the research graph can read Reddit data from the
+cache without calling Reddit on the request path.
+
+Run it as a standalone worker:
+
+    python -m src.tools.reddit_ingest --subreddits finance stocks --interval 300
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+from aiocache import caches
+
+from . import reddit_comments as rc
+from .reddit_comments import CrawlStats
+from ..config.lazy_imports import lazy_import
+
+asyncpraw = lazy_import('asyncpraw')
+
+# Subreddits to keep fresh and seconds between refreshes.
+SUBREDDITS = [name.strip() for name in os.getenv('REDDIT_SUBREDDITS', 'finance').split(',') if name.strip()]
+REFRESH_INTERVAL = float(os.getenv('REDDIT_REFRESH_INTERVAL', 300))
+
+
+class AsyncPrawSource:
+    """
+    Reddit source backed by asyncpraw. Any object with the same `hot_posts`, `load`,
+    `throttle` and `close` coroutines can be used instead (e.g. a local fake in tests).
+    """
+
+    def __init__(self) -> None:
+        self.reddit = asyncpraw.Reddit(
+            client_id=rc.client_id,
+            client_secret=rc.client_secret,
+            user_agent=rc.user_agent
+        )
+
+    async def hot_posts(self, subreddit_name: str, limit: int):
+        subreddit = await self.reddit.subreddit(subreddit_name)
+        async for post in subreddit.hot(limit=limit):
+            yield post
+
+    async def load(self, post):
+        return await rc.load_post(post)
+
+    async def throttle(self, stats: CrawlStats = None):
+        await rc.respect_rate_limit(self.reddit, stats)
+
+    async def close(self):
+        await self.reddit.close()
+
+
+def post_signature(post) -> dict:
+    """
+    Returns the fields used to decide whether a cached post is stale.
+    """
+    return {
+        "edited": getattr(post, "edited", False) or False,
+        "num_comments": getattr(post, "num_comments", None),
+    }
+
+
+class RedditIngestor:
+    """
+    Incrementally refreshes subreddits into the cache.
+
+    For every hot post the cached payload and its signature ('post_meta:<id>') are read in one
+    multi-get; only posts without a payload or with a changed signature are reloaded. The ids of
+    every listed post are stored per subreddit ('subreddit_posts:<name>') and, across all
+    subreddits, under 'all_post_ids' which `get_all_comments` reads. When the worker runs in
+    the same process as the graph, pass `index` to keep a CommentIndex updated as posts load.
+    """
+
+    def __init__(self, source, subreddits: Optional[List[str]] = None, limit: int = 50,
+                 concurrency: Optional[int] = None, interval: Optional[float] = None,
+                 alias: str = 'default', index=None) -> None:
+        self.source = source
+        self.index = index
+        self.subreddits = subreddits or SUBREDDITS
+        self.limit = limit
+        self.concurrency = concurrency or rc.CRAWL_CONCURRENCY
+        self.interval = interval or REFRESH_INTERVAL
+        self.alias = alias
+        # Payloads must outlive a few refresh cycles so readers never find a gap.
+        self.ttl = max(4800, int(self.interval * 3))
+
+    async def refresh_subreddit(self, subreddit_name: str):
+        """
+        Refreshes one subreddit.
+
+        Returns:
+            tuple: (list of listed post ids, CrawlStats where `cached` counts unchanged posts).
+        """
+        cache = caches.get(self.alias)
+        stats = CrawlStats()
+        posts = [post async for post in self.source.hot_posts(subreddit_name, self.limit)]
+        stats.seen = len(posts)
+        post_ids = [post.id for post in posts]
+        if not posts:
+            return post_ids, stats
+
+        keys = []
+        for post_id in post_ids:
+            keys += [f"post:{post_id}", f"post_meta:{post_id}"]
+        stored = await cache.multi_get(keys)
+
+        stale = []
+        for index, post in enumerate(posts):
+            payload, meta = stored[2 * index], stored[2 * index + 1]
+            if payload and meta == post_signature(post):
+                stats.cached += 1
+            else:
+                stale.append(post)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(post):
+            async with semaphore:
+                try:
+                    await self.source.throttle(stats)
+                    payload = await asyncio.wait_for(self.source.load(post), timeout=rc.POST_TIMEOUT)
+                except asyncio.TimeoutError:
+                    stats.timed_out += 1
+                    payload = None
+                except Exception as e:
+                    print(f"  > Error ingesting post {post.id}: {e}")
+                    payload = None
+                if payload:
+                    stats.fetched += 1
+                else:
+                    stats.failed += 1
+                return post, payload
+
+        loaded = await asyncio.gather(*(load(post) for post in stale))
+        pairs = []
+        for post, payload in loaded:
+            if payload:
+                signature = post_signature(post)
+                pairs += [(f"post:{post.id}", payload), (f"post_meta:{post.id}", signature)]
+                if self.index is not None:
+                    self.index.add_post(post.id, payload.get('comments', []), signature=signature)
+        pairs.append((f"subreddit_posts:{subreddit_name}", post_ids))
+        await cache.multi_set(pairs, ttl=self.ttl)
+        return post_ids, stats
+
+    async def refresh_once(self) -> Dict[str, CrawlStats]:
+        """
+        Refreshes every configured subreddit and publishes the combined post id index.
+
+        Returns:
+            dict: CrawlStats per subreddit.
+        """
+        cache = caches.get(self.alias)
+        all_post_ids = []
+        results = {}
+        for subreddit_name in self.subreddits:
+            try:
+                post_ids, stats = await self.refresh_subreddit(subreddit_name)
+            except Exception as e:
+                print(f"Refresh of r/{subreddit_name} failed: {e}")
+                # Keep serving the previous listing for this subreddit
+                post_ids = await cache.get(f"subreddit_posts:{subreddit_name}") or []
+                stats = None
+            all_post_ids += post_ids
+            results[subreddit_name] = stats
+            if stats is not None:
+                print(f"r/{subreddit_name} refreshed: {stats.as_dict()}")
+        await cache.set('all_post_ids', list(dict.fromkeys(all_post_ids)), ttl=self.ttl)
+        return results
+
+    async def run_forever(self, stop_event: Optional[asyncio.Event] = None):
+        """
+        Refreshes on a fixed interval until `stop_event` is set.
+        """
+        stop_event = stop_event or asyncio.Event()
+        while not stop_event.is_set():
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                print(f"Ingestion cycle failed: {e}")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Keep cached Reddit posts fresh for the research agent.")
+    parser.add_argument('--subreddits', nargs='+', default=SUBREDDITS, help="Subreddits to ingest.")
+    parser.add_argument('--interval', type=float, default=REFRESH_INTERVAL, help="Seconds between refreshes.")
+    parser.add_argument('--limit', type=int, default=50, help="Hot posts per subreddit.")
+    parser.add_argument('--concurrency', type=int, default=rc.CRAWL_CONCURRENCY, help="Parallel post loads.")
+    parser.add_argument('--once', action='store_true', help="Run a single refresh and exit.")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    source = AsyncPrawSource()
+    ingestor = RedditIngestor(source, subreddits=args.subreddits, limit=args.limit,
+                              concurrency=args.concurrency, interval=args.interval)
+    try:
+        if args.once:
+            await ingestor.refresh_once()
+        else:
+            await ingestor.run_forever()
+    finally:
+        await source.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
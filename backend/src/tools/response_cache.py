@@ -0,0 +1,154 @@
+"""
+This module provides a two-tier cache for SerpAPI engine responses. Entries are keyed on a
+normalized hash of the request parameters (the api key is never part of the key), kept in a
+bounded in-memory LRU and backed by the shared Redis alias, with per-engine TTLs.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiocache import caches
+from ..config import cache_setup  # noqa: F401 -- registers the 'default' Redis alias
+from ..config.telemetry import record_cache_lookup
+from .single_flight import SingleFlight
+
+# Seconds a response stays fresh, per SerpAPI engine. News and quotes move fast.
+ENGINE_TTLS = {
+    'google_news': 300,
+    'copilot': 900,
+    'google': 1800,
+    'google_light_fast': 1800,
+    'bing': 1800,
+    'google_finance': 300,
+}
+DEFAULT_TTL = 900
+# Google Finance requests for long chart windows are price history, which changes slowly.
+FINANCE_HISTORY_WINDOWS = frozenset({'6M', 'YTD', '1Y', '5Y', 'MAX'})
+FINANCE_HISTORY_TTL = int(os.getenv('FINANCE_HISTORY_TTL', 21600))
+
+# Parameters that identify the caller rather than the query.
+EXCLUDED_PARAMS = {'api_key'}
+
+
+def cache_key(params: dict) -> str:
+    """
+    Builds a content-addressed key for a SerpAPI request.
+
+    Args:
+        params (dict): Parameters as built by `build_params`, `build_serpapi_params` or `create_params`.
+
+    Returns:
+        str: Key of the form 'serpapi:<engine>:<sha256>'.
+    """
+    normalized = {}
+    for name, value in params.items():
+        if name in EXCLUDED_PARAMS or value is None:
+            continue
+        value = ' '.join(str(value).split())
+        if name == 'q':
+            value = value.lower()
+        normalized[name.lower()] = value
+    digest = hashlib.sha256(json.dumps(normalized, sort_keys=True).encode('utf-8')).hexdigest()
+    return f"serpapi:{normalized.get('engine', 'unknown')}:{digest}"
+
+
+class ResponseCache:
+    """
+    In-memory LRU tier in front of the Redis alias, with hit/miss counters.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, alias: str = 'default', ttls: Optional[Dict[str, int]] = None) -> None:
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('RESPONSE_CACHE_SIZE', 1024))
+        self.alias = alias
+        self.ttls = ttls if ttls is not None else ENGINE_TTLS
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._flights = SingleFlight()
+        self.stats = {'memory_hits': 0, 'redis_hits': 0, 'misses': 0}
+
+    def ttl_for(self, params: dict) -> int:
+        engine = params.get('engine')
+        if engine == 'google_finance' and str(params.get('window', '')).upper() in FINANCE_HISTORY_WINDOWS:
+            return FINANCE_HISTORY_TTL
+        return self.ttls.get(engine, DEFAULT_TTL)
+
+    def _memory_get(self, key: str):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: Any, ttl: int) -> None:
+        self._memory[key] = (time.monotonic() + ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, params: dict):
+        """
+        Looks a request up in memory, then in Redis. Redis hits are promoted to memory.
+
+        Returns:
+            The cached response, or None on a miss.
+        """
+        key = cache_key(params)
+        value = self._memory_get(key)
+        if value is not None:
+            self.stats['memory_hits'] += 1
+            record_cache_lookup('serpapi', 'memory')
+            return value
+        try:
+            value = await caches.get(self.alias).get(key)
+        except Exception as e:
+            print(f"Response cache read failed for {key}: {e}")
+            value = None
+        if value is not None:
+            self.stats['redis_hits'] += 1
+            record_cache_lookup('serpapi', 'redis')
+            self._memory_set(key, value, self.ttl_for(params))
+            return value
+        self.stats['misses'] += 1
+        record_cache_lookup('serpapi', 'miss')
+        return None
+
+    async def set(self, params: dict, value: Any) -> None:
+        key = cache_key(params)
+        ttl = self.ttl_for(params)
+        self._memory_set(key, value, ttl)
+        try:
+            await caches.get(self.alias).set(key, value, ttl=ttl)
+        except Exception as e:
+            print(f"Response cache write failed for {key}: {e}")
+
+    async def fetch(self, params: dict, loader: Callable[[], Awaitable[Any]]):
+        """
+        Returns the cached response for `params`, calling `loader` and caching its result on a miss.
+        Empty (None) responses are not cached. Concurrent fetches of the same key share one lookup
+        and one `loader` call, e.g. the quote and market requests google_finance starts together.
+        """
+        return await self._flights.do(cache_key(params), lambda: self._fetch(params, loader))
+
+    async def _fetch(self, params: dict, loader: Callable[[], Awaitable[Any]]):
+        value = await self.get(params)
+        if value is not None:
+            return value
+        value = await loader()
+        if value is not None:
+            await self.set(params, value)
+        return value
+
+    def clear(self) -> None:
+        self._memory.clear()
+        self.stats = {'memory_hits': 0, 'redis_hits': 0, 'misses': 0}
+
+
+# Process-wide cache shared by every SerpAPI tool.
+response_cache = ResponseCache()
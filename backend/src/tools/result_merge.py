@@ -0,0 +1,159 @@
+"""
+This module merges the responses of every web search engine into one ranked result set.
+Results are matched on canonical URL and on SimHash fingerprints of their title and snippet,
+so the same article syndicated or re-listed by several engines is analyzed once, and each
+merged result keeps the engines that returned it.
+"""
+
+import hashlib
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .compaction import canonical_url, extract_items
+
+SIMHASH_BITS = 64
+# Fingerprints this many bits apart or fewer are treated as the same result.
+NEAR_DUPLICATE_DISTANCE = int(os.getenv('NEAR_DUPLICATE_DISTANCE', 6))
+# Reciprocal rank fusion constant: damps the advantage of the very top positions.
+RRF_K = 60
+
+# Engine -> analysis branch that owns the results it contributes first.
+ENGINE_FAMILIES = {
+    'google': 'google',
+    'google_news': 'google',
+    'google_light': 'google',
+    'google_light_fast': 'google',
+    'bing': 'bing',
+    'copilot': 'bing',
+}
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def simhash(text: str) -> int:
+    """
+    Returns the 64-bit SimHash of `text` over its words. Snippets are short, so single words
+    keep fingerprints of re-titled or lightly edited copies within a few bits of each other.
+    """
+    weights = [0] * SIMHASH_BITS
+    for word in _WORD.findall(text.lower()):
+        value = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class _FingerprintIndex:
+    """
+    Finds stored fingerprints within NEAR_DUPLICATE_DISTANCE bits. Fingerprints are split into
+    distance + 1 bands; two fingerprints that close must share at least one band exactly.
+    """
+
+    def __init__(self, distance: int = NEAR_DUPLICATE_DISTANCE) -> None:
+        self.distance = distance
+        self.bands = distance + 1
+        self.width = -(-SIMHASH_BITS // self.bands)
+        self._buckets: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+
+    def _keys(self, fingerprint: int):
+        mask = (1 << self.width) - 1
+        return [(band, fingerprint >> (band * self.width) & mask) for band in range(self.bands)]
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        for key in self._keys(fingerprint):
+            for other, slot in self._buckets.get(key, ()):
+                if hamming(fingerprint, other) <= self.distance:
+                    return slot
+        return None
+
+    def add(self, fingerprint: int, slot: int) -> None:
+        for key in self._keys(fingerprint):
+            self._buckets.setdefault(key, []).append((fingerprint, slot))
+
+
+def label_responses(payload, engines: Iterable[str]) -> List[Tuple[str, dict]]:
+    """
+    Pairs each response of a search tool with its engine name.
+
+    Args:
+        payload: The list returned by a search tool, in the order of `engines`.
+        engines: Engine names used when a response does not report its own.
+
+    Returns:
+        list[tuple]: (engine, response) for every response that is a dict.
+    """
+    if isinstance(payload, dict):
+        payload = [payload]
+    labelled = []
+    for engine, response in zip(engines, payload or []):
+        if isinstance(response, dict):
+            engine = (response.get('search_parameters') or {}).get('engine') or engine
+            labelled.append((engine, response))
+    return labelled
+
+
+def merge_results(responses: Iterable[Tuple[str, dict]]) -> List[dict]:
+    """
+    Merges labelled search responses into a single ranked list.
+
+    Args:
+        responses: (engine, response) pairs, see `label_responses`.
+
+    Returns:
+        list[dict]: Items as produced by `compaction.extract_items`, plus 'sources' (engines
+            that returned the result, in the order given), 'owner' (the analysis branch that covers
+            it) and 'score' (reciprocal rank fusion over all engines), best first.
+    """
+    merged: List[dict] = []
+    by_url: Dict[str, int] = {}
+    fingerprints = _FingerprintIndex()
+
+    for engine, response in responses:
+        for rank, item in enumerate(extract_items(response)):
+            url = canonical_url(item.get('link'))
+            fingerprint = simhash(f"{item.get('title') or ''} {item.get('snippet') or ''}")
+            slot = by_url.get(url) if url else None
+            if slot is None and fingerprint:
+                slot = fingerprints.find(fingerprint)
+            contribution = 1 / (RRF_K + rank + 1)
+
+            if slot is None:
+                slot = len(merged)
+                merged.append({
+                    **item,
+                    'sources': [engine],
+                    'owner': ENGINE_FAMILIES.get(engine, engine),
+                    'score': contribution,
+                    '_best': contribution,
+                })
+                if fingerprint:
+                    fingerprints.add(fingerprint, slot)
+            else:
+                entry = merged[slot]
+                if engine not in entry['sources']:
+                    entry['sources'].append(engine)
+                    entry['score'] += contribution
+                for field in ('link', 'snippet', 'source', 'date'):
+                    if not entry.get(field) and item.get(field):
+                        entry[field] = item[field]
+                if contribution > entry['_best']:
+                    entry['_best'] = contribution
+                    entry['owner'] = ENGINE_FAMILIES.get(engine, engine)
+            if url:
+                by_url.setdefault(url, slot)
+
+    for entry in merged:
+        del entry['_best']
+    return sorted(merged, key=lambda entry: entry['score'], reverse=True)
+
+
+def results_for(merged: Optional[List[dict]], owner: str) -> List[dict]:
+    """
+    Returns the merged results owned by one analysis branch, in rank order.
+    """
+    return [item for item in merged or [] if item.get('owner') == owner]
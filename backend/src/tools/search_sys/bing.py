@@ -1,13 +1,19 @@
-from xxlimited import Str
-from aiohttp.web import HTTPException
 import os 
-import aiohttp
 import asyncio
-import pandas as pd
 from dotenv import load_dotenv
+from ...config.lazy_imports import lazy_import
+from ..http_client import get_session
+from ..response_cache import response_cache
+from ..single_flight import single_flight, normalize_query
+from ...config.telemetry import track_call, traced_tool
 
 load_dotenv()
 
+web_exceptions = lazy_import('aiohttp.web_exceptions')
+
+# Engines queried by bing(), in the order of its results.
+ENGINES = ('bing', 'copilot')
+
 class Bing:
 
     BASE_URL = 'https://serpapi.com/search'
@@ -36,30 +42,37 @@ class Bing:
                     data = await respn.json()
                     return data
                 else:
-                    raise HTTPException(reason=f"Non-200 response: {respn.status}")
+                    raise web_exceptions.HTTPException(reason=f"Non-200 response: {respn.status}")
         except Exception as e:
-            raise HTTPException(reason=str(e))
+            raise web_exceptions.HTTPException(reason=str(e))
+
+    async def _fetch(self, params):
+        session = await get_session()
+        with track_call(f"serpapi.{params.get('engine')}"):
+            return await Bing.get_url(session, Bing.BASE_URL, params=params)
 
     async def talk_with_copilot(self):
         try:
-            async with aiohttp.ClientSession() as session:
-                response = await Bing.get_url(session, Bing.BASE_URL, params=self.create_params(engine='copilot'))
-                return response
+            params = self.create_params(engine='copilot')
+            response = await response_cache.fetch(params, lambda: self._fetch(params))
+            return response
         except Exception as e:
             print(f'an exception occured at talk with copilot {e}')
 
     async def bing_search(self):
         try:
-            async with aiohttp.ClientSession() as session:
-                response = await Bing.get_url(session, Bing.BASE_URL, params=self.create_params('bing'))
-                if response:
-                    print(response)
-                else:
-                    return None
+            params = self.create_params('bing')
+            response = await response_cache.fetch(params, lambda: self._fetch(params))
+            if response:
+                return response
+            else:
+                return None
         except Exception as e:
             print(f'an exception occured at bing search {e}')
 
 
+@traced_tool('bing')
+@single_flight(key_builder=normalize_query)
 async def bing(user_query:str):
     try:
         bing=Bing(user_query)
@@ -78,4 +91,5 @@ async def bing(user_query:str):
         print(f'an exception occured at bing {e}')
 
 
-asyncio.run(bing('what is the latest news about apple'))
\ No newline at end of file
+if __name__ == '__main__':
+    asyncio.run(bing('what is the latest news about apple'))
\ No newline at end of file
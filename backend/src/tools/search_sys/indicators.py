@@ -0,0 +1,80 @@
+"""
+This module computes technical indicators for the finance prompts. Price histories of all
+requested symbols are aligned into wide frames and every indicator is computed column-wise in
+one vectorized pass, producing a compact per-symbol summary table instead of raw bars.
+"""
+
+from typing import Dict, Optional
+
+from ...config.lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+TRADING_DAYS = 252
+RETURN_WINDOWS = {'1d': 1, '1w': 5, '1m': 21, '3m': 63, '1y': 252}
+SMA_WINDOWS = (20, 50, 200)
+VOLUME_WINDOW = 20
+
+
+def _window_return(close: 'pd.DataFrame', days: int) -> 'pd.Series':
+    if len(close) <= days:
+        return pd.Series(np.nan, index=close.columns)
+    return close.iloc[-1] / close.iloc[-1 - days] - 1
+
+
+def compute_indicators(histories: 'Dict[str, Optional[pd.DataFrame]]') -> 'pd.DataFrame':
+    """
+    Computes returns, volatility, drawdown, moving averages and volume anomalies.
+
+    Args:
+        histories (dict): {symbol: OHLCV DataFrame with 'Close' and 'Volume' columns}.
+
+    Returns:
+        pandas.DataFrame: One row per symbol. Percentages are fractions (0.05 == 5%).
+    """
+    histories = {symbol: frame for symbol, frame in histories.items() if frame is not None and not frame.empty}
+    if not histories:
+        return pd.DataFrame()
+
+    close = pd.DataFrame({symbol: frame['Close'] for symbol, frame in histories.items()}).sort_index().ffill()
+    volume = pd.DataFrame({symbol: frame['Volume'] for symbol, frame in histories.items()}).sort_index()
+    log_returns = np.log(close / close.shift(1))
+
+    summary = pd.DataFrame(index=close.columns)
+    summary['last_close'] = close.iloc[-1]
+    for label, days in RETURN_WINDOWS.items():
+        summary[f'return_{label}'] = _window_return(close, days)
+    summary['volatility_1m'] = log_returns.iloc[-21:].std() * np.sqrt(TRADING_DAYS)
+    summary['volatility_1y'] = log_returns.iloc[-TRADING_DAYS:].std() * np.sqrt(TRADING_DAYS)
+
+    drawdown = close / close.cummax() - 1
+    summary['max_drawdown'] = drawdown.min()
+    summary['current_drawdown'] = drawdown.iloc[-1]
+
+    for window in SMA_WINDOWS:
+        sma = close.rolling(window, min_periods=window).mean().iloc[-1]
+        summary[f'vs_sma{window}'] = close.iloc[-1] / sma - 1
+
+    volume_mean = volume.rolling(VOLUME_WINDOW, min_periods=5).mean().shift(1)
+    volume_std = volume.rolling(VOLUME_WINDOW, min_periods=5).std().shift(1)
+    volume_z = (volume - volume_mean) / volume_std.replace(0, np.nan)
+    summary['volume_ratio'] = (volume / volume_mean).iloc[-1]
+    summary['volume_z'] = volume_z.iloc[-1]
+    summary['volume_spikes_1m'] = (volume_z.iloc[-21:] > 2).sum()
+    summary['bars'] = close.notna().sum()
+    return summary
+
+
+def format_indicator_table(summary: 'pd.DataFrame') -> str:
+    """
+    Renders the indicator summary as a compact text table for an LLM prompt.
+    """
+    if summary is None or summary.empty:
+        return ""
+    table = summary.copy()
+    percent_columns = [c for c in table.columns if c.startswith(('return_', 'volatility_', 'vs_sma')) or c.endswith('drawdown')]
+    table[percent_columns] = (table[percent_columns] * 100).round(1)
+    table = table.round({'last_close': 2, 'volume_ratio': 2, 'volume_z': 1})
+    table.columns = [f"{c} (%)" if c in percent_columns else c for c in table.columns]
+    return table.T.to_string(na_rep='-')
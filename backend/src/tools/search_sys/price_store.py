@@ -0,0 +1,239 @@
+"""
+This module provides a local time-series store for Yahoo Finance price history. Bars are kept
+on disk per symbol and interval as memory-mapped NumPy arrays; each request only downloads the
+tail missing since the last stored bar and range queries are served locally.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from ...config.lazy_imports import lazy_import
+from ..executor import run_blocking
+from ..single_flight import single_flight
+from .yf_batch import history_batcher
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+STORE_DIR = Path(os.getenv('PRICE_STORE_DIR', Path(__file__).resolve().parents[3] / 'data' / 'prices'))
+# Seconds before the stored tail of a series is checked against Yahoo again.
+REFRESH_AFTER = float(os.getenv('PRICE_REFRESH_SECONDS', 3600))
+
+# yfinance periods (ascending) and the span each covers.
+PERIODS = [
+    ('5d', timedelta(days=5)),
+    ('1mo', timedelta(days=31)),
+    ('3mo', timedelta(days=92)),
+    ('6mo', timedelta(days=183)),
+    ('1y', timedelta(days=366)),
+    ('2y', timedelta(days=731)),
+    ('5y', timedelta(days=1827)),
+    ('10y', timedelta(days=3653)),
+]
+PERIOD_SPANS = {name.lower(): span for name, span in PERIODS}
+
+
+def period_span(period: str) -> Optional[timedelta]:
+    """
+    Returns the time span of a yfinance period string, or None for 'max'.
+    """
+    return PERIOD_SPANS.get(period.lower())
+
+
+def covering_period(gap: timedelta) -> str:
+    """
+    Returns the smallest yfinance period that covers `gap`.
+    """
+    for name, span in PERIODS:
+        if span >= gap:
+            return name
+    return 'max'
+
+
+def map_npy(path: Path) -> 'np.ndarray':
+    """
+    Memory-maps a .npy file read-only. Header and data come from one open file, unlike
+    `np.load(mmap_mode='r')`, which opens the path twice and can mix two versions of a file
+    replaced in between.
+    """
+    with open(path, 'rb') as handle:
+        version = np.lib.format.read_magic(handle)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(handle)
+        if not np.prod(shape):
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(handle, dtype=dtype, mode='r', offset=handle.tell(), shape=shape,
+                         order='F' if fortran_order else 'C')
+
+
+class PriceStore:
+    """
+    On-disk OHLCV store. Each series lives in `<root>/<interval>/<SYMBOL>/` as `series.npy`,
+    one structured array of 'ts' (int64 UTC nanoseconds) and 'bars' (float64, one column per entry
+    in COLUMNS), and `meta.json` (last refresh time and the longest period downloaded in full).
+
+    Timestamps and bars share one file, so a write replaces both with a single atomic rename and
+    a reader always maps a consistent pair. Writes to a series are serialized, since the same
+    symbol may be refreshed for different periods at once.
+    """
+
+    def __init__(self, root: Optional[Path] = None, refresh_after: Optional[float] = None) -> None:
+        self.root = Path(root) if root is not None else STORE_DIR
+        self.refresh_after = REFRESH_AFTER if refresh_after is None else refresh_after
+        self.stats = {'local': 0, 'tail_fetches': 0, 'full_fetches': 0}
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _dir(self, symbol: str, interval: str) -> Path:
+        return self.root / interval / symbol.upper()
+
+    def _lock(self, directory: Path) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(directory, threading.Lock())
+
+    def _load(self, symbol: str, interval: str):
+        try:
+            series = map_npy(self._dir(symbol, interval) / 'series.npy')
+        except FileNotFoundError:
+            return None, None
+        return series['ts'], series['bars']
+
+    def meta(self, symbol: str, interval: str = '1d') -> dict:
+        try:
+            return json.loads((self._dir(symbol, interval) / 'meta.json').read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def last_timestamp(self, symbol: str, interval: str = '1d') -> 'Optional[pd.Timestamp]':
+        timestamps, _ = self._load(symbol, interval)
+        if timestamps is None or not len(timestamps):
+            return None
+        return pd.Timestamp(int(timestamps[-1]), tz='UTC')
+
+    def read(self, symbol: str, interval: str = '1d', start=None, end=None) -> 'Optional[pd.DataFrame]':
+        """
+        Returns stored bars in [start, end] as a DataFrame indexed by UTC timestamp.
+        """
+        timestamps, bars = self._load(symbol, interval)
+        if timestamps is None:
+            return None
+        lo = 0 if start is None else int(np.searchsorted(timestamps, pd.Timestamp(start).value, side='left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, pd.Timestamp(end).value, side='right'))
+        index = pd.to_datetime(np.asarray(timestamps[lo:hi]), utc=True)
+        return pd.DataFrame(np.asarray(bars[lo:hi]), index=index, columns=list(COLUMNS))
+
+    def write(self, symbol: str, interval: str, frame: 'pd.DataFrame', period: Optional[str] = None) -> None:
+        """
+        Merges `frame` into the stored series. Stored bars from the first new bar onwards are
+        replaced, since the latest stored bar may have been incomplete. `period` records how far
+        back the frame reaches when it is a full download rather than a tail.
+        """
+        directory = self._dir(symbol, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock(directory):
+            self._write(directory, symbol, interval, frame, period)
+
+    def _write(self, directory: Path, symbol: str, interval: str, frame: 'pd.DataFrame',
+               period: Optional[str]) -> None:
+        index = pd.DatetimeIndex(frame.index)
+        index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+        new_timestamps = index.as_unit('ns').asi8.astype(np.int64)
+        new_bars = frame.reindex(columns=list(COLUMNS)).to_numpy(dtype=np.float64)
+        order = np.argsort(new_timestamps, kind='stable')
+        new_timestamps, new_bars = new_timestamps[order], new_bars[order]
+
+        timestamps, bars = self._load(symbol, interval)
+        if timestamps is not None and len(new_timestamps):
+            keep = int(np.searchsorted(timestamps, new_timestamps[0], side='left'))
+            new_timestamps = np.concatenate([np.asarray(timestamps[:keep]), new_timestamps])
+            new_bars = np.concatenate([np.asarray(bars[:keep]), new_bars])
+        elif timestamps is not None:
+            new_timestamps, new_bars = np.asarray(timestamps), np.asarray(bars)
+
+        series = np.empty(len(new_timestamps), dtype=[('ts', np.int64), ('bars', np.float64, (len(COLUMNS),))])
+        series['ts'], series['bars'] = new_timestamps, new_bars
+        tmp = directory / '.series.npy.tmp'
+        with open(tmp, 'wb') as handle:
+            np.save(handle, series)
+        os.replace(tmp, directory / 'series.npy')
+        meta = self.meta(symbol, interval)
+        meta['refreshed_at'] = time.time()
+        if period is not None and not self._covers(meta, period):
+            meta['period'] = period
+        tmp = directory / '.meta.json.tmp'
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, directory / 'meta.json')
+
+    @staticmethod
+    def _covers(meta: dict, period: str) -> bool:
+        """
+        True when the stored series was fully downloaded for at least `period`.
+        """
+        stored = meta.get('period')
+        if stored is None:
+            return False
+        if stored == 'max':
+            return True
+        wanted = period_span(period)
+        return wanted is not None and period_span(stored) >= wanted
+
+    def _needs_refresh(self, meta: dict) -> bool:
+        refreshed_at = meta.get('refreshed_at')
+        return refreshed_at is None or time.time() - refreshed_at > self.refresh_after
+
+    @single_flight(key_builder=lambda self, symbol, period='5y', interval='1d': (id(self), symbol.upper(), period, interval))
+    async def history(self, symbol: str, period: str = '5y', interval: str = '1d') -> 'Optional[pd.DataFrame]':
+        """
+        Returns `period` of bars for `symbol`, downloading only what is missing locally.
+
+        Args:
+            symbol (str): Ticker symbol.
+            period (str): yfinance period to return, e.g. '5y'.
+            interval (str): Bar interval, e.g. '1d'.
+
+        Returns:
+            pandas.DataFrame or None
+        """
+        symbol = symbol.upper()
+        last = await run_blocking(self.last_timestamp, symbol, interval)
+        meta = await run_blocking(self.meta, symbol, interval)
+        span = period_span(period)
+        now = pd.Timestamp.now(tz='UTC')
+
+        if last is None or not self._covers(meta, period) or (span is not None and last < now - span):
+            self.stats['full_fetches'] += 1
+            fetch_period = period
+        elif self._needs_refresh(meta):
+            self.stats['tail_fetches'] += 1
+            fetch_period = covering_period(now - last)
+        else:
+            fetch_period = None
+            self.stats['local'] += 1
+
+        if fetch_period is not None:
+            frame = await history_batcher.history(symbol, period=fetch_period, interval=interval)
+            if frame is not None and not frame.empty:
+                full = fetch_period if fetch_period == period else None
+                await run_blocking(self.write, symbol, interval, frame, full)
+
+        start = None if span is None else now - span
+        return await run_blocking(self.read, symbol, interval, start)
+
+    async def histories(self, symbols: Iterable[str], period: str = '5y', interval: str = '1d') -> 'Dict[str, Optional[pd.DataFrame]]':
+        """
+        Returns {symbol: frame} for several symbols; missing tails are fetched in one batch.
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        frames = await asyncio.gather(*(self.history(symbol, period, interval) for symbol in symbols))
+        return dict(zip(symbols, frames))
+
+
+# Process-wide store used by the Yahoo Finance tools.
+price_store = PriceStore()
@@ -0,0 +1,257 @@
+"""
+This module resolves the companies and tickers mentioned in a question to exchange symbols, so
+the finance tools are queried with real instruments instead of free text. The symbol directory
+is a CSV (symbol, exchange, name, aliases) that is memory-mapped, not read into Python strings;
+the indexes keep byte offsets into it. Names are matched word by word with a prefix trie, and
+misspelled names with a bounded edit distance.
+
+    python -m src.tools.search_sys.symbols "How are Nvidia and $AMD doing vs. Berkshire?"
+"""
+
+import mmap
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_DIRECTORY = Path(__file__).with_name('symbols.csv')
+# Any CSV with the same columns (e.g. a full exchange listing) can replace the bundled one.
+SYMBOL_DIRECTORY = Path(os.getenv('SYMBOL_DIRECTORY', DEFAULT_DIRECTORY))
+MAX_SYMBOLS = int(os.getenv('MAX_SYMBOLS', 5))
+
+# Trailing words dropped from company names ("Apple Inc." -> "apple").
+NAME_SUFFIXES = frozenset("""
+    inc incorporated corp corporation co company companies ltd limited plc p.l.c holdings holding
+    group class a b c s sa s.a nv n.v ag se technologies platforms & and
+""".split())
+# Names that are also everyday words only match when capitalized ("Target", not "price target").
+COMMON_WORD_NAMES = frozenset("""
+    apple amazon target visa gap shell oracle block meta chase coke delta southern progressive ford
+    arm snap sony chevron micron alphabet lilly uber dell zoom
+""".split())
+# Upper-case words that are more often acronyms or emphasis than tickers.
+AMBIGUOUS_TICKERS = frozenset("""
+    ALL ARE NOW SO ON IT AI AM PM MA MS DE LOW EL CI MO US USA UK EU CEO CFO GDP CPI ETF IPO EPS
+""".split())
+CASHTAG = re.compile(r'\$([A-Za-z][A-Za-z.\-]{0,5})\b')
+EXCHANGE_TICKER = re.compile(r'\b(NYSE|NASDAQ|NYSEARCA|AMEX|OTCMKTS)\s*:\s*([A-Z][A-Z.\-]{0,5})\b')
+UPPER_TOKEN = re.compile(r'\b[A-Z][A-Z0-9.\-]{1,5}\b')
+WORD = re.compile(r"[A-Za-z0-9&]+(?:['’]s)?")
+
+
+def name_words(text: str) -> List[str]:
+    """
+    Splits a company name or question into lower-case words, dropping possessive 's.
+    """
+    return [re.sub(r"['’]s$", '', word.lower()) for word in WORD.findall(text)]
+
+
+def normalize_name(name: str) -> List[str]:
+    words = name_words(name)
+    while words and words[0] == 'the':
+        words = words[1:]
+    while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words = words[:-1]
+    return words
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between `a` and `b`, or `limit + 1` once it is known to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class _TrieNode:
+    __slots__ = ('children', 'offset', 'completions')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.offset: Optional[int] = None
+        # Offsets of the names completing below this node, up to two (enough to tell if unique).
+        self.completions: List[int] = []
+
+
+class SymbolDirectory:
+    """
+    Memory-mapped symbol directory with ticker, name-trie and fuzzy indexes.
+
+    Rows are parsed only when a match is returned. On name collisions the earlier row wins,
+    so a directory lists the primary share class first.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path or SYMBOL_DIRECTORY)
+        self._map: Optional[mmap.mmap] = None
+        self._tickers: Dict[str, int] = {}
+        self._trie = _TrieNode()
+        self._fuzzy: Dict[str, List[tuple]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> 'SymbolDirectory':
+        """
+        Maps the directory file and builds the indexes. Called on first use.
+        """
+        if self._map is not None:
+            return self
+        with self._lock:
+            if self._map is not None:
+                return self
+            with open(self.path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            offset = mapped.find(b'\n') + 1  # skip the header
+            while 0 < offset < len(mapped):
+                end = mapped.find(b'\n', offset)
+                end = len(mapped) if end == -1 else end
+                line = mapped[offset:end].decode('utf-8').strip()
+                if line:
+                    self._index_row(offset, line)
+                offset = end + 1
+            self._map = mapped
+        return self
+
+    def _index_row(self, offset: int, line: str) -> None:
+        symbol, _, name, aliases = (line.split(',', 3) + ['', '', ''])[:4]
+        self._tickers.setdefault(symbol.upper(), offset)
+        for variant in [name] + [alias for alias in aliases.split('|') if alias]:
+            words = normalize_name(variant)
+            if not words:
+                continue
+            node = self._trie
+            for word in words:
+                node = node.children.setdefault(word, _TrieNode())
+                if len(node.completions) < 2 and offset not in node.completions:
+                    node.completions.append(offset)
+            if node.offset is None:
+                node.offset = offset
+            if len(words) == 1 and len(words[0]) >= 5 and words[0] not in COMMON_WORD_NAMES:
+                self._fuzzy.setdefault(words[0][0], []).append((words[0], offset))
+
+    def _row(self, offset: int) -> Dict[str, str]:
+        end = self._map.find(b'\n', offset)
+        line = self._map[offset:end if end != -1 else len(self._map)].decode('utf-8').strip()
+        symbol, exchange, name = (line.split(',', 3) + ['', ''])[:3]
+        return {'symbol': symbol, 'exchange': exchange, 'name': name}
+
+    def lookup(self, symbol: str) -> Optional[Dict[str, str]]:
+        """
+        Returns the directory row of a ticker, or None if it is not listed.
+        """
+        self.load()
+        offset = self._tickers.get(symbol.upper())
+        return self._row(offset) if offset is not None else None
+
+    def _match(self, offset: int, text: str, start: int, method: str) -> Dict[str, object]:
+        return {**self._row(offset), 'text': text, 'start': start, 'method': method}
+
+    def _tickers_in(self, question: str) -> List[dict]:
+        matches = []
+        for found in CASHTAG.finditer(question):
+            symbol = found.group(1).upper()
+            row = self.lookup(symbol) or {'symbol': symbol, 'exchange': '', 'name': ''}
+            matches.append({**row, 'text': found.group(0), 'start': found.start(), 'method': 'cashtag'})
+        for found in EXCHANGE_TICKER.finditer(question):
+            row = self.lookup(found.group(2)) or {'symbol': found.group(2), 'exchange': found.group(1), 'name': ''}
+            matches.append({**row, 'text': found.group(0), 'start': found.start(), 'method': 'exchange'})
+        for found in UPPER_TOKEN.finditer(question):
+            token = found.group(0).rstrip('.-')
+            if token in AMBIGUOUS_TICKERS or question[max(found.start() - 1, 0)] == '$':
+                continue
+            offset = self._tickers.get(token)
+            if offset is not None:
+                matches.append(self._match(offset, token, found.start(), 'ticker'))
+        return matches
+
+    def _names_in(self, question: str) -> List[dict]:
+        spans = [(found.group(0), found.start()) for found in WORD.finditer(question)]
+        words = name_words(question)
+        matches, i = [], 0
+        while i < len(words):
+            node, best, end = self._trie, None, i
+            for j in range(i, len(words)):
+                node = node.children.get(words[j])
+                if node is None:
+                    break
+                if node.offset is not None:
+                    best, end = node.offset, j
+                elif best is None and len(node.completions) == 1 and len(words[i]) >= 5:
+                    # A distinctive prefix of exactly one name ("berkshire", "goldman")
+                    best, end = node.completions[0], j
+            if best is not None and self._plausible(words[i:end + 1], spans[i][0]):
+                text = question[spans[i][1]:spans[end][1] + len(spans[end][0])]
+                matches.append(self._match(best, text, spans[i][1], 'name'))
+                i = end + 1
+                continue
+            fuzzy = self._fuzzy_match(words[i], spans[i][0], first=i == 0)
+            if fuzzy is not None:
+                matches.append(self._match(fuzzy, spans[i][0], spans[i][1], 'fuzzy'))
+            i += 1
+        return matches
+
+    @staticmethod
+    def _plausible(words: List[str], original: str) -> bool:
+        return not (len(words) == 1 and words[0] in COMMON_WORD_NAMES and not original[0].isupper())
+
+    def _fuzzy_match(self, word: str, original: str, first: bool) -> Optional[int]:
+        # Only capitalized words past the start of the question, to spare everyday words.
+        if first or len(word) < 6 or not original[0].isupper() or not word.isalpha():
+            return None
+        limit = 1 if len(word) < 9 else 2
+        best, best_distance = None, limit + 1
+        for candidate, offset in self._fuzzy.get(word[0], ()):
+            distance = edit_distance(word, candidate, limit)
+            if distance < best_distance:
+                best, best_distance = offset, distance
+        return best
+
+    def resolve(self, question: str, limit: Optional[int] = None) -> List[Dict[str, object]]:
+        """
+        Finds the instruments mentioned in `question`.
+
+        Args:
+            question (str): Free-text user question.
+            limit (int, optional): Maximum number of symbols. Defaults to MAX_SYMBOLS.
+
+        Returns:
+            list: One dict per symbol, in order of first mention, with 'symbol', 'exchange',
+                'name', the matched 'text', its 'start' offset and the 'method' that found it
+                ('cashtag', 'exchange', 'ticker', 'name' or 'fuzzy').
+        """
+        self.load()
+        matches = sorted(self._tickers_in(question) + self._names_in(question), key=lambda m: m['start'])
+        resolved, seen = [], set()
+        for match in matches:
+            if match['symbol'] not in seen:
+                seen.add(match['symbol'])
+                resolved.append(match)
+        return resolved[:limit or MAX_SYMBOLS]
+
+
+def google_quote(match: Dict[str, object]) -> str:
+    """
+    Formats a resolved symbol as a Google Finance quote id, e.g. 'BRK.B:NYSE'.
+    """
+    symbol = str(match['symbol']).replace('-', '.')
+    return f"{symbol}:{match['exchange']}" if match.get('exchange') else symbol
+
+
+# Process-wide directory, mapped on first use.
+symbol_directory = SymbolDirectory()
+
+
+if __name__ == '__main__':
+    for question in sys.argv[1:]:
+        for match in symbol_directory.resolve(question):
+            print(f"{match['symbol']:<8}{match['exchange']:<10}{match['method']:<10}{match['text']!r:<24}{match['name']}")
@@ -0,0 +1,132 @@
+"""
+This module batches Yahoo Finance price history requests. Symbols requested by concurrent
+research sessions within a short window are collected per (period, interval) and fetched with
+a single `yf.download` call, then each caller receives the frame for its own symbol.
+"""
+
+import asyncio
+import os
+from typing import Dict, Iterable, Optional, Set
+
+from ...config.lazy_imports import lazy_import
+from ..executor import run_blocking
+from ...config.telemetry import track_call
+
+pd = lazy_import('pandas')
+yf = lazy_import('yfinance')
+
+# Seconds to wait for more symbols before downloading, and the largest batch per download.
+BATCH_WINDOW = float(os.getenv('YF_BATCH_WINDOW', 0.05))
+MAX_BATCH = int(os.getenv('YF_MAX_BATCH', 50))
+
+
+def split_download(data, symbol: str):
+    """
+    Extracts one symbol's frame from a `yf.download(group_by='ticker')` result.
+
+    Returns:
+        pandas.DataFrame or None: The symbol's bars, or None if Yahoo returned nothing for it.
+    """
+    if data is None or data.empty:
+        return None
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return None
+        frame = data[symbol]
+    else:
+        frame = data
+    frame = frame.dropna(how='all')
+    return frame if not frame.empty else None
+
+
+class HistoryBatcher:
+    """
+    Coalesces history requests into bulk downloads, one per (period, interval) window.
+    """
+
+    def __init__(self, window: Optional[float] = None, max_batch: Optional[int] = None) -> None:
+        self.window = BATCH_WINDOW if window is None else window
+        self.max_batch = max_batch or MAX_BATCH
+        self._pending: Dict[tuple, Dict[str, asyncio.Future]] = {}
+        self._timers: Dict[tuple, asyncio.TimerHandle] = {}
+        # The loop keeps only weak references to tasks; a collected flush would strand its waiters.
+        self._flushes: Set[asyncio.Task] = set()
+        self.stats = {'requests': 0, 'downloads': 0, 'symbols_downloaded': 0}
+
+    async def history(self, symbol: str, period: str = '1mo', interval: str = '1d'):
+        """
+        Returns the price history of one symbol, sharing the download with concurrent callers.
+
+        Args:
+            symbol (str): Ticker symbol.
+            period (str): yfinance period, e.g. '1mo', '5y'.
+            interval (str): yfinance bar interval, e.g. '1d'.
+
+        Returns:
+            pandas.DataFrame or None
+        """
+        loop = asyncio.get_running_loop()
+        symbol = symbol.upper()
+        key = (id(loop), period, interval)
+        self.stats['requests'] += 1
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = {}
+            self._timers[key] = loop.call_later(self.window, self._schedule_flush, key)
+        future = batch.get(symbol)
+        if future is None:
+            future = batch[symbol] = loop.create_future()
+            if len(batch) >= self.max_batch:
+                self._schedule_flush(key)
+        return await asyncio.shield(future)
+
+    async def histories(self, symbols: Iterable[str], period: str = '1mo', interval: str = '1d') -> Dict[str, object]:
+        """
+        Returns {symbol: frame} for several symbols; they join the same batch.
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        frames = await asyncio.gather(*(self.history(symbol, period, interval) for symbol in symbols))
+        return dict(zip(symbols, frames))
+
+    def _schedule_flush(self, key: tuple) -> None:
+        # A batch flushed early at max_batch cancels its timer, which would otherwise flush the
+        # next batch for the key before that batch's window has passed.
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._flush(key, batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, key: tuple, batch: Dict[str, asyncio.Future]) -> None:
+        _, period, interval = key
+        symbols = sorted(batch)
+        self.stats['downloads'] += 1
+        self.stats['symbols_downloaded'] += len(symbols)
+        try:
+            with track_call('yfinance.download', symbols=len(symbols)):
+                data = await run_blocking(
+                    yf.download,
+                    tickers=' '.join(symbols),
+                    period=period,
+                    interval=interval,
+                    group_by='ticker',
+                    progress=False,
+                    threads=True,
+                )
+        except Exception as e:
+            print(f"Error downloading history for {symbols}: {e}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for symbol, future in batch.items():
+            if not future.done():
+                future.set_result(split_download(data, symbol))
+
+
+# Process-wide batcher shared by every research session.
+history_batcher = HistoryBatcher()
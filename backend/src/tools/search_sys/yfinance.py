@@ -1,5 +1,13 @@
-import yfinance as yf
 import asyncio
+from ...config.lazy_imports import lazy_import
+from ..single_flight import single_flight
+from ...config.telemetry import track_call, traced_tool
+from ..executor import run_blocking
+from .yf_batch import history_batcher
+from .price_store import price_store
+
+yf = lazy_import('yfinance')
+pd = lazy_import('pandas')
 
 class YahooFinance:
     def __init__(self, symbol: str = None, symbols: str = None) -> None:
@@ -9,57 +17,71 @@ class YahooFinance:
         self.ticker = yf.Ticker(self.symbol) if self.symbol else None
         self.tickers = yf.Tickers(self.symbols.upper()) if self.symbols else None
 
+    async def _fetch_attribute(self, name: str):
+        """
+        Reads a (blocking) yfinance Ticker property in the executor. Returns None on failure.
+        """
+        try:
+            with track_call('yfinance.ticker', field=name):
+                return await run_blocking(getattr, self.ticker, name, None)
+        except asyncio.TimeoutError:
+            print(f"Timed out fetching {name} for {self.symbol}")
+        except Exception as e:
+            print(f"Error fetching {name} for {self.symbol}: {e}")
+        return None
+
+    async def _fetch_attributes(self, fields: dict):
+        """
+        Fetches several Ticker properties concurrently.
+
+        Args:
+            fields (dict): Mapping of result key to Ticker property name.
+        """
+        values = await asyncio.gather(*(self._fetch_attribute(name) for name in fields.values()))
+        return dict(zip(fields.keys(), values))
+
     async def get_history(self, start=None, end=None, interval="1d"):
         if not self.ticker:
             print("Ticker symbol not provided.")
             return None
         try:
-            # yfinance's .history is synchronous; wrap in a thread executor
-            result = await self.ticker.history(start=start, end=end, interval=interval)
+            if start is None and end is None:
+                # Default window: share one bulk download with concurrent requests
+                return await history_batcher.history(self.symbol, period='1mo', interval=interval)
+            # yfinance's .history is synchronous; run it in the executor
+            result = await run_blocking(self.ticker.history, start=start, end=end, interval=interval)
             return result
         except Exception as e:
             print(f"Error fetching history for {self.symbol}: {e}")
             return None
 
-    def get_fundamentals(self):
+    async def get_fundamentals(self):
         if not self.ticker:
             print("Ticker symbol not provided.")
             return None
-        try:
-            return {
-                "info": getattr(self.ticker, "info", None),
-                "balance_sheet": getattr(self.ticker, "balance_sheet", None),
-                "income_statement": getattr(self.ticker, "income_stmt", None),
-                "cashflow": getattr(self.ticker, "cashflow", None),
-            }
-        except Exception as e:
-            print(f"Error fetching fundamentals for {self.symbol}: {e}")
-            return None
-
-    def get_corporate_actions(self):
+        return await self._fetch_attributes({
+            "info": "info",
+            "balance_sheet": "balance_sheet",
+            "income_statement": "income_stmt",
+            "cashflow": "cashflow",
+        })
+
+    async def get_corporate_actions(self):
         if not self.ticker:
             print("Ticker symbol not provided.")
             return None
-        try:
-            return {
-                "dividends": getattr(self.ticker, "dividends", None),
-                "splits": getattr(self.ticker, "splits", None),
-                "shareholders": getattr(self.ticker, "major_holders", None),
-                "institutional": getattr(self.ticker, "institutional_holders", None)
-            }
-        except Exception as e:
-            print(f"Error fetching corporate actions for {self.symbol}: {e}")
-            return None
-
-    def get_company_info(self):
+        return await self._fetch_attributes({
+            "dividends": "dividends",
+            "splits": "splits",
+            "shareholders": "major_holders",
+            "institutional": "institutional_holders",
+        })
+
+    async def get_company_info(self):
         if not self.ticker:
             print("Ticker symbol not provided.")
             return None
-        try:
-            return getattr(self.ticker, "info", None)
-        except Exception as e:
-            print(f"Error fetching company info for {self.symbol}: {e}")
-            return None
+        return await self._fetch_attribute("info")
 
     async def companies_analysis_info(self):
         if not self.tickers:
@@ -69,11 +91,15 @@ class YahooFinance:
             def get_news():
                 return self.tickers.news()
 
-            def get_history():
-                return self.tickers.history(period='5Y').to_json()
+            async def get_history():
+                # Served from the local store; only missing tails are downloaded
+                frames = await price_store.histories(self.symbols.split(), period='5y')
+                frames = {symbol: frame for symbol, frame in frames.items() if frame is not None}
+                if not frames:
+                    return None
+                return pd.concat(frames, axis=1).to_json()
 
-            companies_news = await get_news()
-            history = await get_history()
+            companies_news, history = await asyncio.gather(run_blocking(get_news), get_history())
 
             return {
                 'companies_news': companies_news,
@@ -84,6 +110,7 @@ class YahooFinance:
             return None
 
 
+@single_flight()
 async def yfinance_company(symbol: str):
     try:
         yahoo = YahooFinance(symbol)
@@ -101,9 +128,10 @@ async def yfinance_company(symbol: str):
     except Exception as e:
         print(f"Error in yfinance_company: {e}")
 
+@single_flight()
 async def yfinance_analysis(symbols: str):
     try:
-        yahoo = YahooFinance(symbols)
+        yahoo = YahooFinance(symbols=symbols)
         analysis = asyncio.Task(yahoo.companies_analysis_info())
         if not analysis:
             print("No analysis data found")
@@ -115,6 +143,7 @@ async def yfinance_analysis(symbols: str):
     except Exception as e:
         print(f"Error in yfinance_analysis: {e}")
 
+@single_flight()
 async def yf_finance(symbol: str):
     try:
         yahoo = YahooFinance(symbol)
@@ -132,7 +161,8 @@ async def yf_finance(symbol: str):
     except Exception as e:
         print(f"Error in yf_finance: {e}")
 
-async def main(symbol: str = None, query_type: str = None, multi_analysis:bool = None):
+@traced_tool('yahoo_finance')
+async def main(symbol: str = None, query_type: str = None, symbols: str = None):
     try:
         # Sanity check for inputs
         if query_type is not None:
@@ -145,24 +175,21 @@ async def main(symbol: str = None, query_type: str = None, multi_analysis:bool =
                 if not data:
                     print("No financial data found")
                     return
-                print(data)
-                return
+                return data
 
         if symbols:
             data = await yfinance_analysis(symbols)
             if not data:
                 print("No analysis data found")
                 return
-            print(data)
-            return
+            return data
 
         if symbol:
             data = await yfinance_company(symbol)
             if not data:
                 print("No company data found")
                 return
-            print(data)
-            return
+            return data
 
         print("Please provide either 'symbol' or 'symbols'.")
     except Exception as e:
@@ -0,0 +1,106 @@
+"""
+This module provides request coalescing ("single-flight") for tool coroutines. Concurrent
+callers of the same function with the same arguments await one in-flight call and share its
+result instead of each hitting SerpAPI, Yahoo or Reddit.
+"""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Tracks in-flight calls by key. The first caller for a key starts the call; callers that
+    arrive while it is running await the same task. Keys are scoped to the running event loop.
+    The call is cancelled once every caller awaiting it has been cancelled.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.stats = {'calls': 0, 'shared': 0}
+
+    async def do(self, key: Hashable, coro_factory: Callable[[], Awaitable[Any]]):
+        """
+        Runs `coro_factory()` once per key at a time and returns its result to every caller.
+
+        Args:
+            key (Hashable): Identity of the call.
+            coro_factory (Callable): Zero-argument callable returning the coroutine to run.
+
+        Returns:
+            The result of the shared call. Exceptions are propagated to every waiter.
+
+        Raises:
+            asyncio.CancelledError: When this caller is cancelled (e.g. by `asyncio.wait_for`).
+                If it was the last caller waiting, the call is cancelled and awaited first, so a
+                timeout bounds the underlying work and not only the wait.
+        """
+        scoped = (id(asyncio.get_running_loop()), key)
+        task = self._inflight.get(scoped)
+        if task is None:
+            self.stats['calls'] += 1
+            task = asyncio.ensure_future(coro_factory())
+            self._inflight[scoped] = task
+            task.add_done_callback(lambda t: self._forget(scoped, t))
+        else:
+            self.stats['shared'] += 1
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shield so one waiter being cancelled does not cancel the call for the others.
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                # Callers arriving while the call winds down start a fresh one.
+                self._forget(scoped, task)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _forget(self, scoped: tuple, task: asyncio.Task) -> None:
+        if self._inflight.get(scoped) is task:
+            del self._inflight[scoped]
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+
+# Process-wide group shared by the tool decorators.
+flight_group = SingleFlight()
+
+
+def single_flight(key_builder: Optional[Callable[..., Hashable]] = None, group: Optional[SingleFlight] = None):
+    """
+    Decorator coalescing concurrent calls of an async function with equal arguments.
+
+    Args:
+        key_builder (Callable, optional): Builds the coalescing key from the call arguments.
+            Defaults to the positional and keyword arguments themselves.
+        group (SingleFlight, optional): Group to register calls in. Defaults to `flight_group`.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if key_builder is not None:
+                key = key_builder(*args, **kwargs)
+            else:
+                key = (args, tuple(sorted(kwargs.items())))
+            return await (group or flight_group).do((name, key), lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def normalize_query(query: str, *args, **kwargs) -> tuple:
+    """
+    Key builder for free-text searches: case and whitespace differences share one call.
+    """
+    return (' '.join(str(query).lower().split()), args, tuple(sorted(kwargs.items())))
@@ -0,0 +1,212 @@
+"""
+This module classifies research questions locally, so routing usually needs no LLM call. A small
+finance/general keyword and ticker lexicon feeds a linear (softmax) model over hashed word
+unigrams and bigrams, trained at startup on the hand-labelled reference questions in
+`query_labels.jsonl`.
+Confident predictions are used directly; uncertain ones fall back to the LLM classifier.
+
+    python -m src.workflow.fast_classifier "How did Tesla shares react to earnings?"
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..config.lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+LABELS = ('finance', 'general', 'finance and general')
+LABELS_PATH = Path(__file__).with_name('query_labels.jsonl')
+# The local path is skipped entirely when disabled; below the confidence the LLM decides.
+FAST_CLASSIFIER = os.getenv('FAST_CLASSIFIER', 'true').lower() in ('1', 'true', 'yes')
+FAST_CLASSIFIER_CONFIDENCE = float(os.getenv('FAST_CLASSIFIER_CONFIDENCE', 0.7))
+
+FINANCE_TERMS = frozenset("""
+    stock stocks share shares shareholder shareholders equity equities earnings eps revenue revenues
+    profit profits profitable margin margins dividend dividends valuation valued overvalued undervalued
+    invest investing investment investments investor investors portfolio portfolios etf etfs fund funds
+    index bond bonds treasury treasuries yield yields ipo market markets nasdaq nyse dow s&p futures
+    options inflation recession fed rates rate bank banks banking price prices trading traded volume
+    analyst analysts rating ratings buy sell bullish bearish rally selloff volatility volatile hedge
+    crypto bitcoin ethereum currency dollar euro yen forex commodity commodities oil gold lithium
+    quarter quarterly guidance forecast financial financials cash debt capex sec 10-k 10-q
+    mortgage reit reits beta gainers losers insurance economy economic gdp cpi jobs payrolls
+""".split())
+FINANCE_PHRASES = ('market cap', 'price target', 'interest rate', 'balance sheet', 'cash flow',
+                   'free cash flow', 'p/e', 'expense ratio', 'short interest', 'stock split', 'funding round')
+GENERAL_TERMS = frozenset("""
+    science scientific history historical health symptoms disease diseases medicine drug drugs vaccine
+    climate weather hurricane wildfire wildfires drought heatwave environment environmental space mars
+    telescope physics biology chemistry movie movies film game games music book books art sport sports
+    olympics football election policy law regulation regulations safety war travel tourism food diet
+    features feature reviews technology explain works learn people life community communities
+    teenagers viewers gamers city research discovery breakthroughs benefits
+""".split())
+CASHTAG = re.compile(r'\$[A-Za-z]{1,5}\b')
+EXCHANGE_TICKER = re.compile(r'\b(?:NYSE|NASDAQ|AMEX|LSE|TSX)\s*:\s*[A-Z][A-Z.\-]{0,5}\b')
+TOKEN = re.compile(r"[a-z0-9$&/.\-']+")
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.strip(".'-") for token in TOKEN.findall(text.lower()) if token.strip(".'-")]
+
+
+def lexicon_cues(text: str) -> Dict[str, int]:
+    """
+    Counts finance terms, general-topic terms and ticker mentions ($AAPL, NASDAQ: AAPL) in `text`.
+    """
+    words = tokenize(text)
+    lowered = text.lower()
+    return {
+        'finance': sum(word in FINANCE_TERMS for word in words) + sum(phrase in lowered for phrase in FINANCE_PHRASES),
+        'general': sum(word in GENERAL_TERMS for word in words),
+        'ticker': len(CASHTAG.findall(text)) + len(EXCHANGE_TICKER.findall(text)),
+    }
+
+
+@functools.lru_cache(maxsize=65536)
+def _bucket(feature: str, dimensions: int) -> int:
+    digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % dimensions
+
+
+class FastQueryClassifier:
+    """
+    Lexicon plus hashed n-gram softmax classifier over the three query types.
+
+    Args:
+        examples: (question, label) pairs to train on. Defaults to `query_labels.jsonl`.
+        dimensions (int): Size of the hashed feature space.
+        threshold (float): Minimum probability for a prediction to be used without the LLM.
+    """
+
+    def __init__(self, examples: Optional[Sequence[Tuple[str, str]]] = None, dimensions: int = 4096,
+                 threshold: Optional[float] = None, epochs: int = 300, learning_rate: float = 2.0,
+                 l2: float = 1e-4) -> None:
+        self.examples = examples
+        self.dimensions = dimensions
+        self.threshold = FAST_CLASSIFIER_CONFIDENCE if threshold is None else threshold
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.weights = None
+        self.bias = None
+        self._lock = threading.Lock()
+        self.stats = {'local': 0, 'fallback': 0}
+
+    def features(self, text: str) -> Dict[int, float]:
+        """
+        Maps a question to L2-normalized hashed unigram, bigram and lexicon features.
+        """
+        words = tokenize(text)
+        cues = lexicon_cues(text)
+        names = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        names += ['__finance__'] * cues['finance'] + ['__general__'] * cues['general'] + ['__ticker__'] * cues['ticker']
+        if cues['finance'] or cues['ticker']:
+            names.append('__general_and_finance__' if cues['general'] else '__finance_only__')
+        else:
+            names.append('__no_finance__')
+        counts: Dict[int, float] = {}
+        for name in names:
+            index = _bucket(name, self.dimensions)
+            counts[index] = counts.get(index, 0.0) + 1.0
+        norm = sum(value * value for value in counts.values()) ** 0.5
+        return {index: value / norm for index, value in counts.items()}
+
+    def fit(self, examples: Optional[Iterable[Tuple[str, str]]] = None) -> 'FastQueryClassifier':
+        """
+        Trains the model by full-batch gradient descent on (question, label) pairs.
+        """
+        examples = list(examples if examples is not None else (self.examples or load_examples()))
+        rows = [self.features(question) for question, _ in examples]
+        # Train only on the hashed columns the examples use; the others keep zero weight.
+        columns = sorted({index for features in rows for index in features})
+        position = {index: i for i, index in enumerate(columns)}
+        matrix = np.zeros((len(examples), len(columns)))
+        targets = np.zeros((len(examples), len(LABELS)))
+        for row, (features, (_, label)) in enumerate(zip(rows, examples)):
+            for index, value in features.items():
+                matrix[row, position[index]] = value
+            targets[row, LABELS.index(label)] = 1.0
+        weights = np.zeros((len(columns), len(LABELS)))
+        bias = np.zeros(len(LABELS))
+        for _ in range(self.epochs):
+            gradient = _softmax(matrix @ weights + bias) - targets
+            weights -= self.learning_rate * (matrix.T @ gradient / len(examples) + self.l2 * weights)
+            bias -= self.learning_rate * gradient.mean(axis=0)
+        self.weights = np.zeros((self.dimensions, len(LABELS)))
+        self.weights[columns] = weights
+        self.bias = bias
+        return self
+
+    def warm(self) -> None:
+        """
+        Trains the model if it has not been trained yet.
+        """
+        if self.weights is None:
+            with self._lock:
+                if self.weights is None:
+                    self.fit()
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """
+        Returns the most likely label for `text` and its probability.
+        """
+        self.warm()
+        features = self.features(text)
+        indices = list(features)
+        scores = np.asarray(list(features.values())) @ self.weights[indices] + self.bias
+        probabilities = _softmax(scores)
+        best = int(probabilities.argmax())
+        return LABELS[best], float(probabilities[best])
+
+    def classify(self, text: str, symbols: Optional[Sequence[str]] = None) -> Optional[str]:
+        """
+        Returns the label when the prediction is confident, or None to defer to the LLM.
+
+        A question naming a ticker or company never yields a confident 'general': `symbols` are
+        the instruments already resolved from it ("How is AAPL doing?", "Tesla news"), which the
+        lexicon alone does not see.
+        """
+        label, confidence = self.predict(text)
+        names_instrument = bool(symbols) or lexicon_cues(text)['ticker']
+        if confidence < self.threshold or (label == 'general' and names_instrument):
+            self.stats['fallback'] += 1
+            return None
+        self.stats['local'] += 1
+        return label
+
+
+def _softmax(scores: 'np.ndarray') -> 'np.ndarray':
+    shifted = np.exp(scores - scores.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+def load_examples(path: Optional[Path] = None) -> List[Tuple[str, str]]:
+    """
+    Reads (question, label) pairs from a JSON-lines file of {"question": ..., "label": ...}.
+    """
+    examples = []
+    with open(path or LABELS_PATH, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                examples.append((row['question'], row['label']))
+    return examples
+
+
+# Process-wide classifier used by the classification node; trained on first use.
+fast_classifier = FastQueryClassifier()
+
+
+if __name__ == '__main__':
+    for question in sys.argv[1:]:
+        label, confidence = fast_classifier.predict(question)
+        print(f"{label:<20} {confidence:.2f}  {question}")
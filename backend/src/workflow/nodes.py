@@ -3,14 +3,174 @@ from ..tools.search_sys.bing import bing
 from ..tools.google.google_finance import google_finance
 from ..tools.search_sys.yfinance  import main
 from .state import ResearchState
-from ..config.model import Model
-from ..config.str_outputs import QueryClassifier
+from .stream import REPORT_MODES
+from ..config.llm_cache import llm_cache
+from ..config.llm_scheduler import llm_scheduler
+from ..config.telemetry import metrics, record_llm_call
+from .fast_classifier import FAST_CLASSIFIER, fast_classifier
+from ..config.str_outputs import FusedReport, QueryClassifier
 from ..tools.reddit_comments import reddit
+from ..tools.search_sys.price_store import price_store
+from ..tools.search_sys.indicators import compute_indicators, format_indicator_table
+from ..tools.search_sys.symbols import symbol_directory, google_quote
+from ..tools.compaction import render_items, compact_payload, token_budget, estimate_tokens
+from ..tools.result_merge import label_responses, merge_results, results_for
+from ..tools.google.google_search import ENGINES as GOOGLE_ENGINES
+from ..tools.search_sys.bing import ENGINES as BING_ENGINES
 import asyncio
+import os
+import re
+from langgraph.config import get_config, get_stream_writer
+from .registry import graph_registry
 from ..config.setup_logs import logger
+from ..config.lazy_imports import lazy_import
 
+pd = lazy_import('pandas')
 
-llm=Model().set_model()
+
+TICKER_PATTERN = re.compile(r"^[A-Z][A-Z.\-]{0,5}$")
+
+# Resolved symbols queried on Google Finance, one request each.
+GOOGLE_FINANCE_MAX_SYMBOLS = int(os.getenv('GOOGLE_FINANCE_MAX_SYMBOLS', 3))
+
+# Report mode of runs that do not select one (see stream.REPORT_MODES).
+REPORT_MODE = os.getenv('REPORT_MODE', 'chain')
+
+# Search and finance branches started after classification.
+SOURCE_BRANCHES = ["google_search", "bing_search", "reddit_search", "yahoo_finance_search", "google_finance_search"]
+
+# Branches each query type needs; other types (mixed or unclassified) run every branch.
+QUERY_BRANCHES = {
+    "finance": ["yahoo_finance_search", "google_finance_search", "reddit_search"],
+    "general": ["google_search", "bing_search"],
+}
+
+
+def router(state: ResearchState):
+    """
+    Chooses the source branches to run for the classified query type.
+    """
+    query_type = (state.get("query_type") or "").strip().lower()
+    return QUERY_BRANCHES.get(query_type, SOURCE_BRANCHES)
+
+
+def stream_writer():
+    """
+    Returns the graph's custom stream writer, or None outside a graph run.
+    """
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return None
+
+
+def configured_model() -> str:
+    """
+    Returns the model name bound to the running graph, or the registry default outside a run.
+    """
+    try:
+        configured = get_config().get("configurable", {}).get("model")
+    except RuntimeError:
+        configured = None
+    return configured or graph_registry.default_model
+
+
+def configured_report_mode() -> str:
+    """
+    Returns the report mode bound to the running graph, or REPORT_MODE when unset or unknown.
+    """
+    try:
+        configured = get_config().get("configurable", {}).get("report_mode")
+    except RuntimeError:
+        configured = None
+    return configured if configured in REPORT_MODES else REPORT_MODE
+
+
+def report_route(aggregator: str):
+    """
+    Returns the routing function after a source analysis: its aggregator in chain mode, the
+    fused report node in fused mode.
+    """
+    def route(state: ResearchState):
+        return "fused_report" if configured_report_mode() == "fused" else aggregator
+    return route
+
+
+def question_entities(question: str):
+    """
+    Returns the symbols a question is about; semantic cache hits require the same ones.
+    """
+    return [match["symbol"] for match in symbol_directory.resolve(question)] if question else []
+
+
+async def invoke_llm(prompt: str, node: str, question: str = None, stream: bool = False) -> str:
+    """
+    Invokes the model for a node through the LLM cache and returns the response text.
+
+    Args:
+        prompt (str): The full prompt.
+        node (str): Name of the calling graph node, part of the cache key.
+        question (str, optional): The user question, for the semantic cache tier.
+        stream (bool): Emit the response to the graph's custom stream as {"type": "token"}
+            events while it is generated. A cached response is emitted as a single event.
+    """
+    model_name = configured_model()
+    llm = graph_registry.llm(model_name)
+    write = stream_writer() if stream else None
+    generated = False
+    emitted = False
+    usage = None
+
+    async def call():
+        nonlocal usage, emitted
+        if write is None:
+            response = await llm.ainvoke(prompt)
+            usage = getattr(response, "usage_metadata", None)
+            return response.content
+        parts = []
+        async for chunk in llm.astream(prompt):
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            if chunk.content:
+                parts.append(chunk.content)
+                emitted = True
+                write({"type": "token", "node": node, "text": chunk.content})
+        return ''.join(parts)
+
+    async def generate():
+        nonlocal generated
+        generated = True
+        # Admitted by the process-wide scheduler, which retries rate-limited calls; a stream cut
+        # off after its first tokens is not retried, as the client would receive the text twice.
+        return await llm_scheduler.run(node, estimate_tokens(prompt), call, retryable=lambda: not emitted)
+
+    text = await llm_cache.fetch(model_name, node, prompt, generate, question=question,
+                                 entities=question_entities(question))
+    if generated:
+        # Models that report no usage are counted with the chars/4 estimate.
+        usage = usage or {}
+        output_tokens = usage.get("output_tokens") or estimate_tokens(text or "")
+        llm_scheduler.charge(output_tokens)
+        record_llm_call(node, model_name, cached=False,
+                        input_tokens=usage.get("input_tokens") or estimate_tokens(prompt),
+                        output_tokens=output_tokens)
+    else:
+        record_llm_call(node, model_name, cached=True)
+    if write is not None and not generated and text:
+        write({"type": "token", "node": node, "text": text})
+    return text
+
+
+def drop_price_history(results):
+    """
+    Removes raw price history (DataFrames and 'history' entries) from tool results.
+    """
+    if isinstance(results, (pd.DataFrame, pd.Series)):
+        return None
+    if isinstance(results, dict):
+        return {key: drop_price_history(value) for key, value in results.items() if key != 'history'}
+    if isinstance(results, (list, tuple)):
+        return [drop_price_history(value) for value in results]
+    return results
 
 
 async def init_search(state: ResearchState):
@@ -20,17 +180,23 @@ async def init_search(state: ResearchState):
         raise ValueError("User question not found in the state.")
     return {"user_question": user_question}
 
-async def classify_question_node(state: ResearchState):
+async def extract_symbols_node(state: ResearchState):
     """
-    Classifies the user's question as either 'finance' or 'general'.
+    Resolves the companies and tickers named in the question to exchange symbols for the
+    finance tools.
     """
-    logger.info("---CLASSIFYING USER QUESTION---")
-    user_question = state["user_question"]
+    logger.info("---EXTRACTING SYMBOLS---")
+    matches = symbol_directory.resolve(state["user_question"])
+    symbols = [match["symbol"] for match in matches]
+    logger.info(f"Resolved symbols: {symbols}")
+    return {"symbols": symbols, "symbol_matches": matches}
 
-    if not user_question:
-        raise ValueError("User question not found in the state.")
-    
-    prompt = f"""
+
+def classification_prompt(user_question: str) -> str:
+    """
+    Builds the LLM prompt classifying a question as 'finance', 'general' or 'finance and general'.
+    """
+    return f"""
     You are an advanced language model specializing in categorizing user queries for a multi-domain research assistant platform.
 
     Your task: Carefully analyze the provided user query and classify it into one of the following predefined categories:
@@ -46,21 +212,63 @@ async def classify_question_node(state: ResearchState):
 
     User Query: "{user_question}"
     """
-    
+
+
+async def classify_question_node(state: ResearchState):
+    """
+    Classifies the user's question as 'finance', 'general' or 'finance and general'.
+
+    The local fast classifier answers confident cases without a model call; the LLM
+    classifies the rest.
+    """
+    logger.info("---CLASSIFYING USER QUESTION---")
+    user_question = state["user_question"]
+
+    if not user_question:
+        raise ValueError("User question not found in the state.")
+
+    if FAST_CLASSIFIER:
+        # Questions naming a resolved symbol are never 'general' locally
+        query_type = fast_classifier.classify(user_question, symbols=state.get("symbols"))
+        if query_type is not None:
+            logger.info(f"Query classified locally as: {query_type}")
+            metrics.inc('research_query_classifications_total', path='local', query_type=query_type)
+            return {"query_type": query_type}
+
+    prompt = classification_prompt(user_question)
     try:
-        # Create a structured output LLM
-        structured_llm = llm.with_structured_output(QueryClassifier)
-        
+        # Structured output client, kept warm by the registry
+        model_name = configured_model()
+        structured_llm = graph_registry.structured_llm(QueryClassifier, model_name)
+
+        classified = False
+
+        async def classify():
+            nonlocal classified
+            classified = True
+            classification_result = await llm_scheduler.run(
+                "classify_question", estimate_tokens(prompt), lambda: structured_llm.ainvoke(prompt))
+            return classification_result.query_type
+
         # Invoke the LLM
-        classification_result = await structured_llm.ainvoke(prompt)
+        query_type = await llm_cache.fetch(model_name, "classify_question", prompt, classify)
+        if classified:
+            record_llm_call("classify_question", model_name, cached=False,
+                            input_tokens=estimate_tokens(prompt), output_tokens=estimate_tokens(query_type or ""))
+        else:
+            record_llm_call("classify_question", model_name, cached=True)
         
-        logger.info(f"Query classified as: {classification_result.query_type}")
+        logger.info(f"Query classified as: {query_type}")
+        metrics.inc('research_query_classifications_total', path='llm', query_type=query_type)
         
         # Update the state
-        return {"query_type": classification_result.query_type}
+        return {"query_type": query_type}
         
     except Exception as e:
-        logger.error(f"Error during classification: {e}")
+        # Unclassified questions are routed to every source branch
+        logger.error(f"Error during classification, searching every source: {e}")
+        metrics.inc('research_query_classifications_total', path='error', query_type='none')
+        return {"query_type": None}
 
 async def google_search_node(state: ResearchState):
     """
@@ -86,54 +294,104 @@ async def reddit_search_node(state: ResearchState):
     Performs a Reddit search and updates the state with the results.
     """
     logger.info("---PERFORMING REDDIT SEARCH---")
-    reddit_results = await reddit() # Get all comments from cache
+    # Only the cached comments most relevant to the question
+    reddit_results = await reddit(state["user_question"])
     return {"reddit_search_results": reddit_results}
 
 async def yahoo_finance_node(state: ResearchState):
     """
-    Performs a Yahoo Finance search (using google_finance tool) and updates the state with the results.
+    Fetches Yahoo Finance data for the resolved symbols and updates the state with the results.
     """
     logger.info("---PERFORMING YAHOO FINANCE SEARCH---")
-    query = state["user_question"]
-    yahoo_results = await main(query)
+    symbols = state.get("symbols") or []
+    if not symbols:
+        logger.info("No symbols resolved; skipping Yahoo Finance")
+        return {"yahoo_finance_results": None}
+    if len(symbols) == 1:
+        yahoo_results = await main(symbol=symbols[0])
+    else:
+        yahoo_results = await main(symbols=" ".join(symbols))
     return {"yahoo_finance_results": yahoo_results}
 
-async def google_search_node(state:ResearchState):
+async def google_finance_search(state:ResearchState):
     """
-    performs search using google finance tool
+    Fetches Google Finance quotes for the resolved symbols, keyed by quote id ('AAPL:NASDAQ').
     """
-    logger.info("---PERFORMING GOOGLE SEARCH---")
-    query = state["user_question"]
-    google_results = await google_search(query)
-    return {"google_search_results": google_results}
+    logger.info("---PERFORMING GOOGLE FINANCE SEARCH---")
+    matches = state.get("symbol_matches") or []
+    if not matches:
+        logger.info("No symbols resolved; skipping Google Finance")
+        return {"google_finance_results": None}
+    quotes = [google_quote(match) for match in matches[:GOOGLE_FINANCE_MAX_SYMBOLS]]
+    results = await asyncio.gather(*(google_finance(quote) for quote in quotes), return_exceptions=True)
+    google_finance_results = {}
+    for quote, result in zip(quotes, results):
+        if isinstance(result, Exception):
+            logger.error(f"Google Finance lookup failed for {quote}: {result}")
+        elif result:
+            google_finance_results[quote] = result
+    return {"google_finance_results": google_finance_results or None}
+
+async def finance_features_node(state: ResearchState):
+    """
+    Computes technical indicators for the requested symbols so the finance analysis gets a
+    compact table of precomputed facts instead of raw price bars.
+    """
+    logger.info("---COMPUTING FINANCE FEATURES---")
+    symbols = state.get("symbols") or []
+    if not symbols:
+        candidate = state["user_question"].strip().upper()
+        if TICKER_PATTERN.match(candidate):
+            symbols = [candidate]
+    if not symbols:
+        return {"finance_features": ""}
+    try:
+        histories = await price_store.histories(symbols, period='1y')
+        summary = compute_indicators(histories)
+    except Exception as e:
+        logger.error(f"Error computing finance features for {symbols}: {e}")
+        return {"finance_features": ""}
+    return {"finance_features": format_indicator_table(summary)}
+
+async def merge_search_results_node(state: ResearchState):
+    """
+    Merges the Google and Bing responses into one ranked, deduplicated result set. Each result
+    is owned by exactly one of the two analysis nodes, so no article is analyzed twice.
+    """
+    logger.info("---MERGING SEARCH RESULTS---")
+    responses = label_responses(state.get("google_search_results"), GOOGLE_ENGINES)
+    responses += label_responses(state.get("bing_search_results"), BING_ENGINES)
+    merged = merge_results(responses)
+    logger.info(f"Merged {len(merged)} unique results from {len(responses)} responses")
+    return {"merged_search_results": merged}
 
 async def google_search_analysis_node(state: ResearchState):
     logger.info("---ANALYZING GOOGLE SEARCH RESULTS---")
     user_question = state["user_question"]
-    google_results = state["google_search_results"]
+    google_results, _ = render_items(results_for(state.get("merged_search_results"), "google"), token_budget("google_search_analysis"))
     prompt = f"""Analyze the following Google search results for the query: {user_question}
 
     Search Results:
-    {google_results}
+    {google_results or "No results"}
 
     Provide a detailed analysis of the Google search results.
     """
-    analysis = await llm.ainvoke(prompt)
-    return {"google_analysis": analysis.content}
+    analysis = await invoke_llm(prompt, "google_search_analysis", user_question)
+    return {"google_analysis": analysis}
 
 async def bing_search_analysis_node(state: ResearchState):
     logger.info("---ANALYZING BING SEARCH RESULTS---")
     user_question = state["user_question"]
-    bing_results = state["bing_search_results"]
+    bing_results, _ = render_items(results_for(state.get("merged_search_results"), "bing"), token_budget("bing_search_analysis"))
     prompt = f"""Analyze the following Bing search results for the query: {user_question}
 
     Search Results:
-    {bing_results}
+    {bing_results or "No results"}
 
     Provide a detailed analysis of the Bing search results.
     """
-    analysis = await llm.ainvoke(prompt)
-    return {"bing_analysis": analysis.content}
+    analysis = await invoke_llm(prompt, "bing_search_analysis", user_question)
+    return {"bing_analysis": analysis}
 
 async def reddit_comments_analysis_node(state: ResearchState):
     logger.info("---ANALYZING REDDIT COMMENTS---")
@@ -146,27 +404,40 @@ async def reddit_comments_analysis_node(state: ResearchState):
 
     Provide a detailed analysis of the Reddit comments, focusing on sentiment, key topics, and common opinions.
     """
-    analysis = await llm.ainvoke(prompt)
-    return {"reddit_analysis": analysis.content}
+    analysis = await invoke_llm(prompt, "reddit_analysis", user_question)
+    return {"reddit_analysis": analysis}
 
 async def yahoo_finance_analysis_node(state: ResearchState):
     logger.info("---ANALYZING YAHOO FINANCE DATA---")
     user_question = state["user_question"]
-    finance_results = state["yahoo_finance_results"]
+    finance_results = state.get("yahoo_finance_results")
+    finance_features = state.get("finance_features")
+    if not (finance_results or finance_features):
+        # Nothing was fetched (no symbols resolved); skip the model call
+        return {"yahoo_finance_analysis": ""}
+    if finance_features:
+        # Precomputed indicators replace the raw price bars
+        finance_results = drop_price_history(finance_results)
+    finance_results = compact_payload(finance_results, token_budget("yahoo_finance_analysis"))
     prompt = f"""Analyze the following Yahoo Finance data for the query: {user_question}
 
+    Technical Indicators:
+    {finance_features or "Not available"}
+
     Yahoo Finance Data:
     {finance_results}
 
     Provide a detailed analysis of the financial data, focusing on key metrics, trends, and potential implications.
     """
-    analysis = await llm.ainvoke(prompt)
-    return {"yahoo_finance_analysis": analysis.content}
+    analysis = await invoke_llm(prompt, "yahoo_finance_analysis", user_question)
+    return {"yahoo_finance_analysis": analysis}
 
 async def google_finance_analysis_node(state: ResearchState):
     logger.info("---ANALYZING GOOGLE FINANCE DATA---")
     user_question = state["user_question"]
-    finance_results = state["google_finance_results"]
+    if not state.get("google_finance_results"):
+        return {"google_finance_analysis": ""}
+    finance_results = compact_payload(state["google_finance_results"], token_budget("google_finance_analysis"))
     prompt = f"""Analyze the following Google Finance data for the query: {user_question}
 
     Google Finance Data:
@@ -174,14 +445,23 @@ async def google_finance_analysis_node(state: ResearchState):
 
     Provide a detailed analysis of the financial data, focusing on key metrics, trends, and potential implications.
     """
-    analysis = await llm.ainvoke(prompt)
-    return {"google_finance_analysis": analysis.content}
+    analysis = await invoke_llm(prompt, "google_finance_analysis", user_question)
+    return {"google_finance_analysis": analysis}
+
+def present_sections(sections):
+    """
+    Renders the (title, text) sections that have content, skipping branches that did not run.
+    """
+    return "\n\n".join(f"{title}:\n{text}" for title, text in sections if text)
+
 
 async def aggregate_analysis_node_first(state: ResearchState):
     logger.info("---AGGREGATING ALL ANALYSES---")
     user_question = state["user_question"]
     yahoo_finance_analysis = state.get("yahoo_finance_analysis", "")
     google_finance_analysis = state.get("google_finance_analysis", "")
+    if not (yahoo_finance_analysis or google_finance_analysis):
+        return {"combined_analysis_1": ""}
 
     combined_analysis = f"""
     User Question: {user_question}
@@ -195,45 +475,43 @@ async def aggregate_analysis_node_first(state: ResearchState):
     {google_finance_analysis}
     """
     
-    first_combined_search=await llm.ainvoke(input=combined_analysis)
+    first_combined_search=await invoke_llm(combined_analysis, "aggregate_finance_analysis_1", user_question)
     return {"combined_analysis_1": first_combined_search}
 
 async def aggregate_analysis_node_second(state: ResearchState):
     logger.info("---AGGREGATING ALL ANALYSES---")
-    bing_analysis = state.get("bing_analysis", "")
-    reddit_analysis = state.get("reddit_analysis", "")
+    sections = present_sections([
+        ("Google Search Analysis", state.get("google_analysis", "")),
+        ("Bing Search Analysis", state.get("bing_analysis", "")),
+        ("Reddit Comments Analysis", state.get("reddit_analysis", "")),
+    ])
+    if not sections:
+        return {"combined_analysis_2": ""}
     combined_analysis = f"""
-
-    Bing Search Analysis:
-    {bing_analysis}
-
-    Reddit Comments Analysis:
-    {reddit_analysis}
+    {sections}
     """
 
-    second_combined_search=await llm.ainvoke(input=combined_analysis)
+    second_combined_search=await invoke_llm(combined_analysis, "aggregate_general_analysis_2", state.get("user_question"))
     return {"combined_analysis_2": second_combined_search}
 
 async def synthesize_report_node(state: ResearchState):
     logger.info("---SYNTHESIZING REPORT---")
     user_question = state["user_question"]
     
-    # Get the two separate analyses from the state
-    analysis_1 = state.get("combined_analysis_1", "")
-    analysis_2 = state.get("combined_analysis_2", "")
+    # Only the analyses of the branches routed for this question are present
+    sections = present_sections([
+        ("Combined Financial Analysis", state.get("combined_analysis_1", "")),
+        ("Combined Web/Social Analysis", state.get("combined_analysis_2", "")),
+    ])
 
     prompt = f"""Based on the following combined analysis for the query: {user_question}, synthesize a comprehensive report.
 
-    Combined Financial Analysis:
-    {analysis_1}
-
-    Combined Web/Social Analysis:
-    {analysis_2}
+    {sections or "No source analysis is available; answer from general knowledge and say so."}
 
     The report should be well-structured, insightful, and address the user's question thoroughly.
     """
-    synthesized_report = await llm.ainvoke(prompt)
-    return {"synthesized_answer": synthesized_report.content}
+    synthesized_report = await invoke_llm(prompt, "synthesize_report", user_question, stream=True)
+    return {"synthesized_answer": synthesized_report}
 
 async def synthesized_report_analysis_node(state: ResearchState):
     logger.info("---ANALYZING SYNTHESIZED REPORT---")
@@ -246,8 +524,8 @@ async def synthesized_report_analysis_node(state: ResearchState):
 
     Provide a critical analysis of the report, highlighting its strengths, weaknesses, and any areas that could be improved or further investigated.
     """
-    analysis = await llm.ainvoke(prompt)
-    return {"report": analysis.content} 
+    analysis = await invoke_llm(prompt, "analyze_synthesized_report", user_question, stream=True)
+    return {"report": analysis} 
 
 async def major_highlights_node(state: ResearchState):
     logger.info("---EXTRACTING MAJOR HIGHLIGHTS---")
@@ -259,8 +537,84 @@ async def major_highlights_node(state: ResearchState):
 
     Provide a concise list of the most important points.
     """
-    highlights = await llm.ainvoke(prompt)
-    return {"major_highlights": highlights.content}
+    highlights = await invoke_llm(prompt, "extract_highlights", state.get("user_question"), stream=True)
+    return {"major_highlights": highlights}
+
+def fused_report_prompt(user_question: str, sections: str) -> str:
+    return f"""You are writing a research report for the query: {user_question}
+
+    Source analyses:
+    {sections or "No source analysis is available; answer from general knowledge and say so."}
+
+    In a single response:
+      - report: a comprehensive, well-structured synthesized answer to the query, based on the
+        source analyses above (data facts, no hallucinations).
+      - highlights: the major highlights and key takeaways, one short point per item.
+      - critique: a critical analysis of your report: its strengths, weaknesses, and any areas
+        that could be improved or further investigated.
+      - sources, links and proofs: the sources used, the links they cite, and the supporting facts.
+    """
+
+async def fused_report_node(state: ResearchState):
+    """
+    Writes the synthesized answer, highlights and critique in one structured-output call from
+    the source analyses, replacing the aggregation, synthesis, critique and highlight calls.
+
+    Falls back to a plain synthesis when the model cannot produce structured output.
+    """
+    logger.info("---GENERATING FUSED REPORT---")
+    user_question = state["user_question"]
+    sections = present_sections([
+        ("Yahoo Finance Analysis", state.get("yahoo_finance_analysis", "")),
+        ("Google Finance Analysis", state.get("google_finance_analysis", "")),
+        ("Google Search Analysis", state.get("google_analysis", "")),
+        ("Bing Search Analysis", state.get("bing_analysis", "")),
+        ("Reddit Comments Analysis", state.get("reddit_analysis", "")),
+    ])
+    prompt = fused_report_prompt(user_question, sections)
+    model_name = configured_model()
+    try:
+        structured_llm = graph_registry.structured_llm(FusedReport, model_name)
+        generated = False
+
+        async def generate():
+            nonlocal generated
+            generated = True
+            result = await llm_scheduler.run(
+                "fused_report", estimate_tokens(prompt), lambda: structured_llm.ainvoke(prompt))
+            return result.model_dump()
+
+        entities = question_entities(user_question)
+        fused = await llm_cache.fetch(model_name, "fused_report", prompt, generate, question=user_question,
+                                      entities=entities)
+        if not isinstance(fused, dict) or not fused.get("report"):
+            # An entry of another shape (e.g. from an older version) is regenerated and replaced
+            fused = await generate()
+            await llm_cache.set(model_name, "fused_report", prompt, fused, question=user_question,
+                                entities=entities)
+    except Exception as e:
+        logger.error(f"Fused report failed, falling back to a plain synthesis: {e}")
+        # Cached apart from the structured output, under its own node name
+        synthesized_report = await invoke_llm(prompt, "fused_report_text", user_question, stream=True)
+        return {"synthesized_answer": synthesized_report}
+
+    if generated:
+        llm_scheduler.charge(estimate_tokens(str(fused)))
+        record_llm_call("fused_report", model_name, cached=False,
+                        input_tokens=estimate_tokens(prompt), output_tokens=estimate_tokens(str(fused)))
+    else:
+        record_llm_call("fused_report", model_name, cached=True)
+
+    # Structured output arrives whole; it is emitted as one token event, like a cached reply.
+    write = stream_writer()
+    if write is not None and fused["report"]:
+        write({"type": "token", "node": "fused_report", "text": fused["report"]})
+    return {
+        "synthesized_answer": fused["report"],
+        "major_highlights": "\n".join(f"- {highlight}" for highlight in fused.get("highlights", [])),
+        "report": fused.get("critique", ""),
+        "structured_report": fused,
+    }
 
 async def final_report_node(state: ResearchState):
     logger.info("---GENERATING FINAL REPORT---")
@@ -268,6 +622,9 @@ async def final_report_node(state: ResearchState):
     synthesized_answer = state["synthesized_answer"]
     report_analysis = state.get("report", "") 
     major_highlights = state.get("major_highlights", "")
+    # Fused reports also list the links they cite
+    links = (state.get("structured_report") or {}).get("links") or []
+    sources = "## Sources:\n" + "\n".join(f"- {link}" for link in links) if links else ""
 
     final_report_content = f"""
     # Research Report for: {user_question}
@@ -281,6 +638,7 @@ async def final_report_node(state: ResearchState):
     ## Report Analysis:
     {report_analysis}
 
+    {sources}
     ---
     This report was generated by an AI research agent.
     """
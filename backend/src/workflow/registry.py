@@ -0,0 +1,94 @@
+"""
+This module keeps the compiled research graph and the LLM clients warm for the lifetime of the
+process. Each model configuration is compiled once and shared by every invocation: a compiled
+graph without a checkpointer holds no per-run state, so concurrent runs can use it safely.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from ..config.model import DEFAULT_MODEL, Model
+
+
+class GraphRegistry:
+    """
+    Compiles the workflow once per model name and holds one client per model.
+
+    The model name is bound into the compiled graph's config (`configurable.model`), and the
+    nodes resolve their client through `llm()` at call time.
+    """
+
+    def __init__(self, default_model: Optional[str] = None) -> None:
+        self.default_model = default_model or DEFAULT_MODEL
+        self._graphs: Dict[str, Any] = {}
+        self._models: Dict[str, Any] = {}
+        self._structured: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        self.stats = {'compiles': 0, 'graph_hits': 0, 'clients': 0}
+
+    def graph(self, model: Optional[str] = None):
+        """
+        Returns the compiled workflow for `model`, compiling it on first use.
+        """
+        model = model or self.default_model
+        graph = self._graphs.get(model)
+        if graph is not None:
+            self.stats['graph_hits'] += 1
+            return graph
+        with self._lock:
+            graph = self._graphs.get(model)
+            if graph is None:
+                from .setup_workflow import create_workflow
+                graph = create_workflow().with_config(configurable={'model': model})
+                self._graphs[model] = graph
+                self.stats['compiles'] += 1
+        return graph
+
+    def llm(self, model: Optional[str] = None):
+        """
+        Returns the warm client for `model`, creating it on first use.
+        """
+        model = model or self.default_model
+        client = self._models.get(model)
+        if client is None:
+            with self._lock:
+                client = self._models.get(model)
+                if client is None:
+                    client = Model(model).set_model()
+                    if client is None:
+                        raise RuntimeError(f"Model '{model}' could not be initialized")
+                    self._models[model] = client
+                    self.stats['clients'] += 1
+        return client
+
+    def structured_llm(self, schema, model: Optional[str] = None):
+        """
+        Returns the client for `model` bound to a structured output schema.
+        """
+        key = (model or self.default_model, schema)
+        runnable = self._structured.get(key)
+        if runnable is None:
+            runnable = self._structured[key] = self.llm(key[0]).with_structured_output(schema)
+        return runnable
+
+    def warm(self, model: Optional[str] = None):
+        """
+        Compiles the graph, creates the client for `model` and trains the local query
+        classifier ahead of the first request.
+        """
+        from .fast_classifier import FAST_CLASSIFIER, fast_classifier
+        if FAST_CLASSIFIER:
+            fast_classifier.warm()
+        self.llm(model)
+        return self.graph(model)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+            self._models.clear()
+            self._structured.clear()
+            self.stats = {'compiles': 0, 'graph_hits': 0, 'clients': 0}
+
+
+# Process-wide registry used by the API and the workflow nodes.
+graph_registry = GraphRegistry()
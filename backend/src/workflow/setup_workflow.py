@@ -2,13 +2,17 @@
 
 from langgraph.graph import StateGraph, END
 from .state import ResearchState
+from ..config.telemetry import instrument_node
 from .nodes import (
     init_search,
+    extract_symbols_node,
     classify_question_node, 
     google_search_node,
     bing_search_node,
+    merge_search_results_node,
     reddit_search_node,
     yahoo_finance_node,
+    finance_features_node,
     google_finance_search,     
     google_search_analysis_node,
     bing_search_analysis_node,
@@ -20,8 +24,11 @@ from .nodes import (
     synthesize_report_node,
     synthesized_report_analysis_node,
     major_highlights_node,
+    fused_report_node,
     final_report_node,
-    router
+    router,
+    report_route,
+    SOURCE_BRANCHES
 )
 
 def create_workflow():
@@ -30,72 +37,90 @@ def create_workflow():
     """
     workflow = StateGraph(ResearchState)
 
+    def add_node(name, node, **kwargs):
+        # Every node is timed and traced under its graph name.
+        workflow.add_node(name, instrument_node(name, node), **kwargs)
+
     # --- 1. Add ALL nodes to the graph ---
-    workflow.add_node("init_search", init_search)
-    workflow.add_node("classify_question", classify_question_node)
+    add_node("init_search", init_search)
+    add_node("extract_symbols", extract_symbols_node)
+    add_node("classify_question", classify_question_node)
     
     # General Search Branch
-    workflow.add_node("google_search", google_search_node)
-    workflow.add_node("bing_search", bing_search_node)
-    workflow.add_node("google_search_analysis", google_search_analysis_node)
-    workflow.add_node("bing_search_analysis", bing_search_analysis_node)
-    workflow.add_node("aggregate_general_analysis_2", aggregate_analysis_node_second)
+    add_node("google_search", google_search_node)
+    add_node("bing_search", bing_search_node)
+    add_node("merge_search_results", merge_search_results_node)
+    add_node("google_search_analysis", google_search_analysis_node)
+    add_node("bing_search_analysis", bing_search_analysis_node)
+    add_node("aggregate_general_analysis_2", aggregate_analysis_node_second, defer=True)
 
     # Finance Search Branch
-    workflow.add_node("google_finance_search", google_finance_search)
-    workflow.add_node("yahoo_finance_search", yahoo_finance_node)
-    workflow.add_node("reddit_search", reddit_search_node)
-    workflow.add_node("google_finance_analysis", google_finance_analysis_node)
-    workflow.add_node("yahoo_finance_analysis", yahoo_finance_analysis_node)
-    workflow.add_node("reddit_analysis", reddit_comments_analysis_node)
-    workflow.add_node("aggregate_finance_analysis_1", aggregate_analysis_node_first)
+    add_node("google_finance_search", google_finance_search)
+    add_node("yahoo_finance_search", yahoo_finance_node)
+    add_node("finance_features", finance_features_node)
+    add_node("reddit_search", reddit_search_node)
+    add_node("google_finance_analysis", google_finance_analysis_node)
+    add_node("yahoo_finance_analysis", yahoo_finance_analysis_node)
+    add_node("reddit_analysis", reddit_comments_analysis_node)
+    add_node("aggregate_finance_analysis_1", aggregate_analysis_node_first, defer=True)
 
     # Final Reporting Branch
-    workflow.add_node("synthesize_report", synthesize_report_node)
-    workflow.add_node("analyze_synthesized_report", synthesized_report_analysis_node)
-    workflow.add_node("extract_highlights", major_highlights_node)
-    workflow.add_node("generate_final_report", final_report_node)
+    add_node("synthesize_report", synthesize_report_node, defer=True)
+    add_node("analyze_synthesized_report", synthesized_report_analysis_node)
+    add_node("extract_highlights", major_highlights_node)
+    add_node("fused_report", fused_report_node, defer=True)
+    add_node("generate_final_report", final_report_node, defer=True)
 
     # --- 2. Define the graph flow ---
     
     # Entry point
     workflow.set_entry_point("init_search")
     
-    # Run classifier right after init
-    workflow.add_edge("init_search", "classify_question")
+    # Resolve the question's symbols, then classify it
+    workflow.add_edge("init_search", "extract_symbols")
+    workflow.add_edge("extract_symbols", "classify_question")
 
-    workflow.add_conditional_edges("classify_question", router)
+    # Only the source branches needed for the query type are started. The aggregators and
+    # synthesis are deferred: each runs once no other work is pending, with whichever of its
+    # inputs were produced, instead of waiting on branches that were never started.
+    workflow.add_conditional_edges("classify_question", router, SOURCE_BRANCHES)
 
     # --- 4. Define the "Finance" branch flow ---
     workflow.add_edge("google_finance_search", "google_finance_analysis")
-    workflow.add_edge("yahoo_finance_search", "yahoo_finance_analysis")
+    workflow.add_edge("yahoo_finance_search", "finance_features")
+    workflow.add_edge("finance_features", "yahoo_finance_analysis")
     workflow.add_edge("reddit_search", "reddit_analysis")
     
-    # Join all finance analyses at the first aggregator
-    workflow.add_edge("google_finance_analysis", "aggregate_finance_analysis_1")
-    workflow.add_edge("yahoo_finance_analysis", "aggregate_finance_analysis_1")
-    workflow.add_edge("reddit_analysis", "aggregate_finance_analysis")
+    # Join all finance analyses at the first aggregator, or at the fused report (fused mode)
+    for analysis in ["google_finance_analysis", "yahoo_finance_analysis"]:
+        workflow.add_conditional_edges(analysis, report_route("aggregate_finance_analysis_1"),
+                                       ["aggregate_finance_analysis_1", "fused_report"])
 
     # --- 5. Define the "General" branch flow ---
-    workflow.add_edge("google_search", "google_search_analysis")
-    workflow.add_edge("bing_search", "bing_search_analysis")
+    # Both engines' results are merged once, then split between the two analyses
+    workflow.add_edge(["google_search", "bing_search"], "merge_search_results")
+    workflow.add_edge("merge_search_results", "google_search_analysis")
+    workflow.add_edge("merge_search_results", "bing_search_analysis")
     
-    # Join all general analyses at the second aggregator
-    workflow.add_edge("google_search_analysis", "aggregate_general_analysis_2")
-    workflow.add_edge("bing_search_analysis", "aggregate_general_analysis_2")
+    # Join all general analyses at the second aggregator, or at the fused report (fused mode)
+    for analysis in ["google_search_analysis", "bing_search_analysis", "reddit_analysis"]:
+        workflow.add_conditional_edges(analysis, report_route("aggregate_general_analysis_2"),
+                                       ["aggregate_general_analysis_2", "fused_report"])
 
     # --- 6. Join both branches back together for synthesis ---
-    workflow.add_edge("aggregate_finance_analysis", "synthesize_report")
-    workflow.add_edge("aggregate_general_analysis", "synthesize_report")
+    workflow.add_edge("aggregate_finance_analysis_1", "synthesize_report")
+    workflow.add_edge("aggregate_general_analysis_2", "synthesize_report")
 
     # --- 7. Define the final reporting flow ---
     # Run highlight extraction and report analysis in parallel
     workflow.add_edge("synthesize_report", "analyze_synthesized_report")
     workflow.add_edge("synthesize_report", "extract_highlights")
     
-    # Join them for the final report generation
+    # Join them for the final report generation. The fused report replaces the whole chain
+    # from the aggregators on with a single call, so it leads straight to the final report.
     workflow.add_edge("analyze_synthesized_report", "generate_final_report")
     workflow.add_edge("extract_highlights", "generate_final_report")
+    workflow.add_edge("fused_report", "generate_final_report")
     
     # End the graph
     workflow.add_edge("generate_final_report", END)
@@ -103,5 +128,3 @@ def create_workflow():
     # Compile the graph
     graph = workflow.compile()
     return graph
-
-create_workflow()
\ No newline at end of file
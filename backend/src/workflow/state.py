@@ -7,9 +7,15 @@ class ResearchState(TypedDict):
     """
     messages: Annotated[list, add_messages]
     user_question: str
+    query_type: Optional[str]
+    symbols: Optional[List[str]]
+    symbol_matches: Optional[List[dict]]
     google_search_results: Optional[str]
     google_finance_results: Optional[str]
+    yahoo_finance_results: Optional[str]
+    finance_features: Optional[str]
     bing_search_results: Optional[str]
+    merged_search_results: Optional[List[dict]]
     reddit_search_results: Optional[str]
     selected_reddit_urls: Optional[List[str]]
     reddit_posts: Optional[str]
@@ -17,7 +23,11 @@ class ResearchState(TypedDict):
     bing_analysis: Optional[str]
     reddit_analysis: Optional[str]
     google_finance_analysis: Optional[str]
+    yahoo_finance_analysis: Optional[str]
+    combined_analysis_1: Optional[str]
+    combined_analysis_2: Optional[str]
     synthesized_answer: Optional[str]
     report: Optional[str]
     major_highlights: Optional[str]
+    structured_report: Optional[dict]
     final_report: Optional[str]
@@ -0,0 +1,64 @@
+"""
+This module streams a research run as it happens. Node completions and the LLM tokens of the
+report nodes are yielded as small event dicts by an async generator, so a frontend or HTTP
+endpoint can show progress and the report text before the whole graph has finished.
+"""
+
+from typing import Any, AsyncIterator, Dict, Optional
+
+from ..config.setup_logs import logger
+from ..config.telemetry import metrics, new_trace_id
+
+# Node whose update carries the finished report.
+FINAL_NODE = "generate_final_report"
+# 'chain' writes the report in serial synthesis, critique and highlight calls; 'fused' writes it
+# in one structured-output call straight from the source analyses.
+REPORT_MODES = ("chain", "fused")
+
+
+async def stream_research(question: str, graph: Optional[Any] = None,
+                          trace_id: Optional[str] = None,
+                          report_mode: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Runs the research workflow for `question` and yields its events.
+
+    Args:
+        question (str): The user question.
+        graph: A compiled workflow. Defaults to the registry's shared graph.
+        trace_id (str, optional): Trace id tagging the run's metrics, spans and logs.
+            A new one is generated when omitted.
+        report_mode (str, optional): 'chain' or 'fused'. Defaults to the REPORT_MODE setting.
+
+    Yields:
+        dict: One of
+            {"type": "node", "node": name} when a node finishes,
+            {"type": "token", "node": name, "text": chunk} while a report node generates,
+            {"type": "report", "text": final_report} when the report is ready,
+            {"type": "error", "message": str} if the run fails,
+            {"type": "done"} as the last event of a successful run.
+    """
+    if graph is None:
+        from .registry import graph_registry
+        graph = graph_registry.graph()
+
+    trace_id = trace_id or new_trace_id()
+    config = {"configurable": {"trace_id": trace_id}}
+    if report_mode:
+        config["configurable"]["report_mode"] = report_mode
+    try:
+        async for mode, chunk in graph.astream({"user_question": question}, config=config,
+                                               stream_mode=["updates", "custom"]):
+            if mode == "custom":
+                yield chunk
+                continue
+            for node, update in chunk.items():
+                yield {"type": "node", "node": node}
+                if node == FINAL_NODE and update:
+                    yield {"type": "report", "text": update.get("final_report", "")}
+    except Exception as e:
+        logger.error(f"[{trace_id}] Research run failed for {question!r}: {e}")
+        metrics.inc('research_runs_total', status='error')
+        yield {"type": "error", "message": str(e)}
+        return
+    metrics.inc('research_runs_total', status='done')
+    yield {"type": "done"}
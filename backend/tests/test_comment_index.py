@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import patch
+from aiocache import SimpleMemoryCache
+
+import src.tools.comment_index as ci
+import src.tools.reddit_comments as rc
+
+
+def comment(cid, body, score=1, controversiality=0):
+    return {"id": cid, "body": body, "score": score, "controversiality": controversiality}
+
+
+def test_search_ranks_relevant_comments_and_drops_unrelated_ones():
+    index = ci.CommentIndex()
+    index.add_post("p1", [
+        comment("c1", "Apple earnings beat expectations, iPhone sales strong"),
+        comment("c2", "I had pizza for lunch"),
+    ])
+    index.add_post("p2", [comment("c3", "Bond yields are rising again")])
+
+    results = index.search("latest news about Apple earnings", k=5)
+
+    assert [r["id"] for r in results] == ["c1"]
+    assert results[0]["post_id"] == "p1" and results[0]["relevance"] > 0
+
+
+def test_score_boosts_and_controversiality_damps_equal_text_matches():
+    index = ci.CommentIndex()
+    index.add_post("p1", [
+        comment("low", "tesla deliveries", score=0),
+        comment("high", "tesla deliveries", score=500),
+        comment("spicy", "tesla deliveries", score=500, controversiality=1),
+    ])
+
+    assert [r["id"] for r in index.search("tesla")] == ["high", "spicy", "low"]
+
+
+def test_reindexing_a_post_replaces_its_comments():
+    index = ci.CommentIndex()
+    index.add_post("p1", [comment("c1", "nvidia guidance")])
+    index.add_post("p1", [comment("c2", "microsoft cloud growth")])
+
+    assert index.search("nvidia") == []
+    assert [r["id"] for r in index.search("microsoft")] == ["c2"]
+    index.remove_post("p1")
+    assert len(index) == 0 and "p1" not in index
+
+
+@pytest.mark.asyncio
+async def test_sync_index_adds_changed_posts_and_drops_unlisted_ones():
+    cache = SimpleMemoryCache()
+    await cache.multi_set([
+        ("all_post_ids", ["p1", "p2"]),
+        ("post:p1", {"comments": [comment("c1", "fed rate cut")]}),
+        ("post_meta:p1", {"edited": False, "num_comments": 1}),
+        ("post:p2", {"comments": [comment("c2", "oil prices")]}),
+    ])
+    index = ci.CommentIndex()
+    index.add_post("old", [comment("x", "fed")])
+
+    with patch.object(ci.caches, 'get', return_value=cache):
+        await ci.sync_index(index)
+        assert sorted(index.post_ids) == ["p1", "p2"]
+
+        await cache.multi_set([
+            ("post:p1", {"comments": [comment("c9", "fed holds rates")]}),
+            ("post_meta:p1", {"edited": 1.0, "num_comments": 2}),
+        ])
+        await ci.sync_index(index)
+
+    assert [r["id"] for r in index.search("fed")] == ["c9"]
+
+
+@pytest.mark.asyncio
+async def test_reddit_with_query_returns_top_k_relevant_comments():
+    cache = SimpleMemoryCache()
+    await cache.multi_set([
+        ("all_post_ids", ["p1"]),
+        ("post:p1", {"comments": [comment(f"c{i}", f"apple stock comment {i}") for i in range(10)] + [comment("z", "weather")]}),
+    ])
+
+    with patch.object(ci.caches, 'get', return_value=cache), \
+         patch.object(rc, 'comment_index', ci.CommentIndex()):
+        results = await rc.reddit("apple stock", k=3)
+
+    assert len(results) == 3
+    assert all("apple" in r["body"] for r in results)
@@ -0,0 +1,70 @@
+import pytest
+
+from src.tools import compaction as cp
+
+
+def serp_response(engine, results, news=None):
+    return {
+        "search_metadata": {"id": "abc", "status": "Success", "raw_html_file": "https://serpapi.com/x.html"},
+        "search_parameters": {"engine": engine, "q": "apple earnings"},
+        "ads": [{"title": "Buy now", "link": "https://ads.example.com"}],
+        "serpapi_pagination": {"next": "https://serpapi.com/search?start=10"},
+        "organic_results": [
+            {"position": i, "title": title, "link": link, "snippet": f"snippet for {title}", "favicon": "x.png"}
+            for i, (title, link) in enumerate(results)
+        ],
+        "news_results": news or [],
+    }
+
+
+def test_extract_items_keeps_only_result_content():
+    google = serp_response("google", [("Apple beats", "https://www.apple.com/news/")],
+                           news=[{"title": "Apple Q3", "link": "https://reuters.com/a", "source": {"name": "Reuters"},
+                                  "date": "1 day ago", "stories": [{"title": "Related", "link": "https://cnbc.com/b"}]}])
+    items = cp.extract_items([google, None, RuntimeError("boom")])
+
+    assert [item["title"] for item in items] == ["Related", "Apple Q3", "Apple beats"]
+    assert items[1]["source"] == "Reuters"
+    assert set(items[0]) == {"title", "link", "snippet", "source", "date"}
+
+
+def test_canonical_url_ignores_scheme_www_and_tracking():
+    assert cp.canonical_url("https://www.Example.com/a/?utm_source=x&id=2#top") == \
+        cp.canonical_url("http://example.com/a?id=2")
+    assert cp.canonical_url(None) is None
+
+
+def test_render_items_stops_at_the_budget():
+    google = serp_response("google", [(f"Title {i}", f"https://site{i}.com") for i in range(50)])
+    text, kept = cp.render_items(cp.extract_items(google), budget=100)
+
+    assert 0 < cp.estimate_tokens(text) <= 100
+    assert "1. Title 0" in text and "Title 49" not in text
+    assert len(kept) == text.count("https://site")
+    assert "serpapi" not in text and "Buy now" not in text
+
+
+def test_compact_payload_prunes_noise_and_summarizes_graph():
+    finance = {
+        "search_metadata": {"id": "x"},
+        "summary": {"title": "Apple Inc", "price": "$190.00"},
+        "graph": [{"date": f"2024-01-{d:02d}", "price": 100.0 + d, "volume": 1000} for d in range(1, 31)],
+        "discover_more": [{"items": ["noise"]}],
+        "news_results": [{"title": f"n{i}"} for i in range(30)],
+    }
+    text = cp.compact_payload([finance, ValueError("x")], budget=1000)
+
+    assert "search_metadata" not in text and "discover_more" not in text
+    assert '"change_pct":' in text and '"points":30' in text
+    assert "2024-01-15" not in text
+    assert text.count('"title":"n') == cp.MAX_LIST_ITEMS
+
+    assert cp.compact_payload({"a": "x" * 10_000}, budget=50).endswith("[truncated]")
+    assert cp.compact_payload(None, budget=50) == ""
+
+
+def test_token_budget_env_override(monkeypatch):
+    assert cp.token_budget("google_finance_analysis") == cp.NODE_TOKEN_BUDGETS["google_finance_analysis"]
+    monkeypatch.setenv("PROMPT_BUDGET_GOOGLE_FINANCE_ANALYSIS", "123")
+    assert cp.token_budget("google_finance_analysis") == 123
+    assert cp.token_budget("unknown_node") == cp.DEFAULT_TOKEN_BUDGET
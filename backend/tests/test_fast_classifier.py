@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+import src.workflow.nodes as nodes
+from src.config.llm_cache import LLMCache
+from src.workflow.fast_classifier import FastQueryClassifier, lexicon_cues, load_examples
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return FastQueryClassifier().fit()
+
+
+def test_lexicon_finds_finance_terms_and_tickers():
+    cues = lexicon_cues("What is the price target for $NVDA and NASDAQ: AMD?")
+    assert cues["ticker"] == 2
+    assert cues["finance"] >= 1
+    assert lexicon_cues("How do volcanoes erupt?") == {"finance": 0, "general": 0, "ticker": 0}
+
+
+def test_confident_questions_are_classified_locally(classifier):
+    assert classifier.classify("How did Netflix shares move after quarterly earnings?") == "finance"
+    assert classifier.classify("How do volcanoes erupt?") == "general"
+    assert classifier.classify(
+        "What are the safety risks of self driving cars and how will they hit Tesla's stock price?") == "finance and general"
+
+
+def test_uncertain_questions_defer_to_the_llm():
+    strict = FastQueryClassifier(threshold=1.0).fit()
+    assert strict.classify("How did Netflix shares move after quarterly earnings?") is None
+    assert strict.stats == {"local": 0, "fallback": 1}
+
+
+def test_training_labels_are_known():
+    examples = load_examples()
+    assert len(examples) >= 100
+    assert {label for _, label in examples} == {"finance", "general", "finance and general"}
+
+
+@pytest.mark.asyncio
+async def test_node_skips_the_llm_for_confident_questions(classifier):
+    structured = MagicMock()
+    with patch.object(nodes, "fast_classifier", classifier), \
+            patch.object(nodes.graph_registry, "structured_llm", structured):
+        result = await nodes.classify_question_node({"user_question": "What is Apple's dividend yield?"})
+    assert result == {"query_type": "finance"}
+    structured.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_node_falls_back_to_the_llm(classifier):
+    structured = MagicMock()
+
+    async def ainvoke(prompt):
+        return MagicMock(query_type="general")
+
+    structured.return_value.ainvoke = ainvoke
+    with patch.object(nodes, "fast_classifier", FastQueryClassifier(threshold=1.0).fit()), \
+            patch.object(nodes, "llm_cache", LLMCache(alias=None)), \
+            patch.object(nodes.graph_registry, "structured_llm", structured):
+        result = await nodes.classify_question_node({"user_question": "Tell me about it"})
+    assert result == {"query_type": "general"}
+    structured.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("question", [
+    "How is AAPL doing?", "What is going on with Apple?", "How will tariffs affect Nvidia?", "Tesla news"])
+async def test_questions_naming_a_company_are_never_general_locally(classifier, question):
+    structured = MagicMock()
+
+    async def ainvoke(prompt):
+        return MagicMock(query_type="finance")
+
+    structured.return_value.ainvoke = ainvoke
+    state = {"user_question": question, **await nodes.extract_symbols_node({"user_question": question})}
+    assert state["symbols"]
+    with patch.object(nodes, "fast_classifier", classifier), \
+            patch.object(nodes, "llm_cache", LLMCache(alias=None)), \
+            patch.object(nodes.graph_registry, "structured_llm", structured):
+        result = await nodes.classify_question_node(state)
+    assert result == {"query_type": "finance"}
+    structured.assert_called_once()
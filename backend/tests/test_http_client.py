@@ -0,0 +1,92 @@
+import asyncio
+import gc
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import src.tools.http_client as hc
+import src.tools.response_cache as rcache
+from src.tools.response_cache import response_cache
+from src.tools.google.google_search import GoogleSearch
+from src.tools.search_sys.bing import Bing
+
+
+def make_stub_app(peers):
+    async def search(request):
+        # Record the client socket so tests can count opened connections
+        peers.append(request.transport.get_extra_info('peername'))
+        return web.json_response({"engine": request.query.get("engine"), "q": request.query.get("q")})
+
+    app = web.Application()
+    app.router.add_get('/search', search)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_session_is_shared_and_connections_are_kept_alive():
+    peers = []
+    client = hc.HttpClient(limit=10, limit_per_host=2)
+    async with TestServer(make_stub_app(peers)) as server:
+        async with client:
+            first = await client.session()
+            for _ in range(3):
+                data = await GoogleSearch.get_url(await client.session(), str(server.make_url('/search')), {"engine": "google", "q": "x"})
+                assert data == {"engine": "google", "q": "x"}
+            assert await client.session() is first
+            assert first.connector.limit == 10
+            assert first.connector.limit_per_host == 2
+
+    # Sequential calls reuse one pooled connection
+    assert len(set(peers)) == 1
+
+
+@pytest.mark.asyncio
+async def test_close_releases_session_and_next_call_rebuilds_it():
+    client = hc.HttpClient()
+    first = await client.session()
+    await client.close()
+    assert first.closed
+    second = await client.session()
+    assert second is not first and not second.closed
+    await client.close()
+
+
+def test_session_of_a_finished_loop_is_closed_when_replaced(recwarn):
+    client = hc.HttpClient()
+    first = asyncio.run(client.session())
+    connector = first.connector
+    second = asyncio.run(client.session())
+
+    assert second is not first
+    assert first.closed and connector.closed
+    asyncio.run(client.close())
+    assert second.closed
+    del first, second, connector
+    gc.collect()
+    assert not [w for w in recwarn if "Unclosed" in str(w.message)]
+
+
+@pytest.mark.asyncio
+async def test_serpapi_clients_use_the_process_wide_pool(monkeypatch):
+    peers = []
+    monkeypatch.setenv('SERP_API', 'test-key')
+    response_cache.clear()
+    # An empty Redis tier, so a warm local Redis cannot answer instead of the stub server
+    redis = MagicMock(get=AsyncMock(return_value=None), set=AsyncMock())
+    monkeypatch.setattr(rcache.caches, 'get', lambda alias: redis)
+    async with TestServer(make_stub_app(peers)) as server:
+        url = str(server.make_url('/search'))
+        monkeypatch.setattr(GoogleSearch, 'BASE_URL', url)
+        monkeypatch.setattr(Bing, 'BASE_URL', url)
+
+        news = await GoogleSearch('apple').google_news()
+        copilot = await Bing('apple').talk_with_copilot()
+        session = await hc.get_session()
+        await hc.close_session()
+
+    assert news == {"engine": "google_news", "q": "apple"}
+    assert copilot == {"engine": "copilot", "q": "apple"}
+    assert session.closed
+    assert len(set(peers)) == 1
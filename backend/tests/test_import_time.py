@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parents[1]
+# Dependencies that must only load when a tool first needs them.
+HEAVY_MODULES = ("pandas", "numpy", "yfinance", "asyncpraw", "aiohttp", "langchain_google_genai")
+# Cumulative import budget; langgraph itself accounts for most of it.
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 2500))
+
+
+def import_profile(module):
+    """Runs `python -X importtime -c 'import <module>'` and returns {module: cumulative microseconds}."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=BACKEND, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ["src.workflow.setup_workflow", "src.main"])
+def test_import_defers_heavy_dependencies(module):
+    times = import_profile(module)
+
+    assert [name for name in HEAVY_MODULES if name in times] == []
+    assert times[module] / 1000 < IMPORT_BUDGET_MS
+
+
+def test_lazy_module_loads_on_first_attribute_access():
+    from src.config.lazy_imports import lazy_import
+
+    module = lazy_import("colorsys")
+    assert "not loaded" in repr(module)
+    assert module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1.0)
+    assert "(loaded)" in repr(module)
@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import AsyncMock, patch
+
+from src.tools.search_sys.indicators import compute_indicators, format_indicator_table
+
+
+def frame(close, volume=None):
+    index = pd.date_range("2024-01-01", periods=len(close), freq="B", tz="UTC")
+    volume = np.full(len(close), 1000.0) if volume is None else volume
+    return pd.DataFrame({"Close": np.asarray(close, dtype=float), "Volume": np.asarray(volume, dtype=float)}, index=index)
+
+
+def test_compute_indicators_vectorized_over_symbols():
+    rising = frame(np.linspace(100, 200, 260))
+    falling = np.concatenate([np.linspace(100, 150, 130), np.linspace(150, 75, 130)])
+    volume = np.full(260, 1000.0) + np.arange(260) % 3
+    volume[-1] = 10000.0
+    summary = compute_indicators({"UP": rising, "DOWN": frame(falling, volume), "NONE": None})
+
+    assert list(summary.index) == ["UP", "DOWN"]
+    assert summary.loc["UP", "return_1d"] == pytest.approx(200 / rising["Close"].iloc[-2] - 1)
+    assert summary.loc["UP", "return_1y"] == pytest.approx(200 / rising["Close"].iloc[-253] - 1)
+    assert summary.loc["UP", "max_drawdown"] == 0
+    assert summary.loc["DOWN", "max_drawdown"] == pytest.approx(75 / 150 - 1)
+    assert summary.loc["DOWN", "current_drawdown"] == pytest.approx(75 / 150 - 1)
+    assert summary.loc["UP", "vs_sma200"] > 0 > summary.loc["DOWN", "vs_sma20"]
+    assert summary.loc["DOWN", "volume_z"] > 2
+    assert summary.loc["DOWN", "volume_spikes_1m"] == 1
+    assert summary.loc["UP", "bars"] == 260
+
+
+def test_short_history_leaves_missing_windows_empty():
+    summary = compute_indicators({"NEW": frame(np.linspace(10, 11, 30))})
+    assert np.isnan(summary.loc["NEW", "return_1y"])
+    assert np.isnan(summary.loc["NEW", "vs_sma50"])
+
+    table = format_indicator_table(summary)
+    assert "return_1m (%)" in table
+    assert "-" in table
+
+
+def test_empty_histories():
+    assert compute_indicators({"X": None}).empty
+    assert format_indicator_table(compute_indicators({})) == ""
+
+
+@pytest.mark.asyncio
+async def test_finance_features_node_uses_price_store():
+    import src.workflow.nodes as nodes
+
+    histories = {"AAPL": frame(np.linspace(100, 120, 60))}
+    with patch.object(nodes.price_store, "histories", AsyncMock(return_value=histories)) as mock_histories:
+        result = await nodes.finance_features_node({"user_question": "aapl"})
+
+    mock_histories.assert_awaited_once_with(["AAPL"], period="1y")
+    assert "AAPL" in result["finance_features"]
+    assert "return_1m (%)" in result["finance_features"]
+
+    with patch.object(nodes.price_store, "histories", AsyncMock()) as mock_histories:
+        result = await nodes.finance_features_node({"user_question": "how are markets doing today?"})
+    mock_histories.assert_not_awaited()
+    assert result == {"finance_features": ""}
+
+
+def test_drop_price_history_strips_frames():
+    from src.workflow.nodes import drop_price_history
+
+    results = {"info": {"name": "Apple"}, "history": "{...}", "bars": pd.DataFrame({"Close": [1.0]})}
+    assert drop_price_history(results) == {"info": {"name": "Apple"}, "bars": None}
+
+
+def test_workflow_compiles_with_feature_stage():
+    from src.workflow.setup_workflow import create_workflow
+
+    graph = create_workflow().get_graph()
+    edges = {(edge.source, edge.target) for edge in graph.edges}
+    assert ("yahoo_finance_search", "finance_features") in edges
+    assert ("finance_features", "yahoo_finance_analysis") in edges
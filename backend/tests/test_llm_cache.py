@@ -0,0 +1,126 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import src.config.llm_cache as lc
+from src.config.model import LocalChatModel, Model
+
+
+def test_key_normalizes_whitespace_and_separates_model_and_node():
+    key = lc.llm_cache_key("gemini", "synthesize_report", "Summarize   this\n report ")
+    assert key == lc.llm_cache_key("gemini", "synthesize_report", "Summarize this report")
+    assert key != lc.llm_cache_key("local", "synthesize_report", "Summarize this report")
+    assert key != lc.llm_cache_key("gemini", "extract_highlights", "Summarize this report")
+    assert key.startswith("llm:gemini:synthesize_report:")
+
+
+@pytest.mark.asyncio
+async def test_fetch_caches_in_memory_and_writes_redis():
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=None)
+    redis.set = AsyncMock()
+    cache = lc.LLMCache(ttl=60)
+    loader = AsyncMock(return_value="analysis")
+
+    with patch.object(lc.caches, "get", return_value=redis):
+        assert await cache.fetch("m", "node", "prompt", loader) == "analysis"
+        assert await cache.fetch("m", "node", " prompt ", loader) == "analysis"
+
+    loader.assert_awaited_once()
+    redis.set.assert_awaited_once_with(lc.llm_cache_key("m", "node", "prompt"), "analysis", ttl=60)
+    assert cache.stats["memory_hits"] == 1 and cache.stats["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_lru_eviction_and_empty_outputs():
+    cache = lc.LLMCache(max_entries=2, ttl=10, alias=None)
+    with patch.object(lc.time, "monotonic", return_value=0):
+        for prompt in ("a", "b", "c"):
+            await cache.set("m", "n", prompt, prompt.upper())
+        assert await cache.get("m", "n", "a") is None
+        assert await cache.get("m", "n", "c") == "C"
+    with patch.object(lc.time, "monotonic", return_value=11):
+        assert await cache.get("m", "n", "c") is None
+
+    loader = AsyncMock(return_value="")
+    await cache.fetch("m", "n", "empty", loader)
+    await cache.fetch("m", "n", "empty", loader)
+    assert loader.await_count == 2
+
+
+def prompt_for(question, data="Apple shares rose 3% after earnings."):
+    return f"Synthesize a report for the query: {question}\n\nData:\n{data}"
+
+
+@pytest.mark.asyncio
+async def test_semantic_tier_matches_rephrased_questions_only():
+    cache = lc.LLMCache(alias=None, embedder=lc.HashingEmbedder(), threshold=0.8)
+    question = "What is the latest news about Apple stock?"
+    await cache.set("m", "synthesize_report", prompt_for(question), "apple report",
+                    question=question, entities=["AAPL"])
+
+    rephrased = "what is the latest news about apple stock"
+    hit = await cache.get("m", "synthesize_report", prompt_for(rephrased), question=rephrased, entities=["AAPL"])
+    miss = await cache.get("m", "synthesize_report", prompt_for("How did oil prices move this week?"),
+                           question="How did oil prices move this week?")
+    other_node = await cache.get("m", "extract_highlights", prompt_for(rephrased), question=rephrased, entities=["AAPL"])
+
+    assert hit == "apple report"
+    assert miss is None and other_node is None
+    assert cache.stats["semantic_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_tier_requires_same_entities_and_prompt_data():
+    cache = lc.LLMCache(alias=None, embedder=lc.HashingEmbedder(), threshold=0.8)
+    apple = "Give me a detailed report on the latest quarterly earnings, guidance and outlook for Apple"
+    tesla = "Give me a detailed report on the latest quarterly earnings, guidance and outlook for Tesla"
+    assert float(lc.np.dot(cache.embedder(apple), cache.embedder(tesla))) >= 0.8
+    await cache.set("m", "synthesize_report", prompt_for(apple), "apple report", question=apple, entities=["AAPL"])
+
+    other_company = await cache.get("m", "synthesize_report", prompt_for(tesla), question=tesla, entities=["TSLA"])
+    fresh_data = await cache.get("m", "synthesize_report", prompt_for(apple + "?", data="Apple shares fell 2%."),
+                                 question=apple + "?", entities=["AAPL"])
+    assert other_company is None and fresh_data is None
+
+
+@pytest.mark.asyncio
+async def test_semantic_tier_is_bounded_across_scopes():
+    cache = lc.LLMCache(max_entries=3, alias=None, embedder=lc.HashingEmbedder(), threshold=0.7)
+    question = "What is the latest news?"
+    for i in range(5):
+        await cache.set("m", "synthesize_report", prompt_for(question, data=f"day {i}"), f"report {i}",
+                        question=question, entities=[f"S{i}"])
+
+    assert len(cache._semantic_lru) == 3 and len(cache._semantic) == 3
+    rephrased = "what is the latest news"
+    oldest = await cache.get("m", "synthesize_report", prompt_for(rephrased, data="day 0"),
+                             question=rephrased, entities=["S0"])
+    newest = await cache.get("m", "synthesize_report", prompt_for(rephrased, data="day 4"),
+                             question=rephrased, entities=["S4"])
+    assert oldest is None
+    assert newest == "report 4" and cache.stats["semantic_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_local_model_is_deterministic_and_selected_by_name():
+    assert isinstance(Model("local").set_model(), LocalChatModel)
+    local = LocalChatModel()
+    first = await local.ainvoke("Analyze the following results")
+    assert first.content == (await local.ainvoke("Analyze the following results")).content
+    assert first.content != (await local.ainvoke("Something else")).content
+
+
+@pytest.mark.asyncio
+async def test_invoke_llm_reuses_cached_node_output():
+    import src.workflow.nodes as nodes
+
+    local = MagicMock(wraps=LocalChatModel())
+    local.ainvoke = AsyncMock(side_effect=LocalChatModel().ainvoke)
+    cache = lc.LLMCache(alias=None)
+    with patch.object(nodes.graph_registry, "llm", return_value=local), patch.object(nodes, "llm_cache", cache):
+        state = {"user_question": "apple", "synthesized_answer": "Apple grew revenue."}
+        first = await nodes.major_highlights_node(state)
+        second = await nodes.major_highlights_node(state)
+
+    assert first == second and first["major_highlights"].startswith("[local ")
+    local.ainvoke.assert_awaited_once()
@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+import src.workflow.nodes as nodes
+from src.config.llm_cache import LLMCache
+from src.config.llm_scheduler import LLMScheduler, TokenBucket, is_rate_limited
+from src.config.telemetry import metrics
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def test_token_bucket_refills_and_carries_debt():
+    now = [0.0]
+    bucket = TokenBucket(per_minute=60, capacity=10, clock=lambda: now[0])
+    assert bucket.delay(10) == 0
+    bucket.take(10)
+    assert bucket.delay(2) == pytest.approx(2.0)
+    bucket.take(5)  # charged after the fact: the bucket goes into debt
+    now[0] = 4.0
+    assert bucket.delay(1) == pytest.approx(2.0)
+    assert bucket.delay(100) == pytest.approx(11.0)  # capped at a full bucket
+
+
+def test_rate_limit_errors_are_recognized():
+    assert is_rate_limited(RateLimited())
+    assert is_rate_limited(Exception("429 RESOURCE_EXHAUSTED: Quota exceeded for model"))
+    assert is_rate_limited(type("ResourceExhausted", (Exception,), {})("Quota exceeded"))
+    assert not is_rate_limited(ValueError("invalid prompt"))
+    assert not is_rate_limited(RuntimeError("request 4291 failed: 429 bytes received"))
+
+
+@pytest.mark.asyncio
+async def test_critical_path_nodes_are_admitted_first():
+    scheduler = LLMScheduler(initial_concurrency=1)
+    await scheduler.acquire("google_search_analysis")
+    admitted = []
+
+    async def wait(node):
+        await scheduler.acquire(node)
+        admitted.append(node)
+        scheduler.release(succeeded=True)
+
+    waiters = [asyncio.create_task(wait(node)) for node in
+               ["bing_search_analysis", "aggregate_general_analysis_2", "synthesize_report"]]
+    await asyncio.sleep(0)
+    assert metrics.value('research_llm_queue_depth') == 3
+    scheduler.release(succeeded=True)
+    await asyncio.gather(*waiters)
+    assert admitted == ["synthesize_report", "aggregate_general_analysis_2", "bing_search_analysis"]
+    assert metrics.value('research_llm_queue_depth') == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_halve_the_limit_and_are_retried():
+    scheduler = LLMScheduler(initial_concurrency=8, backoff=0.05)
+    attempts = []
+
+    async def call():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise RateLimited()
+        return "ok"
+
+    assert await scheduler.run("synthesize_report", 10, call) == "ok"
+    assert attempts[1] - attempts[0] >= 0.04
+    assert scheduler.limit == pytest.approx(4 + 1 / 4)
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_other_errors_and_exhausted_retries_are_raised():
+    scheduler = LLMScheduler(max_retries=1, backoff=0.01)
+
+    async def broken():
+        raise ValueError("bad request")
+
+    async def limited():
+        raise RateLimited()
+
+    with pytest.raises(ValueError):
+        await scheduler.run("google_search_analysis", 10, broken)
+    assert scheduler.limit == 8
+    with pytest.raises(RateLimited):
+        await scheduler.run("google_search_analysis", 10, limited)
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_calls_that_are_no_longer_retryable_are_raised():
+    scheduler = LLMScheduler(backoff=0.01)
+    attempts = []
+
+    async def limited():
+        attempts.append(1)
+        raise RateLimited()
+
+    with pytest.raises(RateLimited):
+        await scheduler.run("synthesize_report", 10, limited, retryable=lambda: False)
+    assert len(attempts) == 1 and scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_cut_off_by_a_rate_limit_is_not_replayed():
+    class Chunk:
+        def __init__(self, content):
+            self.content = content
+
+    class PartialStream:
+        calls = 0
+
+        async def astream(self, prompt):
+            PartialStream.calls += 1
+            yield Chunk("Apple ")
+            raise RateLimited()
+
+    written = []
+    registry = MagicMock()
+    registry.llm.return_value = PartialStream()
+    with patch.object(nodes, "llm_cache", LLMCache(alias=None)), \
+            patch.object(nodes, "graph_registry", registry), \
+            patch.object(nodes, "llm_scheduler", LLMScheduler(backoff=0.01)), \
+            patch.object(nodes, "stream_writer", lambda: written.append):
+        with pytest.raises(RateLimited):
+            await nodes.invoke_llm("prompt", "synthesize_report", stream=True)
+    assert PartialStream.calls == 1
+    assert [event["text"] for event in written] == ["Apple "]
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_admission():
+    scheduler = LLMScheduler(tokens_per_minute=60_000)
+    scheduler.charge(60_000)
+    start = time.monotonic()
+    await scheduler.run("reddit_analysis", 100, lambda: asyncio.sleep(0))
+    assert time.monotonic() - start >= 0.08
+
+
+@pytest.mark.asyncio
+async def test_failed_classification_searches_every_source():
+    structured = MagicMock()
+    structured.return_value.ainvoke = MagicMock(side_effect=ValueError("bad key"))
+    with patch.object(nodes, "FAST_CLASSIFIER", False), \
+            patch.object(nodes, "llm_cache", LLMCache(alias=None)), \
+            patch.object(nodes.graph_registry, "structured_llm", structured):
+        result = await nodes.classify_question_node({"user_question": "Tell me about it"})
+    assert result == {"query_type": None}
+    assert nodes.router(result) == nodes.SOURCE_BRANCHES
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+import src.main as main
+
+
+class FakeGraph:
+    """Compiled-graph stand-in: emits a token and the final report, optionally waiting on a gate."""
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.running = 0
+        self.peak = 0
+
+    async def astream(self, inputs, config=None, stream_mode=None):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            if self.gate is not None:
+                await self.gate.wait()
+            yield "custom", {"type": "token", "node": "synthesize_report", "text": "Apple"}
+            yield "updates", {"generate_final_report": {"final_report": f"Report: {inputs['user_question']}"}}
+        finally:
+            self.running -= 1
+
+
+def client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def wait_finished(service, job_id):
+    for _ in range(100):
+        if service.get(job_id).finished:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+@pytest.mark.asyncio
+async def test_submit_status_and_events():
+    graph = FakeGraph()
+    service = main.ResearchService(graph_factory=lambda: graph)
+    app = main.ResearchApp(service)
+    await service.startup()
+
+    async with client(app) as http:
+        response = await http.post("/research", json={"question": "apple news"})
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        events = await http.get(f"/research/{job_id}/events")
+        assert events.headers["content-type"] == "text/event-stream"
+        frames = [frame for frame in events.text.split("\n\n") if frame]
+        assert [frame.splitlines()[0] for frame in frames] == \
+            ["event: token", "event: node", "event: report", "event: done"]
+        assert json.loads(frames[2].splitlines()[1][len("data: "):])["text"] == "Report: apple news"
+
+        status = (await http.get(f"/research/{job_id}")).json()
+        assert status["status"] == "done" and status["report"] == "Report: apple news"
+        assert status["report_mode"] is None
+        assert (await http.get("/health")).json() == {"status": "ok", "graph_ready": True}
+
+
+@pytest.mark.asyncio
+async def test_rejects_bad_requests():
+    app = main.ResearchApp(main.ResearchService(graph_factory=FakeGraph))
+    async with client(app) as http:
+        assert (await http.post("/research", content=b"not json")).status_code == 400
+        assert (await http.post("/research", json={"question": "  "})).status_code == 400
+        assert (await http.post("/research", json={"question": "q", "report_mode": "short"})).status_code == 400
+        assert (await http.post("/research", content=b"x" * (main.MAX_BODY_BYTES + 1))).status_code == 413
+        assert (await http.get("/research/" + "0" * 32)).status_code == 404
+        assert (await http.get("/nowhere")).status_code == 404
+        assert (await http.delete("/research")).status_code == 405
+
+
+@pytest.mark.asyncio
+async def test_per_tenant_concurrency_and_pending_limits():
+    gate = asyncio.Event()
+    graph = FakeGraph(gate)
+    service = main.ResearchService(graph_factory=lambda: graph,
+                                   limiter=main.TenantLimiter(concurrency=1, max_pending=2))
+    app = main.ResearchApp(service)
+
+    async with client(app) as http:
+        acme = [await http.post("/research", json={"question": f"q{i}"}, headers={"X-Tenant-Id": "acme"}) for i in range(3)]
+        other = await http.post("/research", json={"question": "q"}, headers={"X-Tenant-Id": "globex"})
+        assert [r.status_code for r in acme] == [202, 202, 429]
+        assert other.status_code == 202
+
+        await asyncio.sleep(0.05)
+        statuses = [service.get(r.json()["id"]).status for r in acme[:2]]
+        assert sorted(statuses) == ["queued", "running"]
+        assert graph.peak == 2  # one per tenant
+
+        gate.set()
+        for r in acme[:2] + [other]:
+            await wait_finished(service, r.json()["id"])
+    assert service.limiter.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_job_cancelled_before_it_starts_releases_its_tenant_slot():
+    service = main.ResearchService(graph_factory=FakeGraph, limiter=main.TenantLimiter(max_pending=1))
+    await service.startup()
+    job = service.submit("q", "acme")
+    job.task.cancel()
+    await asyncio.gather(job.task, return_exceptions=True)
+    assert job.status == "cancelled"
+    assert service.limiter.pending == {}
+    assert service.submit("q", "acme") is not None
+
+
+@pytest.mark.asyncio
+async def test_events_stream_stops_when_the_client_disconnects():
+    gate = asyncio.Event()
+    service = main.ResearchService(graph_factory=lambda: FakeGraph(gate))
+    app = main.ResearchApp(service)
+    await service.startup()
+    job = service.submit("q", "acme")
+    disconnect = asyncio.Event()
+    sent = []
+
+    async def receive():
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": f"/research/{job.id}/events", "headers": []}
+    handler = asyncio.ensure_future(app(scope, receive, send))
+    await asyncio.sleep(0.05)
+    disconnect.set()
+    await asyncio.wait_for(handler, timeout=1)
+    assert [message["type"] for message in sent] == ["http.response.start"]
+    gate.set()
+    await wait_finished(service, job.id)
+
+
+@pytest.mark.asyncio
+async def test_startup_builds_the_graph_off_the_event_loop_once():
+    calls = []
+
+    def slow_factory():
+        calls.append(1)
+        time.sleep(0.2)
+        return FakeGraph()
+
+    service = main.ResearchService(graph_factory=slow_factory)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while service.graph is None:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(service.startup(), service.startup(), tick())
+    assert calls == [1]
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_lifespan_compiles_graph_once():
+    calls = []
+    service = main.ResearchService(graph_factory=lambda: calls.append(1) or FakeGraph())
+    app = main.ResearchApp(service)
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    await app({"type": "lifespan"}, receive, send)
+    await service.startup()
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert calls == [1]
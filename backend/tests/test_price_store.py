@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+import src.tools.search_sys.price_store as ps
+
+
+def bars(start, periods, close_start=1.0):
+    start = pd.Timestamp(start)
+    start = start.tz_convert("America/New_York") if start.tz else start.tz_localize("America/New_York")
+    index = pd.date_range(start, periods=periods, freq="D")
+    close = np.arange(periods, dtype=float) + close_start
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": close * 10}, index=index)
+
+
+class FakeBatcher:
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    async def history(self, symbol, period="1mo", interval="1d"):
+        self.calls.append((symbol, period, interval))
+        return self.frames[period]
+
+
+def test_write_merges_tail_and_read_serves_ranges(tmp_path):
+    store = ps.PriceStore(root=tmp_path)
+    store.write("aapl", "1d", bars("2024-01-01", 10))
+    # Tail overlapping the last stored bar replaces it
+    store.write("AAPL", "1d", bars("2024-01-10", 3, close_start=100.0))
+
+    frame = store.read("AAPL", "1d")
+    assert len(frame) == 12
+    assert list(frame["Close"].iloc[-3:]) == [100.0, 101.0, 102.0]
+    assert frame.index.is_monotonic_increasing
+
+    window = store.read("AAPL", "1d", start="2024-01-05", end="2024-01-07T23:59:59Z")
+    assert len(window) == 3
+    assert isinstance(np.load(tmp_path / "1d" / "AAPL" / "series.npy", mmap_mode="r"), np.memmap)
+
+
+def test_concurrent_writes_and_reads_stay_consistent(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    store = ps.PriceStore(root=tmp_path)
+    short, long = bars("2024-06-01", 30), bars("2020-01-01", 1600)
+    store.write("AAPL", "1d", short)
+
+    def write(i):
+        store.write("AAPL", "1d", long if i % 2 else short)
+
+    def read(_):
+        # Timestamps and bars always come from the same write
+        return len(store.read("AAPL", "1d"))
+
+    with ThreadPoolExecutor(8) as pool:
+        writes = [pool.submit(write, i) for i in range(20)]
+        lengths = list(pool.map(read, range(200)))
+        for future in writes:
+            future.result()
+    assert all(length >= 30 for length in lengths)
+
+
+@pytest.mark.asyncio
+async def test_history_downloads_full_period_once_then_only_missing_tail(tmp_path, monkeypatch):
+    today = pd.Timestamp.now(tz="UTC").normalize()
+    history = bars(today - pd.Timedelta(days=20), 18)
+    tail = bars(today - pd.Timedelta(days=3), 4, close_start=500.0)
+    batcher = FakeBatcher({"5y": history, "5d": tail})
+    monkeypatch.setattr(ps, "history_batcher", batcher)
+    store = ps.PriceStore(root=tmp_path, refresh_after=60)
+
+    first = await store.history("MSFT", period="5y")
+    second = await store.history("MSFT", period="5y")
+    assert batcher.calls == [("MSFT", "5y", "1d")]
+    assert len(first) == len(second) == 18
+    assert store.stats["local"] == 1
+
+    with patch.object(ps.time, "time", return_value=ps.time.time() + 3600):
+        third = await store.history("MSFT", period="5y")
+
+    assert batcher.calls[-1] == ("MSFT", "5d", "1d")
+    assert third["Close"].iloc[-1] == 503.0
+    assert store.stats == {"local": 1, "tail_fetches": 1, "full_fetches": 1}
+
+
+@pytest.mark.asyncio
+async def test_longer_period_than_stored_triggers_full_download(tmp_path, monkeypatch):
+    today = pd.Timestamp.now(tz="UTC").normalize()
+    batcher = FakeBatcher({"1mo": bars(today - pd.Timedelta(days=10), 10), "5y": bars(today - pd.Timedelta(days=40), 40)})
+    monkeypatch.setattr(ps, "history_batcher", batcher)
+    store = ps.PriceStore(root=tmp_path)
+
+    await store.history("NVDA", period="1mo")
+    longer = await store.history("NVDA", period="5y")
+    shorter = await store.history("NVDA", period="1mo")
+
+    assert [c[1] for c in batcher.calls] == ["1mo", "5y"]
+    assert len(longer) == 40
+    assert len(shorter) <= 32
+
+
+def test_covering_period_picks_smallest_sufficient_window():
+    assert ps.covering_period(pd.Timedelta(days=2)) == "5d"
+    assert ps.covering_period(pd.Timedelta(days=40)) == "3mo"
+    assert ps.covering_period(pd.Timedelta(days=5000)) == "max"
@@ -102,21 +102,240 @@ async def test_get_all_comments_no_post_ids_returns_empty_list_and_no_errors():
 async def test_get_all_comments_collects_from_multiple_posts():
     with patch.object(rc.caches, 'get') as get_cache:
         cache = MagicMock()
-        cache.get = AsyncMock(side_effect=[["p1", "p2"], {"title": "t1", "comments": [{"id": "c1"}]}, {"title": "t2", "comments": [{"id": "c2"}, {"id": "c3"}]}])
+        cache.get = AsyncMock(return_value=["p1", "p2"])
+        cache.multi_get = AsyncMock(return_value=[
+            {"title": "t1", "comments": [{"id": "c1"}]},
+            {"title": "t2", "comments": [{"id": "c2"}, {"id": "c3"}]},
+        ])
+        cache.multi_set = AsyncMock()
         get_cache.return_value = cache
 
-        # Patch get_posts to return controlled data corresponding to post ids
-        async def fake_get_posts(pid):
-            if pid == "p1":
-                return {"title": "t1", "comments": [{"id": "c1"}]}
-            if pid == "p2":
-                return {"title": "t2", "comments": [{"id": "c2"}, {"id": "c3"}]}
-            return None
-
-        with patch('src.tools.reddit_comments.get_posts', new=fake_get_posts):
+        with patch('src.tools.reddit_comments.fetch_missing_posts', new=AsyncMock()) as missing:
             res = await rc.get_all_comments()
 
+        # One batched read, nothing to load or write back
+        cache.multi_get.assert_awaited_once_with(["post:p1", "post:p2"])
+        missing.assert_not_awaited()
+        cache.multi_set.assert_not_awaited()
+
         # Should annotate with post_id
         assert len(res) == 3
         assert {c['id'] for c in res} == {"c1", "c2", "c3"}
         assert {c['post_id'] for c in res} == {"p1", "p2"}
+
+
+@pytest.mark.asyncio
+async def test_get_all_comments_loads_only_misses_and_writes_them_back_in_one_batch():
+    with patch.object(rc.caches, 'get') as get_cache:
+        cache = MagicMock()
+        cache.get = AsyncMock(return_value=["p1", "p2", "p3", "p1"])
+        cache.multi_get = AsyncMock(return_value=[{"title": "t1", "comments": [{"id": "c1"}]}, None, None])
+        cache.multi_set = AsyncMock()
+        get_cache.return_value = cache
+
+        loaded = {"p2": {"title": "t2", "comments": [{"id": "c2"}]}}
+        with patch('src.tools.reddit_comments.fetch_missing_posts', new=AsyncMock(return_value=loaded)) as missing:
+            res = await rc.get_all_comments()
+
+        missing.assert_awaited_once_with(["p2", "p3"])
+        cache.multi_set.assert_awaited_once_with([("post:p2", loaded["p2"])], ttl=4800)
+        assert [c['id'] for c in res] == ["c1", "c2"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_missing_posts_shares_one_reddit_client():
+    with patch('src.tools.reddit_comments.asyncpraw.Reddit') as Reddit:
+        reddit = MagicMock()
+        Reddit.return_value = reddit
+        reddit.submission = AsyncMock(side_effect=lambda id: types.SimpleNamespace(id=id))
+        reddit.close = AsyncMock()
+
+        async def fake_fetch(submission):
+            return None if submission.id == "bad" else {"title": submission.id, "comments": []}
+
+        with patch('src.tools.reddit_comments.fetch_posts', new=fake_fetch):
+            res = await rc.fetch_missing_posts(["a", "b", "bad"])
+
+    Reddit.assert_called_once()
+    reddit.close.assert_awaited_once()
+    assert set(res) == {"a", "b"}
+
+class SlowPost:
+    """Submission stand-in whose load takes `delay` seconds; tracks loads in progress."""
+
+    active = 0
+    peak = 0
+
+    def __init__(self, post_id, delay=1.0):
+        self.id = post_id
+        self.title = post_id
+        self.score = 0
+        self.delay = delay
+        self.comments = types.SimpleNamespace(replace_more=AsyncMock(), list=MagicMock(return_value=[]))
+
+    async def load(self):
+        SlowPost.active += 1
+        SlowPost.peak = max(SlowPost.peak, SlowPost.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            SlowPost.active -= 1
+
+
+@pytest.fixture
+def post_cache():
+    """Stubs the Redis cache behind fetch_posts so the real loader runs."""
+    SlowPost.active = SlowPost.peak = 0
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock()
+    with patch.object(rc.fetch_posts.cache, 'get', AsyncMock(return_value=None)), \
+         patch.object(rc.fetch_posts.cache, 'set', AsyncMock()), \
+         patch.object(rc.caches, 'get', return_value=cache):
+        yield cache
+
+
+def make_fake_reddit(posts, limits=None):
+    async def hot(limit):
+        for post in posts[:limit]:
+            yield post
+
+    subreddit = types.SimpleNamespace(hot=hot)
+    reddit = MagicMock()
+    reddit.subreddit = AsyncMock(return_value=subreddit)
+    reddit.close = AsyncMock()
+    reddit.auth = types.SimpleNamespace(limits=limits or {})
+    return reddit
+
+
+@pytest.mark.asyncio
+async def test_fetch_reddit_posts_loads_concurrently_within_bound_and_caches_results():
+    posts = [types.SimpleNamespace(id=f"p{i}", title=f"t{i}") for i in range(10)]
+    active = {"now": 0, "peak": 0}
+
+    async def fake_fetch(post):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return {"title": post.title, "score": 0, "comments": []}
+
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock()
+    progress = []
+
+    with patch.object(rc.caches, 'get', return_value=cache), \
+         patch('src.tools.reddit_comments.asyncpraw.Reddit', return_value=make_fake_reddit(posts)), \
+         patch('src.tools.reddit_comments.fetch_posts', new=fake_fetch):
+        stats = await rc.fetch_reddit_posts(limit=10, concurrency=3, on_progress=lambda s: progress.append(s.done))
+
+    assert active["peak"] == 3
+    assert stats.fetched == 10 and stats.failed == 0
+    assert progress[-1] == 10
+    cache.set.assert_any_await("post:p0", {"title": "t0", "score": 0, "comments": []}, ttl=4800)
+    cache.set.assert_any_await("all_post_ids", [f"p{i}" for i in range(10)], ttl=4800)
+
+
+@pytest.mark.asyncio
+async def test_fetch_reddit_posts_counts_timeouts_and_skips_cached_posts():
+    posts = [types.SimpleNamespace(id="cached", title="c"), types.SimpleNamespace(id="slow", title="s")]
+
+    async def fake_fetch(post):
+        await asyncio.sleep(1)
+
+    cache = MagicMock()
+    cache.get = AsyncMock(side_effect=lambda key: {"title": "c"} if key == "post:cached" else None)
+    cache.set = AsyncMock()
+
+    with patch.object(rc.caches, 'get', return_value=cache), \
+         patch('src.tools.reddit_comments.asyncpraw.Reddit', return_value=make_fake_reddit(posts)), \
+         patch('src.tools.reddit_comments.fetch_posts', new=fake_fetch):
+        stats = await rc.fetch_reddit_posts(limit=2, post_timeout=0.01)
+
+    assert stats.cached == 1
+    assert stats.timed_out == 1 and stats.failed == 1
+    assert stats.as_dict()["seen"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_reddit_posts_cancels_started_loads_when_the_listing_fails():
+    posts = [types.SimpleNamespace(id="p0", title="t0"), types.SimpleNamespace(id="p1", title="t1")]
+    cancelled = []
+
+    async def hot(limit):
+        for post in posts:
+            yield post
+            await asyncio.sleep(0)
+        raise RuntimeError("listing failed")
+
+    async def fake_fetch(post):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(post.id)
+            raise
+
+    reddit = make_fake_reddit([])
+    reddit.subreddit = AsyncMock(return_value=types.SimpleNamespace(hot=hot))
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock()
+
+    with patch.object(rc.caches, 'get', return_value=cache), \
+         patch('src.tools.reddit_comments.asyncpraw.Reddit', return_value=reddit), \
+         patch('src.tools.reddit_comments.fetch_posts', new=fake_fetch):
+        stats = await asyncio.wait_for(rc.fetch_reddit_posts(limit=2), timeout=0.5)
+
+    assert sorted(cancelled) == ["p0", "p1"]
+    assert stats.seen == 2 and stats.fetched == 0
+    reddit.close.assert_awaited_once()
+    cache.set.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_post_timeout_stops_the_load_and_keeps_the_concurrency_bound(post_cache):
+    posts = [SlowPost(f"p{i}") for i in range(4)]
+
+    with patch('src.tools.reddit_comments.asyncpraw.Reddit', return_value=make_fake_reddit(posts)):
+        stats = await rc.fetch_reddit_posts(limit=4, concurrency=2, post_timeout=0.02)
+
+    assert stats.timed_out == 4
+    assert SlowPost.peak == 2
+    assert SlowPost.active == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_listing_leaves_no_real_load_running(post_cache):
+    posts = [SlowPost("p0"), SlowPost("p1")]
+
+    async def hot(limit):
+        for post in posts:
+            yield post
+            await asyncio.sleep(0)
+        raise RuntimeError("listing failed")
+
+    reddit = make_fake_reddit([])
+    reddit.subreddit = AsyncMock(return_value=types.SimpleNamespace(hot=hot))
+
+    with patch('src.tools.reddit_comments.asyncpraw.Reddit', return_value=reddit):
+        stats = await asyncio.wait_for(rc.fetch_reddit_posts(limit=2), timeout=0.5)
+
+    assert SlowPost.peak == 2 and SlowPost.active == 0
+    assert stats.seen == 2 and stats.fetched == 0
+    reddit.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_respect_rate_limit_waits_for_reset_when_budget_is_low():
+    reddit = types.SimpleNamespace(auth=types.SimpleNamespace(limits={"remaining": 1, "reset_timestamp": 1000.5}))
+    stats = rc.CrawlStats()
+
+    with patch('src.tools.reddit_comments.time.time', return_value=1000.0), \
+         patch('src.tools.reddit_comments.asyncio.sleep', new=AsyncMock()) as sleep:
+        await rc.respect_rate_limit(reddit, stats, floor=5)
+        reddit.auth.limits["remaining"] = 50
+        await rc.respect_rate_limit(reddit, stats, floor=5)
+
+    sleep.assert_awaited_once_with(0.5)
+    assert stats.rate_limit_waits == 1
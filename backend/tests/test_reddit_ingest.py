@@ -0,0 +1,117 @@
+import asyncio
+import types
+import pytest
+from unittest.mock import AsyncMock, patch
+from aiocache import SimpleMemoryCache
+
+import src.tools.reddit_comments as rc
+import src.tools.reddit_ingest as ri
+
+
+class FakeRedditSource:
+    """
+    Local stand-in for Reddit: serves posts from a dict and records which ones were loaded.
+    """
+
+    def __init__(self, subreddits):
+        self.subreddits = subreddits
+        self.loaded = []
+
+    async def hot_posts(self, subreddit_name, limit):
+        for post in self.subreddits.get(subreddit_name, [])[:limit]:
+            yield post
+
+    async def load(self, post):
+        self.loaded.append(post.id)
+        return {"title": post.title, "score": 1, "comments": [{"id": f"{post.id}-c", "body": post.title}]}
+
+    async def throttle(self, stats=None):
+        return None
+
+    async def close(self):
+        return None
+
+
+def make_post(post_id, edited=False, num_comments=1):
+    return types.SimpleNamespace(id=post_id, title=f"title {post_id}", edited=edited, num_comments=num_comments)
+
+
+@pytest.fixture
+def memory_cache():
+    cache = SimpleMemoryCache()
+    with patch.object(ri.caches, 'get', return_value=cache):
+        yield cache
+
+
+@pytest.mark.asyncio
+async def test_refresh_only_reloads_new_or_changed_posts(memory_cache):
+    source = FakeRedditSource({"finance": [make_post("a"), make_post("b")], "stocks": [make_post("c"), make_post("a")]})
+    ingestor = ri.RedditIngestor(source, subreddits=["finance", "stocks"])
+
+    first = await ingestor.refresh_once()
+    # 'a' is listed in both subreddits but loaded once
+    assert sorted(source.loaded) == ["a", "b", "c"]
+    assert first["finance"].fetched == 2
+    assert await memory_cache.get("all_post_ids") == ["a", "b", "c"]
+
+    source.loaded.clear()
+    second = await ingestor.refresh_once()
+    assert source.loaded == []
+    assert second["finance"].cached == 2
+
+    source.subreddits["finance"][1] = make_post("b", edited=1700000000.0, num_comments=5)
+    await ingestor.refresh_once()
+    assert source.loaded == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_failed_subreddit_keeps_previous_listing(memory_cache):
+    source = FakeRedditSource({"finance": [make_post("a")]})
+    ingestor = ri.RedditIngestor(source, subreddits=["finance"])
+    await ingestor.refresh_once()
+
+    async def broken(subreddit_name, limit):
+        raise RuntimeError("reddit down")
+        yield
+
+    source.hot_posts = broken
+    results = await ingestor.refresh_once()
+
+    assert results["finance"] is None
+    assert await memory_cache.get("all_post_ids") == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_graph_read_is_cache_only(memory_cache):
+    source = FakeRedditSource({"finance": [make_post("a")]})
+    await ri.RedditIngestor(source, subreddits=["finance"]).refresh_once()
+    await memory_cache.set("all_post_ids", ["a", "gone"])
+
+    with patch.object(rc.caches, 'get', return_value=memory_cache), \
+         patch('src.tools.reddit_comments.fetch_missing_posts', new=AsyncMock()) as missing:
+        comments = await rc.reddit()
+
+    missing.assert_not_awaited()
+    assert [c["id"] for c in comments] == ["a-c"]
+
+
+@pytest.mark.asyncio
+async def test_run_forever_refreshes_until_stopped(memory_cache):
+    source = FakeRedditSource({"finance": [make_post("a")]})
+    ingestor = ri.RedditIngestor(source, subreddits=["finance"], interval=0.01)
+    stop = asyncio.Event()
+
+    with patch.object(ingestor, 'refresh_once', wraps=ingestor.refresh_once) as refresh:
+        worker = asyncio.ensure_future(ingestor.run_forever(stop))
+        await asyncio.sleep(0.05)
+        stop.set()
+        await asyncio.wait_for(worker, timeout=1)
+
+    assert refresh.await_count >= 2
+
+
+def test_cli_arguments():
+    args = ri.parse_args(["--subreddits", "finance", "stocks", "--interval", "60", "--once"])
+    assert args.subreddits == ["finance", "stocks"]
+    assert args.interval == 60.0
+    assert args.once is True
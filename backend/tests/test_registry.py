@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import src.workflow.nodes as nodes
+from src.config.llm_cache import LLMCache
+from src.config.model import LocalChatModel
+from src.workflow.registry import GraphRegistry
+from src.workflow.stream import stream_research
+
+
+def test_graph_is_compiled_once_per_model_and_shared_across_threads():
+    registry = GraphRegistry(default_model="local")
+    graphs = []
+    threads = [threading.Thread(target=lambda: graphs.append(registry.graph())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(graph) for graph in graphs}) == 1
+    assert registry.stats["compiles"] == 1
+    assert registry.graph("other") is not graphs[0]
+    assert graphs[0].config["configurable"]["model"] == "local"
+
+
+def test_llm_client_is_created_once_and_failures_raise():
+    registry = GraphRegistry(default_model="local")
+    assert isinstance(registry.llm(), LocalChatModel)
+    assert registry.llm("local") is registry.llm()
+    assert registry.stats["clients"] == 1
+
+    with patch("src.workflow.registry.Model.set_model", return_value=None):
+        with pytest.raises(RuntimeError):
+            registry.llm("broken")
+
+
+@pytest.mark.asyncio
+async def test_nodes_use_the_model_bound_to_the_graph():
+    registry = GraphRegistry(default_model="unconfigured")
+    cache = LLMCache(alias=None)
+    patches = [
+        patch.object(nodes, "graph_registry", registry),
+        patch.object(nodes, "llm_cache", cache),
+        patch.object(nodes, "google_search", AsyncMock(return_value=None)),
+        patch.object(nodes, "bing", AsyncMock(return_value=None)),
+        patch.object(nodes, "reddit", AsyncMock(return_value=[])),
+        patch.object(nodes, "main", AsyncMock(return_value=None)),
+        patch.object(nodes, "google_finance", AsyncMock(return_value=None)),
+    ]
+    for p in patches:
+        p.start()
+    try:
+        events = [event async for event in stream_research("apple", registry.graph("local"))]
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+    assert events[-1] == {"type": "done"}
+    assert "unconfigured" not in registry._models
+    assert all(key.startswith("llm:local:") for key in cache._memory)
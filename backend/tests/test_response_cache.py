@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import src.tools.response_cache as rcache
+from src.tools.google.google_search import GoogleSearch
+
+
+def fake_redis(stored=None):
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=stored)
+    cache.set = AsyncMock()
+    return cache
+
+
+def test_cache_key_ignores_api_key_and_normalizes_query():
+    a = rcache.cache_key({"engine": "google", "q": "Latest  news about Apple ", "api_key": "k1", "no_cache": "false"})
+    b = rcache.cache_key({"no_cache": "false", "api_key": "k2", "q": "latest news about apple", "engine": "google"})
+    c = rcache.cache_key({"engine": "bing", "q": "latest news about apple", "no_cache": "false"})
+
+    assert a == b
+    assert a != c
+    assert a.startswith("serpapi:google:")
+
+
+@pytest.mark.asyncio
+async def test_fetch_counts_miss_then_memory_hit_and_uses_engine_ttl():
+    cache = rcache.ResponseCache(max_entries=4)
+    loader = AsyncMock(return_value={"news_results": []})
+    params = {"engine": "google_news", "q": "apple", "api_key": "k"}
+
+    with patch.object(rcache.caches, 'get', return_value=fake_redis()) as get_cache:
+        first = await cache.fetch(params, loader)
+        second = await cache.fetch(params, loader)
+
+    assert first == second == {"news_results": []}
+    loader.assert_awaited_once()
+    assert cache.stats == {"memory_hits": 1, "redis_hits": 0, "misses": 1}
+    get_cache.return_value.set.assert_awaited_once_with(rcache.cache_key(params), first, ttl=rcache.ENGINE_TTLS["google_news"])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_of_one_key_share_a_single_load():
+    cache = rcache.ResponseCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"summary": {"price": 1}}
+
+    params = {"engine": "google_finance", "q": "AAPL:NASDAQ", "api_key": "k"}
+    with patch.object(rcache.caches, 'get', return_value=fake_redis()):
+        results = await asyncio.gather(cache.fetch(params, loader), cache.fetch(dict(params, api_key="k2"), loader))
+
+    assert results[0] is results[1]
+    assert len(calls) == 1
+
+
+def test_google_finance_quotes_expire_fast_and_history_slowly():
+    cache = rcache.ResponseCache()
+    assert cache.ttl_for({"engine": "google_finance", "q": "AAPL:NASDAQ", "window": "1M"}) == 300
+    assert cache.ttl_for({"engine": "google_finance", "q": "AAPL:NASDAQ"}) == 300
+    assert cache.ttl_for({"engine": "google_finance", "q": "AAPL:NASDAQ", "window": "max"}) == rcache.FINANCE_HISTORY_TTL
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_is_promoted_to_memory():
+    cache = rcache.ResponseCache()
+    params = {"engine": "google_finance", "q": "AAPL", "window": "MAX"}
+    redis = fake_redis(stored={"graph": [1, 2]})
+
+    with patch.object(rcache.caches, 'get', return_value=redis):
+        assert await cache.get(params) == {"graph": [1, 2]}
+        assert await cache.get(params) == {"graph": [1, 2]}
+
+    redis.get.assert_awaited_once()
+    assert cache.stats == {"memory_hits": 1, "redis_hits": 1, "misses": 0}
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_evicts_least_recently_used_and_expired_entries(monkeypatch):
+    cache = rcache.ResponseCache(max_entries=2, ttls={"google": 10})
+    now = [1000.0]
+    monkeypatch.setattr(rcache.time, 'monotonic', lambda: now[0])
+
+    with patch.object(rcache.caches, 'get', return_value=fake_redis()):
+        await cache.set({"engine": "google", "q": "a"}, "A")
+        await cache.set({"engine": "google", "q": "b"}, "B")
+        assert await cache.get({"engine": "google", "q": "a"}) == "A"
+        await cache.set({"engine": "google", "q": "c"}, "C")
+
+        assert await cache.get({"engine": "google", "q": "b"}) is None
+        now[0] += 11
+        assert await cache.get({"engine": "google", "q": "a"}) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_loader():
+    cache = rcache.ResponseCache()
+    broken = MagicMock()
+    broken.get = AsyncMock(side_effect=ConnectionError("redis down"))
+    broken.set = AsyncMock(side_effect=ConnectionError("redis down"))
+
+    with patch.object(rcache.caches, 'get', return_value=broken):
+        assert await cache.fetch({"engine": "bing", "q": "x"}, AsyncMock(return_value={"ok": 1})) == {"ok": 1}
+        assert await cache.fetch({"engine": "bing", "q": "x"}, AsyncMock(return_value={"ok": 2})) == {"ok": 1}
+
+
+@pytest.mark.asyncio
+async def test_google_search_calls_serpapi_once_for_repeated_query(monkeypatch):
+    monkeypatch.setenv('SERP_API', 'test-key')
+    rcache.response_cache.clear()
+    with patch.object(rcache.caches, 'get', return_value=fake_redis()), \
+         patch.object(GoogleSearch, '_fetch', new=AsyncMock(return_value={"organic_results": []})) as fetch:
+        await GoogleSearch('apple news').google_search()
+        await GoogleSearch('Apple  News').google_search()
+
+    fetch.assert_awaited_once()
+    rcache.response_cache.clear()
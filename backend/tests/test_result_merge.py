@@ -0,0 +1,78 @@
+import pytest
+
+from src.tools import result_merge as rm
+
+
+def response(engine, results, section="organic_results"):
+    return {"search_parameters": {"engine": engine}, section: [
+        {"title": title, "link": link, "snippet": snippet} for title, link, snippet in results
+    ]}
+
+
+SNIPPET = "Apple reported quarterly revenue of 94 billion dollars as iPhone demand held up in China"
+
+
+def test_simhash_is_close_for_near_duplicates_and_far_for_unrelated_text():
+    base = rm.simhash("Apple earnings beat " + SNIPPET)
+    near = rm.simhash("Apple earnings beat " + SNIPPET + " analysts said")
+    other = rm.simhash("Bond yields climbed after the Federal Reserve held rates steady on Wednesday")
+    assert rm.hamming(base, near) < rm.hamming(base, other)
+    assert rm.hamming(base, rm.simhash("Apple earnings beat " + SNIPPET)) == 0
+
+
+def test_fingerprint_index_finds_matches_within_distance():
+    index = rm._FingerprintIndex(distance=3)
+    index.add(0b1011 << 40, slot=7)
+    assert index.find((0b1011 << 40) ^ 0b111) == 7
+    assert index.find((0b1011 << 40) ^ 0b1111) is None
+
+
+def test_merge_collapses_urls_and_near_duplicates_with_provenance():
+    google = response("google", [
+        ("Apple beats estimates", "https://www.reuters.com/apple/?utm_source=g", SNIPPET),
+        ("Fed holds rates", "https://ft.com/fed", "The Federal Reserve kept rates unchanged"),
+    ])
+    news = response("google_news", [("Apple beats estimates", "https://reuters.com/apple", SNIPPET)], "news_results")
+    bing = response("bing", [
+        ("Apple beats estimates - Yahoo", "https://finance.yahoo.com/apple-syndicated", SNIPPET),
+        ("Oil slides", "https://bloomberg.com/oil", "Crude fell for a third day"),
+    ])
+
+    merged = rm.merge_results([("google", google), ("google_news", news), ("bing", bing)])
+
+    assert [item["title"] for item in merged][0] == "Apple beats estimates"
+    assert merged[0]["sources"] == ["google", "google_news", "bing"]
+    assert merged[0]["owner"] == "google"
+    assert len(merged) == 3
+    assert [item["title"] for item in rm.results_for(merged, "bing")] == ["Oil slides"]
+    assert merged == sorted(merged, key=lambda item: item["score"], reverse=True)
+
+
+def test_owner_is_the_engine_ranking_the_result_highest():
+    google = response("google", [("Other", "https://x.com/1", "unrelated text one"),
+                                 ("Other 2", "https://x.com/2", "unrelated text two"),
+                                 ("Shared", "https://shared.com/a", "shared story")])
+    bing = response("bing", [("Shared", "https://shared.com/a", "shared story")])
+    merged = rm.merge_results([("google", google), ("bing", bing)])
+    shared = next(item for item in merged if item["title"] == "Shared")
+    assert shared["owner"] == "bing" and shared["sources"] == ["google", "bing"]
+
+
+def test_label_responses_uses_reported_engine_and_skips_failures():
+    payload = [{"news_results": []}, RuntimeError("boom"), {"search_parameters": {"engine": "google_light"}}]
+    labelled = rm.label_responses(payload, ("google_news", "google", "google_light_fast"))
+    assert [engine for engine, _ in labelled] == ["google_news", "google_light"]
+    assert rm.label_responses(None, ("bing",)) == []
+
+
+@pytest.mark.asyncio
+async def test_merge_node_splits_results_between_analyses():
+    import src.workflow.nodes as nodes
+
+    state = {
+        "google_search_results": [None, response("google", [("A", "https://a.com", "alpha story")]), None],
+        "bing_search_results": [response("bing", [("A", "https://a.com/", "alpha story"),
+                                                  ("B", "https://b.com", "beta story")]), None],
+    }
+    merged = (await nodes.merge_search_results_node(state))["merged_search_results"]
+    assert [(item["title"], item["owner"]) for item in merged] == [("A", "google"), ("B", "bing")]
@@ -0,0 +1,62 @@
+import pickle
+import pytest
+from unittest.mock import patch
+from aiocache import SimpleMemoryCache
+
+import src.tools.reddit_comments as rc
+from src.config.serializers import ColumnarSerializer, CommentColumns, PostColumns
+
+
+def make_post():
+    return {
+        "title": "Fed day",
+        "score": 12,
+        "comments": [
+            {"id": "c1", "body": "rates up", "author": "alice", "score": 5, "depth": 0,
+             "controversiality": 0, "gilded": 0, "total_awards_received": 1},
+            {"id": "c2", "body": "rates down", "author": "bob", "score": -3, "depth": 1,
+             "controversiality": 1, "gilded": 2, "total_awards_received": 0},
+            {"id": "c3", "body": "hold", "author": "alice", "score": 0, "depth": 2,
+             "controversiality": 0, "gilded": 0, "total_awards_received": 0},
+        ],
+    }
+
+
+def test_post_payload_round_trips_through_columnar_format():
+    serializer = ColumnarSerializer()
+    blob = serializer.dumps(make_post())
+    post = serializer.loads(blob)
+
+    assert blob.startswith(b"RC1")
+    assert isinstance(post, PostColumns) and isinstance(post["comments"], CommentColumns)
+    assert post["title"] == "Fed day" and post.get("score") == 12
+    assert [dict(c) for c in post["comments"]] == make_post()["comments"]
+    assert post["comments"].column("author") == ["alice", "bob", "alice"]
+    assert list(post["comments"].column("score")) == [5, -3, 0]
+    assert post["comments"][:1] == make_post()["comments"][:1]
+
+
+def test_other_values_and_legacy_pickles_still_load():
+    serializer = ColumnarSerializer()
+    assert serializer.loads(serializer.dumps(["p1", "p2"])) == ["p1", "p2"]
+    assert serializer.loads(serializer.dumps({"organic_results": [{"comments": 1}]})) == {"organic_results": [{"comments": 1}]}
+    assert serializer.loads(pickle.dumps(make_post())) == make_post()
+    assert serializer.loads(None) is None
+
+
+def test_columnar_is_smaller_than_pickled_dicts_for_repeated_authors():
+    post = make_post()
+    post["comments"] = [dict(c, id=f"{c['id']}_{i}") for i in range(100) for c in post["comments"]]
+    assert len(ColumnarSerializer().dumps(post)) < len(pickle.dumps(post))
+
+
+@pytest.mark.asyncio
+async def test_get_all_comments_reads_columnar_payloads_without_mutating_them():
+    cache = SimpleMemoryCache(serializer=ColumnarSerializer())
+    await cache.multi_set([("all_post_ids", ["p1"]), ("post:p1", make_post())])
+
+    with patch.object(rc.caches, 'get', return_value=cache):
+        comments = await rc.get_all_comments(load_missing=False)
+
+    assert [c["id"] for c in comments] == ["c1", "c2", "c3"]
+    assert {c["post_id"] for c in comments} == {"p1"}
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import src.tools.reddit_comments as rc
+from src.tools.single_flight import SingleFlight, single_flight, normalize_query
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    group = SingleFlight()
+    calls = []
+
+    @single_flight(key_builder=normalize_query, group=group)
+    async def search(query):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return {"q": query}
+
+    results = await asyncio.gather(*[search("latest news about apple") for _ in range(9)], search("Latest  News about Apple"))
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert group.stats == {"calls": 1, "shared": 9}
+    assert group.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_different_arguments_and_later_calls_are_not_coalesced():
+    group = SingleFlight()
+    counter = {"n": 0}
+
+    @single_flight(group=group)
+    async def lookup(symbol):
+        counter["n"] += 1
+        await asyncio.sleep(0)
+        return symbol
+
+    assert await asyncio.gather(lookup("AAPL"), lookup("MSFT")) == ["AAPL", "MSFT"]
+    await lookup("AAPL")
+    assert counter["n"] == 3
+
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_waiter_and_cancelled_waiter_does_not_cancel_others():
+    group = SingleFlight()
+    gate = asyncio.Event()
+
+    @single_flight(group=group)
+    async def failing():
+        await gate.wait()
+        raise RuntimeError("boom")
+
+    first = asyncio.ensure_future(failing())
+    second = asyncio.ensure_future(failing())
+    third = asyncio.ensure_future(failing())
+    await asyncio.sleep(0)
+    first.cancel()
+    gate.set()
+
+    results = await asyncio.gather(first, second, third, return_exceptions=True)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert all(isinstance(r, RuntimeError) for r in results[1:])
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_once_its_last_waiter_times_out():
+    group = SingleFlight()
+    cancelled = []
+
+    @single_flight(group=group)
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    first = asyncio.ensure_future(slow())
+    await asyncio.sleep(0)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(slow(), timeout=0.01)
+    assert cancelled == []  # `first` still waits on the call
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(first, timeout=0.01)
+    assert cancelled == [True]
+    assert group.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_get_posts_coalesces_concurrent_loads_of_the_same_post():
+    async def slow_get(key):
+        await asyncio.sleep(0.01)
+        return {"title": "cached", "comments": []}
+
+    with patch.object(rc.caches, 'get') as get_cache:
+        cache = MagicMock()
+        cache.get = AsyncMock(side_effect=slow_get)
+        get_cache.return_value = cache
+
+        results = await asyncio.gather(*[rc.get_posts("abc") for _ in range(5)])
+
+    assert all(r == {"title": "cached", "comments": []} for r in results)
+    cache.get.assert_awaited_once_with("post:abc")
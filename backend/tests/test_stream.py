@@ -0,0 +1,164 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import src.workflow.nodes as nodes
+from src.config.llm_cache import LLMCache
+from src.config.str_outputs import FusedReport
+from src.workflow.registry import GraphRegistry
+from src.workflow.setup_workflow import create_workflow
+from src.workflow.stream import stream_research
+
+
+def offline_tools():
+    search = {"organic_results": [{"title": "Apple beats", "link": "https://a.com", "snippet": "Revenue grew"}]}
+    return [
+        patch.object(nodes, "graph_registry", GraphRegistry(default_model="local")),
+        patch.object(nodes, "llm_cache", LLMCache(alias=None)),
+        patch.object(nodes, "google_search", AsyncMock(return_value=[None, search, None])),
+        patch.object(nodes, "bing", AsyncMock(return_value=[None, None])),
+        patch.object(nodes, "reddit", AsyncMock(return_value=[])),
+        patch.object(nodes, "main", AsyncMock(return_value=None)),
+        patch.object(nodes, "google_finance", AsyncMock(return_value=None)),
+    ]
+
+
+async def collect(question, graph, **kwargs):
+    patches = offline_tools()
+    for p in patches:
+        p.start()
+    try:
+        return [event async for event in stream_research(question, graph, **kwargs)]
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_tokens_before_report_and_ends_with_done():
+    events = await collect("what is the latest news about apple", create_workflow())
+
+    types = [event["type"] for event in events]
+    assert types[-1] == "done" and "error" not in types
+    tokens = [event for event in events if event["type"] == "token"]
+    assert {event["node"] for event in tokens} == {"synthesize_report", "analyze_synthesized_report", "extract_highlights"}
+    assert len([event for event in tokens if event["node"] == "synthesize_report"]) > 1
+
+    first_token = types.index("token")
+    report = next(event for event in events if event["type"] == "report")
+    assert first_token < types.index("report")
+    synthesized = "".join(event["text"] for event in tokens if event["node"] == "synthesize_report")
+    assert synthesized in report["text"]
+    assert {"type": "node", "node": "generate_final_report"} in events
+
+
+@pytest.mark.asyncio
+async def test_cached_report_nodes_still_stream_their_text():
+    graph = create_workflow()
+    patches = offline_tools()
+    for p in patches:
+        p.start()
+    try:
+        first = [event async for event in stream_research("apple earnings", graph)]
+        second = [event async for event in stream_research("apple earnings", graph)]
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+    replayed = [event for event in second if event["type"] == "token" and event["node"] == "synthesize_report"]
+    assert len(replayed) == 1
+    assert replayed[0]["text"] == "".join(
+        event["text"] for event in first if event["type"] == "token" and event["node"] == "synthesize_report")
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_errors():
+    class Broken:
+        async def astream(self, *args, **kwargs):
+            raise RuntimeError("graph exploded")
+            yield
+
+    events = [event async for event in stream_research("q", Broken())]
+    assert events == [{"type": "error", "message": "graph exploded"}]
+
+
+def test_router_prunes_branches_by_query_type():
+    assert nodes.router({"query_type": "general"}) == ["google_search", "bing_search"]
+    assert set(nodes.router({"query_type": "Finance "})) == {"yahoo_finance_search", "google_finance_search", "reddit_search"}
+    assert nodes.router({"query_type": "finance and general"}) == nodes.SOURCE_BRANCHES
+    assert nodes.router({}) == nodes.SOURCE_BRANCHES
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query_type, skipped", [
+    ("general", {"reddit_search", "yahoo_finance_search", "google_finance_search", "aggregate_finance_analysis_1"}),
+    ("finance", {"google_search", "bing_search", "merge_search_results", "google_search_analysis"}),
+])
+async def test_pruned_runs_still_synthesize_a_report(query_type, skipped):
+    classifier = MagicMock()
+    classifier.ainvoke = AsyncMock(return_value=MagicMock(query_type=query_type))
+    with patch.object(nodes, "FAST_CLASSIFIER", False), \
+            patch.object(GraphRegistry, "structured_llm", return_value=classifier):
+        events = await collect(f"{query_type} question", create_workflow())
+
+    ran = [event["node"] for event in events if event["type"] == "node"]
+    assert events[-1] == {"type": "done"}
+    assert not skipped & set(ran)
+    assert ran.count("synthesize_report") == 1
+    assert ran[-1] == "generate_final_report"
+
+
+@pytest.mark.asyncio
+async def test_fused_mode_writes_the_report_in_one_call():
+    fused = MagicMock()
+    fused.ainvoke = AsyncMock(return_value=FusedReport(
+        report="Apple grew.", highlights=["Revenue up"], critique="Thin sourcing.", links=["https://a.com"]))
+    classifier = MagicMock()
+    classifier.ainvoke = AsyncMock(return_value=MagicMock(query_type="general"))
+    with patch.object(nodes, "FAST_CLASSIFIER", False), \
+            patch.object(GraphRegistry, "structured_llm",
+                         side_effect=lambda schema, model=None: fused if schema is FusedReport else classifier):
+        events = await collect("general question", create_workflow(), report_mode="fused")
+
+    ran = [event["node"] for event in events if event["type"] == "node"]
+    assert events[-1] == {"type": "done"}
+    assert ran.count("fused_report") == 1 and ran[-1] == "generate_final_report"
+    assert not {"aggregate_general_analysis_2", "synthesize_report", "extract_highlights"} & set(ran)
+    fused.ainvoke.assert_awaited_once()
+    assert [event for event in events if event["type"] == "token"] == \
+        [{"type": "token", "node": "fused_report", "text": "Apple grew."}]
+    report = next(event["text"] for event in events if event["type"] == "report")
+    assert all(text in report for text in ["Apple grew.", "- Revenue up", "Thin sourcing.", "- https://a.com"])
+
+
+@pytest.mark.asyncio
+async def test_fused_mode_falls_back_without_structured_output():
+    # The offline model has no structured output, so the fused node writes a plain synthesis
+    events = await collect("what is the latest news about apple", create_workflow(), report_mode="fused")
+
+    assert events[-1] == {"type": "done"}
+    assert {event["node"] for event in events if event["type"] == "token"} == {"fused_report_text"}
+    assert any(event["type"] == "report" for event in events)
+
+
+@pytest.mark.asyncio
+async def test_fused_fallback_does_not_poison_the_structured_cache():
+    fused = MagicMock()
+    fused.ainvoke = AsyncMock(side_effect=[ValueError("unavailable"), FusedReport(report="Apple grew."),
+                                           FusedReport(report="Apple grew again.")])
+    state = {"user_question": "How is Apple doing?", "google_analysis": "Apple shares rose."}
+    cache = LLMCache(alias=None)
+    with patch.object(nodes, "graph_registry", GraphRegistry(default_model="local")), \
+            patch.object(nodes, "llm_cache", cache), \
+            patch.object(GraphRegistry, "structured_llm", return_value=fused):
+        failed = await nodes.fused_report_node(state)
+        recovered = await nodes.fused_report_node(state)
+        cached = await nodes.fused_report_node(state)
+        # An entry of the wrong shape under the structured key is regenerated
+        prompt = nodes.fused_report_prompt(state["user_question"], "Google Search Analysis:\nApple shares rose.")
+        await cache.set("local", "fused_report", prompt, "plain text", question=state["user_question"])
+        replaced = await nodes.fused_report_node(state)
+
+    assert "structured_report" not in failed and failed["synthesized_answer"]
+    assert recovered["synthesized_answer"] == cached["synthesized_answer"] == "Apple grew."
+    assert replaced["synthesized_answer"] == "Apple grew again."
+    assert fused.ainvoke.await_count == 3
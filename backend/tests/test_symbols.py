@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import src.workflow.nodes as nodes
+from src.tools.search_sys.symbols import COMMON_WORD_NAMES, SymbolDirectory, edit_distance, google_quote, symbol_directory
+
+
+def symbols(question):
+    return [match["symbol"] for match in symbol_directory.resolve(question)]
+
+
+def test_resolves_names_tickers_and_cashtags_in_order():
+    assert symbols("How are Nvidia and $AMD doing vs. Berkshire?") == ["NVDA", "AMD", "BRK-B"]
+    assert symbols("AAPL vs MSFT.") == ["AAPL", "MSFT"]
+    assert symbols("Is Goldman Sachs beating JPMorgan Chase?") == ["GS", "JPM"]
+    assert symbols("Bank of America vs Wells Fargo") == ["BAC", "WFC"]
+
+
+def test_exchange_prefix_and_unknown_cashtag():
+    resolved = symbol_directory.resolve("Compare NASDAQ: COST with $ZZZZ")
+    assert [(m["symbol"], m["exchange"], m["method"]) for m in resolved] == [
+        ("COST", "NASDAQ", "exchange"), ("ZZZZ", "", "cashtag")]
+
+
+def test_common_words_and_acronyms_are_not_symbols():
+    assert symbols("What is the price target and is it ALL priced in NOW?") == []
+    assert symbols("Is Target a buy?") == ["TGT"]
+    assert symbols("How does photosynthesis work?") == []
+
+
+@pytest.mark.parametrize("word", sorted(COMMON_WORD_NAMES))
+def test_every_common_word_name_resolves_only_when_capitalized(word):
+    assert len(symbols(f"Compare {word.capitalize()} and GM")) == 2
+    assert symbols(f"compare {word} and GM") == ["GM"]
+
+
+def test_short_single_word_names():
+    assert symbols("Compare Ford and GM") == ["F", "GM"]
+    assert symbols("Is Zoom still growing?") == ["ZM"]
+
+
+def test_fuzzy_matches_misspelled_names():
+    resolved = symbol_directory.resolve("Compare Microsft and Nvidea")
+    assert [(m["symbol"], m["method"]) for m in resolved] == [("MSFT", "fuzzy"), ("NVDA", "fuzzy")]
+    assert edit_distance("nvidea", "nvidia", 1) == 1
+    assert edit_distance("boeing", "being", 0) == 1
+
+
+def test_custom_directory_file(tmp_path):
+    path = tmp_path / "symbols.csv"
+    path.write_text("symbol,exchange,name,aliases\nACME,NYSE,Acme Widgets Inc.,acme|roadrunner\n")
+    directory = SymbolDirectory(path)
+    assert [m["symbol"] for m in directory.resolve("Is Roadrunner profitable? What about Acme Widgets?")] == ["ACME"]
+    assert directory.lookup("acme")["name"] == "Acme Widgets Inc."
+    assert google_quote({"symbol": "BRK-B", "exchange": "NYSE"}) == "BRK.B:NYSE"
+
+
+@pytest.mark.asyncio
+async def test_finance_nodes_query_resolved_symbols():
+    state = await nodes.extract_symbols_node({"user_question": "How did Apple and Berkshire do?"})
+    assert state["symbols"] == ["AAPL", "BRK-B"]
+
+    yahoo = AsyncMock(return_value={"info": "..."})
+    google = AsyncMock(return_value=[{"summary": 1}, None])
+    with patch.object(nodes, "main", yahoo), patch.object(nodes, "google_finance", google):
+        yahoo_update = await nodes.yahoo_finance_node(state)
+        google_update = await nodes.google_finance_search(state)
+
+    yahoo.assert_awaited_once_with(symbols="AAPL BRK-B")
+    assert sorted(call.args[0] for call in google.await_args_list) == ["AAPL:NASDAQ", "BRK.B:NYSE"]
+    assert set(google_update["google_finance_results"]) == {"AAPL:NASDAQ", "BRK.B:NYSE"}
+    assert yahoo_update == {"yahoo_finance_results": {"info": "..."}}
+
+
+@pytest.mark.asyncio
+async def test_finance_nodes_skip_without_symbols():
+    state = {"user_question": "What did the Fed say?", "symbols": [], "symbol_matches": []}
+    with patch.object(nodes, "main", AsyncMock()) as yahoo, patch.object(nodes, "google_finance", AsyncMock()) as google:
+        assert await nodes.yahoo_finance_node(state) == {"yahoo_finance_results": None}
+        assert await nodes.google_finance_search(state) == {"google_finance_results": None}
+    yahoo.assert_not_awaited()
+    google.assert_not_awaited()
@@ -0,0 +1,99 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import src.main as main
+import src.workflow.nodes as nodes
+from src.config.llm_cache import LLMCache
+from src.config.telemetry import (MetricsRegistry, current_trace_id, instrument_node, metrics,
+                                  record_cache_lookup, track_call, traced_tool)
+from src.workflow.registry import GraphRegistry
+from src.workflow.stream import stream_research
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.describe('demo_total', 'counter', 'Demo counter.')
+    registry.inc('demo_total', node='a')
+    registry.inc('demo_total', 2, node='a')
+    registry.observe('demo_seconds', 0.05, tool='x')
+    registry.observe('demo_seconds', 0.5, tool='x')
+    registry.observe('demo_seconds', 5, tool='x')
+
+    text = registry.render()
+
+    assert '# HELP demo_total Demo counter.' in text
+    assert 'demo_total{node="a"} 3' in text
+    assert 'demo_seconds_bucket{tool="x",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{tool="x",le="1"} 2' in text
+    assert 'demo_seconds_bucket{tool="x",le="+Inf"} 3' in text
+    assert 'demo_seconds_sum{tool="x"} 5.55' in text
+    assert 'demo_seconds_count{tool="x"} 3' in text
+    assert registry.value('demo_seconds', tool='x') == 3
+
+
+@pytest.mark.asyncio
+async def test_instrument_node_records_errors():
+    metrics.clear()
+
+    async def broken(state):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await instrument_node("broken", broken)({})
+    assert metrics.value('research_node_duration_seconds', node='broken', status='error') == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_are_timed():
+    metrics.clear()
+
+    @traced_tool('demo')
+    async def tool():
+        with track_call('demo.api'):
+            return 42
+
+    assert await tool() == 42
+    assert metrics.value('research_tool_duration_seconds', tool='demo', status='ok') == 1
+    assert metrics.value('research_tool_duration_seconds', tool='demo.api', status='ok') == 1
+
+
+@pytest.mark.asyncio
+async def test_run_records_nodes_tokens_and_trace_id():
+    metrics.clear()
+    seen = []
+
+    async def search(query):
+        seen.append(current_trace_id.get())
+        return [None, {"organic_results": [{"title": "Apple", "link": "https://a.com", "snippet": "up"}]}, None]
+
+    registry = GraphRegistry(default_model="local")
+    with patch.object(nodes, "graph_registry", registry), \
+            patch.object(nodes, "llm_cache", LLMCache(alias=None)), \
+            patch.object(nodes, "google_search", search), \
+            patch.object(nodes, "bing", AsyncMock(return_value=[None, None])), \
+            patch.object(nodes, "reddit", AsyncMock(return_value=[])), \
+            patch.object(nodes, "main", AsyncMock(return_value=None)), \
+            patch.object(nodes, "google_finance", AsyncMock(return_value=None)):
+        events = [event async for event in stream_research("apple news", registry.graph(), trace_id="ab" * 16)]
+
+    assert events[-1] == {"type": "done"}
+    assert seen == ["ab" * 16]
+    assert metrics.value('research_runs_total', status='done') == 1
+    assert metrics.value('research_node_duration_seconds', node='generate_final_report', status='ok') == 1
+    assert metrics.value('research_llm_calls_total', node='synthesize_report', model='local', cache='miss') == 1
+    assert metrics.total('research_llm_tokens_total', node='synthesize_report', direction='input') > 0
+    assert metrics.total('research_llm_tokens_total', node='synthesize_report', direction='output') > 0
+    assert metrics.total('research_cache_lookups_total', cache='llm', result='miss') > 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    metrics.clear()
+    record_cache_lookup('serpapi', 'memory')
+    app = main.ResearchApp(main.ResearchService(graph_factory=lambda: None))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        response = await http.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'research_cache_lookups_total{cache="serpapi",result="memory"} 1' in response.text
@@ -0,0 +1,113 @@
+import asyncio
+import time
+import pytest
+import pandas as pd
+from unittest.mock import patch
+
+import src.tools.search_sys.yf_batch as yb
+import src.tools.search_sys.yfinance as yfm
+
+
+def fake_download(calls):
+    def download(tickers, period, interval, **kwargs):
+        symbols = tickers.split()
+        calls.append((tuple(symbols), period, interval))
+        index = pd.date_range("2024-01-01", periods=3)
+        frames = {s: pd.DataFrame({"Close": [1.0, 2.0, 3.0], "Volume": [10, 20, 30]}, index=index) for s in symbols if s != "NOPE"}
+        return pd.concat(frames, axis=1)
+    return download
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_download_per_window():
+    calls = []
+    batcher = yb.HistoryBatcher(window=0.01)
+    with patch.object(yb.yf, 'download', fake_download(calls)):
+        results = await asyncio.gather(
+            batcher.history("aapl"), batcher.history("MSFT"), batcher.history("AAPL"),
+            batcher.histories(["msft", "nvda"]),
+        )
+
+    assert calls == [(("AAPL", "MSFT", "NVDA"), "1mo", "1d")]
+    assert list(results[0]["Close"]) == [1.0, 2.0, 3.0]
+    assert results[0] is results[2]
+    assert set(results[3]) == {"MSFT", "NVDA"}
+    assert batcher.stats == {"requests": 5, "downloads": 1, "symbols_downloaded": 3}
+
+
+@pytest.mark.asyncio
+async def test_windows_are_batched_separately_and_missing_symbols_return_none():
+    calls = []
+    batcher = yb.HistoryBatcher(window=0.01)
+    with patch.object(yb.yf, 'download', fake_download(calls)):
+        daily, weekly, missing = await asyncio.gather(
+            batcher.history("AAPL"), batcher.history("AAPL", interval="1wk"), batcher.history("NOPE"),
+        )
+
+    assert sorted(calls) == [(("AAPL",), "1mo", "1wk"), (("AAPL", "NOPE"), "1mo", "1d")]
+    assert daily is not None and weekly is not None
+    assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_early_and_errors_reach_every_caller():
+    batcher = yb.HistoryBatcher(window=10, max_batch=2)
+
+    def broken(**kwargs):
+        raise RuntimeError("yahoo down")
+
+    with patch.object(yb.yf, 'download', broken):
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.history("A"), batcher.history("B"), return_exceptions=True), timeout=1
+        )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_early_flush_does_not_cut_the_next_window_short():
+    calls = []
+    batcher = yb.HistoryBatcher(window=0.2, max_batch=2)
+    with patch.object(yb.yf, 'download', fake_download(calls)):
+        await asyncio.gather(batcher.history("A"), batcher.history("B"))
+        await asyncio.sleep(0.15)
+        # The first batch's timer would have fired 0.05 s into this batch's window
+        next_batch = asyncio.ensure_future(batcher.history("C"))
+        await asyncio.sleep(0.1)
+        assert len(calls) == 1
+        late = asyncio.ensure_future(batcher.history("D"))
+        await asyncio.gather(next_batch, late)
+
+    assert calls[1][0] == ("C", "D")
+
+
+@pytest.mark.asyncio
+async def test_flush_tasks_are_held_until_they_finish():
+    calls = []
+    download = fake_download(calls)
+
+    def slow_download(*args, **kwargs):
+        time.sleep(0.1)
+        return download(*args, **kwargs)
+
+    batcher = yb.HistoryBatcher(window=0.01)
+    with patch.object(yb.yf, 'download', slow_download):
+        request = asyncio.ensure_future(batcher.history("AAPL"))
+        await asyncio.sleep(0.05)
+        assert len(batcher._flushes) == 1
+        await request
+        await asyncio.sleep(0)
+    assert batcher._flushes == set()
+
+
+@pytest.mark.asyncio
+async def test_yfinance_company_history_goes_through_the_batcher():
+    calls = []
+    with patch.object(yb.yf, 'download', fake_download(calls)), \
+         patch.object(yfm.YahooFinance, 'get_company_info', new=lambda self: asyncio.sleep(0, result={"symbol": self.symbol})):
+        (info_a, history_a), (info_b, history_b) = await asyncio.gather(
+            yfm.yfinance_company("AAPL"), yfm.yfinance_company("MSFT")
+        )
+
+    assert calls == [(("AAPL", "MSFT"), "1mo", "1d")]
+    assert info_a == {"symbol": "AAPL"} and history_b is not None
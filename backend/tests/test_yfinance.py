@@ -0,0 +1,84 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+
+import src.tools.search_sys.yfinance as yfm
+import src.tools.executor as ex
+
+
+class SlowTicker:
+    """Stand-in for yf.Ticker whose properties block like network calls."""
+
+    delay = 0.1
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def __getattr__(self, name):
+        time.sleep(self.delay)
+        return f"{self.symbol}:{name}"
+
+    def history(self, start=None, end=None, interval="1d"):
+        time.sleep(self.delay)
+        return f"{self.symbol}:history:{interval}"
+
+
+@pytest.mark.asyncio
+async def test_yf_finance_fetches_all_properties_concurrently_off_the_loop():
+    ticks = []
+
+    async def heartbeat():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    beat = asyncio.ensure_future(heartbeat())
+    with patch.object(yfm.yf, 'Ticker', SlowTicker):
+        started = time.perf_counter()
+        corporate_actions, fundamentals = await yfm.yf_finance("AAPL")
+        elapsed = time.perf_counter() - started
+    beat.cancel()
+
+    assert fundamentals == {
+        "info": "AAPL:info",
+        "balance_sheet": "AAPL:balance_sheet",
+        "income_statement": "AAPL:income_stmt",
+        "cashflow": "AAPL:cashflow",
+    }
+    assert corporate_actions["shareholders"] == "AAPL:major_holders"
+    # Eight 0.1s properties run in parallel, not back to back
+    assert elapsed < 0.5
+    # The loop kept running while yfinance blocked
+    assert len(ticks) >= 5
+
+
+@pytest.mark.asyncio
+async def test_slow_property_times_out_without_failing_the_others(monkeypatch):
+    class Stuck(SlowTicker):
+        def __getattr__(self, name):
+            if name == "cashflow":
+                time.sleep(0.3)
+            return name
+
+    monkeypatch.setattr(ex, 'CALL_TIMEOUT', 0.1)
+    with patch.object(yfm.yf, 'Ticker', Stuck):
+        fundamentals = await yfm.YahooFinance("MSFT").get_fundamentals()
+
+    assert fundamentals["cashflow"] is None
+    assert fundamentals["info"] == "info"
+
+
+@pytest.mark.asyncio
+async def test_history_runs_in_executor_and_main_returns_data():
+    async def batched(symbol, period='1mo', interval='1d'):
+        return f"{symbol}:batched:{period}"
+
+    with patch.object(yfm.yf, 'Ticker', SlowTicker), \
+         patch.object(yfm.history_batcher, 'history', new=batched):
+        history = await yfm.YahooFinance("TSLA").get_history(start="2024-01-01", interval="1wk")
+        info, company_history = await yfm.main("TSLA")
+
+    assert history == "TSLA:history:1wk"
+    assert info == "TSLA:info"
+    assert company_history == "TSLA:batched:1mo"